@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from dataclasses import dataclass
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
 from api.models.event import EventMention
 
 @dataclass
@@ -24,6 +26,9 @@ class ArtistSearchQuery:
 class EventCollector(ABC):
     """Abstract base class for event collectors."""
 
+    # Short provider name used in traces, caches and stats, e.g. "ticketmaster"
+    name: str = ""
+
     @abstractmethod
     async def search(self, query: EventSearchQuery) -> List[EventMention]:
         """Search events by date/location."""
@@ -33,3 +38,62 @@ class EventCollector(ABC):
     async def search_by_artist(self, query: ArtistSearchQuery) -> tuple[List[EventMention], int]:
         """Search events by artist. Returns (events, total_count)."""
         pass
+
+    async def fetch_by_ids(self, event_ids: List[str]) -> List[EventMention]:
+        """
+        Re-fetch known events by provider ID in one call (used by the price watcher).
+
+        Providers without an ID lookup return nothing; their events are not refreshed.
+        """
+        return []
+
+    async def search_window(
+        self,
+        query: EventSearchQuery,
+        date_to: str,
+        max_events: int
+    ) -> Optional[Tuple[List[EventMention], bool]]:
+        """
+        Fetch every event from ``query.date`` through ``date_to`` (used by date prefetch).
+
+        Returns ``(events, complete)`` sorted by date; ``complete`` is False
+        when ``max_events`` or an error cut the window short. Providers
+        without a date-range search return None and are not prefetched.
+        """
+        return None
+
+
+@dataclass
+class ProviderCall:
+    """Outcome of one collector call, filled in by the collector."""
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors)
+
+
+_provider_call: ContextVar[Optional[ProviderCall]] = ContextVar("provider_call", default=None)
+
+
+@contextmanager
+def track_provider_call():
+    """Track the collector call made inside the block (used by MultiCollector)."""
+    call = ProviderCall()
+    token = _provider_call.set(call)
+    try:
+        yield call
+    finally:
+        _provider_call.reset(token)
+
+
+def report_provider_error(error: Exception) -> None:
+    """
+    Record an error a collector handled itself.
+
+    Collectors that swallow upstream failures and return an empty list call
+    this so callers can tell "no events" apart from "provider failed".
+    """
+    call = _provider_call.get()
+    if call is not None:
+        call.errors.append(str(error))
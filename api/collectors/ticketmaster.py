@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 from api.models.event import EventMention
 from api import config
-from api.collectors.base import EventCollector, EventSearchQuery, ArtistSearchQuery
+from api.collectors.base import EventCollector, EventSearchQuery, ArtistSearchQuery, report_provider_error, track_provider_call
+from api.services.deadline import current_provider_timeout
+from api.services.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,8 @@ logger = logging.getLogger(__name__)
 class TicketmasterCollector(EventCollector):
     """Collector for Ticketmaster Discovery API."""
 
+    name = "ticketmaster"
+
     def __init__(self):
         self.base_url = f"{config.TICKETMASTER_BASE_URL}/events.json"
 
@@ -44,6 +48,48 @@ class TicketmasterCollector(EventCollector):
         events, _ = await self._fetch_events(params, query.date, query.city, query.category)
         return events
 
+    async def search_window(
+        self,
+        query: EventSearchQuery,
+        date_to: str,
+        max_events: int
+    ) -> Optional[Tuple[List[EventMention], bool]]:
+        """Page through a multi-day localStartDateTime window, PREFETCH_PAGE_SIZE events per request."""
+        api_key = config.TICKETMASTER_API_KEY
+        is_placeholder = not api_key or api_key.startswith("your_") or api_key == "test"
+
+        if is_placeholder:
+            # Mock events carry the same IDs on every date, so a window of them means nothing
+            return None
+
+        params = {
+            "apikey": config.TICKETMASTER_API_KEY,
+            "countryCode": query.country_code,
+            "localStartDateTime": f"{query.date}T00:00:00,{date_to}T23:59:59",
+            "size": config.PREFETCH_PAGE_SIZE,
+            "sort": "date,asc"
+        }
+        if query.city:
+            params["city"] = query.city
+        if query.category:
+            params["classificationName"] = query.category
+
+        events: List[EventMention] = []
+        page = 0
+        while True:
+            with track_provider_call() as outcome:
+                batch, total = await self._fetch_events(
+                    dict(params, page=page), query.date, query.city, query.category
+                )
+            if outcome.failed:
+                return events, False
+            events.extend(batch)
+            if len(batch) < config.PREFETCH_PAGE_SIZE or len(events) >= total:
+                return events, True
+            if len(events) >= max_events:
+                return events, False
+            page += 1
+
     async def search_by_artist(self, query: ArtistSearchQuery) -> Tuple[List[EventMention], int]:
         """Search events by artist name using Ticketmaster Discovery API."""
         # Check if API key is missing or is a placeholder value
@@ -100,77 +146,51 @@ class TicketmasterCollector(EventCollector):
         results, _ = await self._fetch_events(params, date, city)
         return results[0] if results else None
 
+    async def fetch_by_ids(self, event_ids: List[str]) -> List[EventMention]:
+        """Look up several events by ID with a single Discovery API request."""
+        if not event_ids:
+            return []
+        api_key = config.TICKETMASTER_API_KEY
+        is_placeholder = not api_key or api_key.startswith("your_") or api_key == "test"
+
+        if is_placeholder:
+            wanted = set(event_ids)
+            today = datetime.now().strftime("%Y-%m-%d")
+            mock_events = self._get_mock_events(today) + self._get_mock_artist_events("Mock Artist", today)[0]
+            return [e for e in mock_events if e.id in wanted]
+
+        params = {
+            "apikey": config.TICKETMASTER_API_KEY,
+            "id": ",".join(event_ids),
+            "size": len(event_ids)
+        }
+        events, _ = await self._fetch_events(params, "")
+        return events
+
     async def _fetch_events(self, params: dict, default_date: str, city_filter: str = None, category_filter: str = None) -> Tuple[List[EventMention], int]:
         """Internal method to execute the HTTP request and parse results."""
         events: List[EventMention] = []
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        # Use the time budget granted by MultiCollector / the route, if any
+        async with httpx.AsyncClient(timeout=current_provider_timeout(30.0)) as client:
             try:
                 logger.info("Fetching events from Ticketmaster...")
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
+                with span("ticketmaster.http"):
+                    response = await client.get(self.base_url, params=params)
+                    response.raise_for_status()
+                    data = response.json()
                 
                 if "_embedded" not in data or "events" not in data["_embedded"]:
                     return events, 0
                 
-                for e in data["_embedded"]["events"]:
-                    # Refactored Extraction Logic
-                    venue_name = "TBA"
-                    event_city = city_filter or "Unknown"
-                    if "_embedded" in e and "venues" in e["_embedded"] and e["_embedded"]["venues"]:
-                        venue = e["_embedded"]["venues"][0]
-                        venue_name = venue.get("name", "TBA")
-                        if "city" in venue:
-                            event_city = venue["city"].get("name", event_city)
-                    
-                    price_range, min_price, max_price, currency = self._extract_price_info(e)
-                    venue_lat, venue_lng = self._extract_location(e)
-                    
-                    # Extract image
-                    image_url = None
-                    if "images" in e and e["images"]:
-                        images = sorted(e["images"], key=lambda x: x.get("width", 0), reverse=True)
-                        image_url = images[0].get("url")
-
-                    # Extract category
-                    category = category_filter or "music"
-                    if "classifications" in e and e["classifications"]:
-                         category = e["classifications"][0].get("segment", {}).get("name", "music").lower()
-
-                    # Fix: Ensure URL is present for Ticketmaster events
-                    event_url = e.get("url", "")
-                    if not event_url and "id" in e:
-                         # Fallback to constructing URL from ID
-                         event_url = f"https://www.ticketmaster.com/event/{e['id']}"
-
-                    # Determine if it has tickets (not cancelled)
-                    has_tickets = e.get("dates", {}).get("status", {}).get("code") != "cancelled"
-
-                    events.append(EventMention(
-                        id=e["id"],
-                        text=e.get("name", "Unknown Event"),
-                        url=event_url,
-                        timestamp=e.get("dates", {}).get("start", {}).get("localDate", default_date),
-                        venue_name=venue_name,
-                        city=event_city,
-                        category=category,
-                        image_url=image_url,
-                        price_range=price_range,
-                        min_price=min_price,
-                        max_price=max_price,
-                        currency=currency,
-                        venue_lat=venue_lat,
-                        venue_lng=venue_lng,
-                        scores={"popularity": e.get("score", 0)},
-                        raw_data=e,
-                        provider="ticketmaster",
-                        ticket_provider="ticketmaster",
-                        has_tickets=has_tickets
-                    ))
+                with span("ticketmaster.parse", count=len(data["_embedded"]["events"])):
+                    for e in data["_embedded"]["events"]:
+                        events.append(self.parse_event(e, default_date, city_filter, category_filter))
             except httpx.HTTPError as e:
                 logger.error(f"HTTP error fetching events from Ticketmaster: {e}", exc_info=True)
+                report_provider_error(e)
             except Exception as e:
                 logger.exception(f"Unexpected error fetching events from Ticketmaster: {e}")
+                report_provider_error(e)
         
         # Extract total count from pagination metadata
         total_elements = 0
@@ -182,6 +202,67 @@ class TicketmasterCollector(EventCollector):
 
         return events, total_elements
 
+    def parse_event(
+        self,
+        e: dict,
+        default_date: str,
+        city_filter: Optional[str] = None,
+        category_filter: Optional[str] = None
+    ) -> EventMention:
+        """Build an EventMention from one Discovery API event object."""
+        venue_name = "TBA"
+        event_city = city_filter or "Unknown"
+        if "_embedded" in e and "venues" in e["_embedded"] and e["_embedded"]["venues"]:
+            venue = e["_embedded"]["venues"][0]
+            venue_name = venue.get("name", "TBA")
+            if "city" in venue:
+                event_city = venue["city"].get("name", event_city)
+    
+        price_range, min_price, max_price, currency = self._extract_price_info(e)
+        venue_lat, venue_lng = self._extract_location(e)
+    
+        # Extract image
+        image_url = None
+        if "images" in e and e["images"]:
+            images = sorted(e["images"], key=lambda x: x.get("width", 0), reverse=True)
+            image_url = images[0].get("url")
+
+        # Extract category
+        category = category_filter or "music"
+        if "classifications" in e and e["classifications"]:
+             category = e["classifications"][0].get("segment", {}).get("name", "music").lower()
+
+        # Fix: Ensure URL is present for Ticketmaster events
+        event_url = e.get("url", "")
+        if not event_url and "id" in e:
+             # Fallback to constructing URL from ID
+             event_url = f"https://www.ticketmaster.com/event/{e['id']}"
+
+        # Determine if it has tickets (not cancelled)
+        has_tickets = e.get("dates", {}).get("status", {}).get("code") != "cancelled"
+
+        return EventMention(
+            id=e["id"],
+            text=e.get("name", "Unknown Event"),
+            url=event_url,
+            timestamp=e.get("dates", {}).get("start", {}).get("localDate", default_date),
+            venue_name=venue_name,
+            city=event_city,
+            category=category,
+            image_url=image_url,
+            price_range=price_range,
+            min_price=min_price,
+            max_price=max_price,
+            currency=currency,
+            venue_lat=venue_lat,
+            venue_lng=venue_lng,
+            scores={"popularity": e.get("score", 0)},
+            raw_data=e,
+            provider="ticketmaster",
+            ticket_provider="ticketmaster",
+            has_tickets=has_tickets
+        )
+
     def _extract_price_info(self, e: dict):
         price_range = None
         min_price = None
@@ -22,6 +22,8 @@ class ViagogoCollector(EventCollector):
     3. Map Viagogo API response to EventMention model
     """
 
+    name = "viagogo"
+
     def __init__(self):
         self.base_url = config.VIAGOGO_BASE_URL
         self.affiliate_id = config.VIAGOGO_AFFILIATE_ID
@@ -25,3 +25,124 @@ VIAGOGO_BASE_URL = "https://www.viagogo.com"
 DEFAULT_COUNTRY_CODE = "IL"
 DEFAULT_CATEGORY = "music"
 
+
+# Response caching (seconds); also drives Cache-Control max-age
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+# Answer a date search by filtering a cached complete result of a broader one
+# (no city or no category). Local category filtering is limited to categories
+# whose provider classification shows up in EventMention.category.
+SEARCH_SUBSUMPTION = os.getenv("SEARCH_SUBSUMPTION", "true").lower() == "true"
+SUBSUMABLE_CATEGORIES = os.getenv("SUBSUMABLE_CATEGORIES", "music,sports,arts").split(",")
+# Extra city aliases on top of the built-in table, e.g. "tlv=Tel Aviv,bsr=Beersheba"
+CITY_ALIASES = [a for a in os.getenv("CITY_ALIASES", "").split(",") if a.strip()]
+RESOLUTION_CACHE_TTL = int(os.getenv("RESOLUTION_CACHE_TTL", "3600"))
+EVENT_STORE_TTL = int(os.getenv("EVENT_STORE_TTL", "86400"))
+
+# Warm-start snapshots of the event store, search results and resolutions;
+# empty path = disabled. Written every SNAPSHOT_INTERVAL seconds (0 = only on
+# shutdown) and ignored on startup once older than SNAPSHOT_MAX_AGE.
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "900"))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", "86400"))
+# Feed snapshots written by scripts/ingest_feed.py; workers check the file every
+# FEED_SNAPSHOT_INTERVAL seconds and merge a new one into their event store
+FEED_SNAPSHOT_PATH = os.getenv("FEED_SNAPSHOT_PATH", "")
+FEED_SNAPSHOT_INTERVAL = float(os.getenv("FEED_SNAPSHOT_INTERVAL", "60"))
+
+# Local Ticketmaster matching for packages (trigram similarity within a date+city block);
+# the network lookup only runs without a confident local match
+RESOLVER_MIN_SIMILARITY = float(os.getenv("RESOLVER_MIN_SIMILARITY", "0.8"))
+RESOLVER_MIN_MARGIN = float(os.getenv("RESOLVER_MIN_MARGIN", "0.1"))
+
+# Event packages built in the background when events are stored
+PACKAGE_PREBUILD = os.getenv("PACKAGE_PREBUILD", "true").lower() == "true"
+PACKAGE_BUILD_CONCURRENCY = int(os.getenv("PACKAGE_BUILD_CONCURRENCY", "4"))
+PACKAGE_BUILD_DEADLINE = float(os.getenv("PACKAGE_BUILD_DEADLINE", "5.0"))
+PACKAGE_CACHE_MAX_ENTRIES = int(os.getenv("PACKAGE_CACHE_MAX_ENTRIES", "4096"))
+PACKAGE_BUILD_MAX_PENDING = int(os.getenv("PACKAGE_BUILD_MAX_PENDING", "1024"))
+
+# Live price watching (SSE): one poll of all watched events per interval
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", "30"))
+WATCH_BATCH_SIZE = int(os.getenv("WATCH_BATCH_SIZE", "50"))
+WATCH_MAX_IDS = int(os.getenv("WATCH_MAX_IDS", "50"))
+WATCH_KEEPALIVE = float(os.getenv("WATCH_KEEPALIVE", "15"))
+
+# Price history: samples kept per event (older half downsampled beyond this) and retention
+PRICE_HISTORY_MAX_SAMPLES = int(os.getenv("PRICE_HISTORY_MAX_SAMPLES", "2048"))
+PRICE_HISTORY_RETENTION_DAYS = float(os.getenv("PRICE_HISTORY_RETENTION_DAYS", "90"))
+
+# Price alerts: where fired alerts go ("log" or "memory")
+ALERT_SINK = os.getenv("ALERT_SINK", "log")
+# Price alerts: pending caps (total, per event, per target; 0 = unbounded) and lifetime when the event date is unknown
+ALERT_MAX_ALERTS = int(os.getenv("ALERT_MAX_ALERTS", "100000"))
+ALERT_MAX_PER_EVENT = int(os.getenv("ALERT_MAX_PER_EVENT", "1000"))
+ALERT_MAX_PER_TARGET = int(os.getenv("ALERT_MAX_PER_TARGET", "100"))
+ALERT_MAX_AGE_DAYS = float(os.getenv("ALERT_MAX_AGE_DAYS", "30"))
+
+# Shared cache tier (any Redis-protocol server); empty = in-process caches only
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHE_NAMESPACE = os.getenv("CACHE_NAMESPACE", "eventpulse")
+
+# Empty provider responses are remembered briefly so known-empty queries skip that provider
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "120"))
+NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "10000"))
+
+# By-artist pagination: results fetched upstream once per search, then paged locally
+ARTIST_SNAPSHOT_WINDOW = int(os.getenv("ARTIST_SNAPSHOT_WINDOW", "100"))
+ARTIST_SNAPSHOT_TTL = int(os.getenv("ARTIST_SNAPSHOT_TTL", "900"))
+
+# Request tracing (Server-Timing header)
+# Fraction of requests traced; keep low in production to bound overhead
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+# Allow forcing a trace with "X-Debug-Trace: 1" and expose /api/debug/traces
+TRACE_DEBUG = os.getenv("TRACE_DEBUG", "false").lower() == "true"
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+
+# Request deadlines and provider timeouts (seconds)
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "1.5"))
+PROVIDER_TIMEOUT_MIN = float(os.getenv("PROVIDER_TIMEOUT_MIN", "0.2"))
+PROVIDER_TIMEOUT_MAX = float(os.getenv("PROVIDER_TIMEOUT_MAX", "10.0"))
+PROVIDER_TIMEOUT_PERCENTILE = float(os.getenv("PROVIDER_TIMEOUT_PERCENTILE", "95"))
+PROVIDER_TIMEOUT_MULTIPLIER = float(os.getenv("PROVIDER_TIMEOUT_MULTIPLIER", "1.5"))
+
+# Streaming search (/api/events/stream): deadline for slow providers, since earlier
+# results are already on the wire, and cities per request
+STREAM_DEADLINE = float(os.getenv("STREAM_DEADLINE", "5.0"))
+STREAM_MAX_CITIES = int(os.getenv("STREAM_MAX_CITIES", "5"))
+
+# Batch search (/api/events/search-batch): queries per request, upstream searches in flight
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "20"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# Date prefetch: a single-day search miss fetches PREFETCH_DAYS days from the
+# primary provider (1 = off) and fills the search cache for each of them. The
+# request waits up to PREFETCH_WAIT seconds for the window before searching
+# its own day as usual; the window keeps loading in the background.
+PREFETCH_DAYS = int(os.getenv("PREFETCH_DAYS", "1"))
+PREFETCH_PAGE_SIZE = int(os.getenv("PREFETCH_PAGE_SIZE", "200"))
+PREFETCH_MAX_EVENTS = int(os.getenv("PREFETCH_MAX_EVENTS", "1000"))
+PREFETCH_WAIT = float(os.getenv("PREFETCH_WAIT", "1.0"))
+
+# Admission control per worker: searches (anything that may call a provider)
+# run ADMISSION_SEARCH_CONCURRENCY at a time with up to ADMISSION_SEARCH_QUEUE
+# more waiting at most ADMISSION_MAX_WAIT seconds; streams are capped without
+# a queue. Shed requests get a 503 with Retry-After. Cheap, in-memory routes
+# and searches already in this worker's cache are never limited.
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+ADMISSION_SEARCH_CONCURRENCY = int(os.getenv("ADMISSION_SEARCH_CONCURRENCY", "64"))
+ADMISSION_SEARCH_QUEUE = int(os.getenv("ADMISSION_SEARCH_QUEUE", "128"))
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "0.5"))
+ADMISSION_STREAM_CONCURRENCY = int(os.getenv("ADMISSION_STREAM_CONCURRENCY", "256"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+# Adaptive provider ordering (off = fixed collector order)
+ADAPTIVE_PROVIDER_ORDER = os.getenv("ADAPTIVE_PROVIDER_ORDER", "false").lower() == "true"
+# Business priority tiers, e.g. "ticketmaster=0,viagogo=1"; reordering happens within a tier only.
+# Empty = every provider in tier 0, so all of them can be reordered
+PROVIDER_PRIORITY_TIERS = os.getenv("PROVIDER_PRIORITY_TIERS", "")
+# Countries with their own provider stats; any other country_code shares the "*" segment
+PROVIDER_SEGMENT_COUNTRIES = os.getenv("PROVIDER_SEGMENT_COUNTRIES", "IL,US,GB,CA,AU,DE,FR,ES,IT,NL").split(",")
+PROVIDER_POLICY_MIN_SAMPLES = int(os.getenv("PROVIDER_POLICY_MIN_SAMPLES", "20"))
+PROVIDER_SKIP_HIT_RATE = float(os.getenv("PROVIDER_SKIP_HIT_RATE", "0.05"))
+PROVIDER_EXPLORE_RATE = float(os.getenv("PROVIDER_EXPLORE_RATE", "0.05"))
@@ -1,19 +1,61 @@
 """EventPulse API - Event Discovery Platform."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from api.routes import events_router
+from api.routes import events_router, debug_router, alerts_router, suggest_router
+from api.routes import events as events_routes
+from api.middleware import AdmissionMiddleware, TracingMiddleware
 from api.models.event import HealthResponse
+from api.services.admission import AdmissionController
+from api.services.cache import get_shared_backend, run_invalidation_listener
 from api import config
 import os
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background tasks (shared-cache invalidation, price watching, snapshots, feed loading) for the app's lifetime."""
+    tasks = [asyncio.create_task(events_routes._price_watcher.run())]
+    backend = get_shared_backend()
+    if backend is not None:
+        tasks.append(asyncio.create_task(run_invalidation_listener(backend)))
+    if config.SNAPSHOT_PATH:
+        if events_routes.restore_snapshot(config.SNAPSHOT_PATH) is not None:
+            tasks.append(asyncio.create_task(events_routes._events_cache.hydrate()))
+        if config.SNAPSHOT_INTERVAL > 0:
+            tasks.append(asyncio.create_task(events_routes.run_snapshots(config.SNAPSHOT_PATH, config.SNAPSHOT_INTERVAL)))
+    if config.FEED_SNAPSHOT_PATH:
+        tasks.append(asyncio.create_task(
+            events_routes.run_feed_loader(config.FEED_SNAPSHOT_PATH, config.FEED_SNAPSHOT_INTERVAL)
+        ))
+    yield
+    if config.SNAPSHOT_PATH:
+        try:
+            await events_routes.save_snapshot(config.SNAPSHOT_PATH)
+        except Exception as e:
+            logging.error(f"Final snapshot to {config.SNAPSHOT_PATH} failed: {e}")
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
 app = FastAPI(
     title="EventPulse API",
     description="Event discovery platform for concerts and sports with affiliate monetization",
-    version=config.API_VERSION
+    version=config.API_VERSION,
+    lifespan=lifespan
 )
 
+# Load shedding for routes that may call providers (inside CORS, so 503s carry CORS headers)
+_admission = AdmissionController.from_config()
+if config.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware, controller=_admission, is_cached=events_routes.is_cached_request)
+
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -21,10 +63,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Trace-Id", "ETag", "Retry-After"],
 )
 
+# Per-request timing breakdown (sampled)
+app.add_middleware(TracingMiddleware)
+
 # Include API routes
 app.include_router(events_router)
+app.include_router(debug_router)
+app.include_router(alerts_router)
+app.include_router(suggest_router)
 
 
 @app.get("/api/health", response_model=HealthResponse)
@@ -33,6 +82,12 @@ async def health():
     return HealthResponse(status="ok", version=config.API_VERSION)
 
 
+@app.get("/api/health/admission")
+async def admission_metrics() -> dict:
+    """Active and queued requests per admission class, with admitted/shed counters."""
+    return {"enabled": config.ADMISSION_CONTROL, "routes": _admission.snapshot()}
+
+
 @app.get("/")
 async def root():
     """Root endpoint - serve frontend or API info."""
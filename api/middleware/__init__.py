@@ -0,0 +1,5 @@
+"""API middleware package."""
+from api.middleware.admission import AdmissionMiddleware
+from api.middleware.tracing import TracingMiddleware
+
+__all__ = ["AdmissionMiddleware", "TracingMiddleware"]
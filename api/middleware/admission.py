@@ -0,0 +1,81 @@
+"""ASGI middleware that sheds load with 503s instead of letting queues grow."""
+import json
+from typing import Callable, Optional
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from api import config
+from api.services.admission import AdmissionController
+from api.services.tracing import span
+
+# Long-lived responses, capped separately so they cannot starve searches
+_STREAM_PATHS = ("/api/events/watch", "/api/events/stream")
+_SEARCH_PATHS = ("/api/events", "/api/events/by-artist", "/api/events/search-batch")
+
+
+def route_class(path: str) -> Optional[str]:
+    """Admission class of a path: "stream", "search" (may call providers) or None (never limited)."""
+    if path in _STREAM_PATHS:
+        return "stream"
+    if path in _SEARCH_PATHS or (path.startswith("/api/events/") and path.endswith("/package")):
+        return "search"
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    Admit requests through an AdmissionController, answering 503 when it sheds.
+
+    Only limited route classes are counted. ``is_cached(path, query_string)``
+    lets requests the worker can answer from its cache skip the limit, and
+    revalidations (If-None-Match) and package lookups - mostly prebuilt - are
+    admitted ahead of other queued searches. The slot is held until the
+    response has been sent, streaming bodies included.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        is_cached: Optional[Callable[[str, str], bool]] = None
+    ):
+        self.app = app
+        self.controller = controller
+        self.is_cached = is_cached
+
+    def _priority(self, scope: Scope) -> int:
+        if scope["path"].endswith("/package") or Headers(scope=scope).get("if-none-match"):
+            return 0
+        return 1
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = route_class(scope["path"]) if scope["type"] == "http" else None
+        if route is None or (
+            self.is_cached is not None and self.is_cached(scope["path"], scope["query_string"].decode("latin-1"))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        with span("admission"):
+            admitted = await self.controller.acquire(route, self._priority(scope))
+        if not admitted:
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = json.dumps({"detail": "Server is busy, retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(config.ADMISSION_RETRY_AFTER).encode()),
+                (b"cache-control", b"no-store")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,47 @@
+"""ASGI middleware that traces requests and emits Server-Timing."""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from api import config
+from api.services import tracing
+
+
+class TracingMiddleware:
+    """
+    Start a trace for sampled requests and attach its timings to the response.
+
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so the trace context
+    variable is visible to the route and everything it awaits, and so the
+    Server-Timing header is written when the response actually starts.
+    Sending ``X-Debug-Trace: 1`` forces a trace when TRACE_DEBUG is enabled;
+    its JSON is then available from ``/api/debug/traces/{trace_id}``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        force = config.TRACE_DEBUG and Headers(scope=scope).get("x-debug-trace") == "1"
+        trace = tracing.start_trace(scope["path"], force=force)
+        if trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+                if trace.debug:
+                    headers.append("X-Trace-Id", trace.trace_id)
+            await send(message)
+
+        token = tracing.activate(trace)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            tracing.deactivate(token)
+            if trace.debug:
+                tracing.record(trace)
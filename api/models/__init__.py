@@ -5,8 +5,16 @@ from api.models.event import (
     EventSearchRequest,
     TicketsInfo,
     HotelsInfo,
-    EventPackageResponse
+    EventPackageResponse,
+    TicketsStatus,
+    PriceSample,
+    PriceHistory,
+    CalendarDay,
+    CalendarMonth
 )
+from api.models.alert import AlertRequest, AlertResponse
+from api.models.suggest import Suggestion, SuggestResponse
+from api.models.batch import BatchQuery, BatchSearchRequest, BatchResult, BatchSearchResponse
 
 __all__ = [
     "EventMention",
@@ -14,6 +22,19 @@ __all__ = [
     "EventSearchRequest",
     "TicketsInfo",
     "HotelsInfo",
-    "EventPackageResponse"
+    "EventPackageResponse",
+    "TicketsStatus",
+    "PriceSample",
+    "PriceHistory",
+    "CalendarDay",
+    "CalendarMonth",
+    "AlertRequest",
+    "AlertResponse",
+    "Suggestion",
+    "SuggestResponse",
+    "BatchQuery",
+    "BatchSearchRequest",
+    "BatchResult",
+    "BatchSearchResponse"
 ]
 
@@ -0,0 +1,19 @@
+"""Price alert models."""
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class AlertRequest(BaseModel):
+    """Register a one-shot alert for when an event's lowest price drops to a threshold."""
+    event_id: str
+    below: float = Field(..., gt=0)  # Fire when min_price <= below
+    target: Optional[str] = None  # Recipient passed through to the alert sink
+
+
+class AlertResponse(BaseModel):
+    """A registered price alert."""
+    id: int
+    event_id: str
+    below: float
+    target: Optional[str] = None
+    expires_at: Optional[float] = None  # Epoch seconds; dropped unfired after this
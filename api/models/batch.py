@@ -0,0 +1,66 @@
+"""Batch search models."""
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, Union
+
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.models.event import EventMention
+
+_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+class BatchQuery(BaseModel):
+    """One search of a batch: by ``date`` (like /api/events) or by ``artist`` (like /api/events/by-artist)."""
+    date: Optional[str] = Field(default=None, pattern=_DATE)
+    city: Optional[str] = None
+    category: Optional[str] = None
+    artist: Optional[str] = Field(default=None, min_length=1)
+    date_from: Optional[str] = Field(default=None, pattern=_DATE)
+    date_to: Optional[str] = Field(default=None, pattern=_DATE)
+    country_code: Optional[str] = None  # Defaults as in the single-query endpoints
+    limit: int = Field(default=20, ge=1, le=100)
+    page: int = Field(default=0, ge=0)
+
+    @model_validator(mode="after")
+    def _one_kind(self) -> "BatchQuery":
+        if (self.date is None) == (self.artist is None):
+            raise ValueError("each query needs exactly one of 'date' or 'artist'")
+        return self
+
+    def to_query(self, default_country: str) -> Union[EventSearchQuery, ArtistSearchQuery]:
+        if self.artist is not None:
+            return ArtistSearchQuery(
+                artist=self.artist,
+                date_from=self.date_from,
+                date_to=self.date_to,
+                country_code=self.country_code or "US",
+                limit=self.limit,
+                page=self.page
+            )
+        return EventSearchQuery(
+            date=self.date,
+            city=self.city,
+            category=self.category,
+            limit=self.limit,
+            country_code=self.country_code or default_country,
+            page=self.page
+        )
+
+
+class BatchSearchRequest(BaseModel):
+    """Several searches answered in one round trip."""
+    queries: list[BatchQuery] = Field(..., min_length=1)
+
+
+class BatchResult(BaseModel):
+    """Result of one query of a batch, in request order."""
+    status: str  # "ok", "empty" or "error"
+    events: list[EventMention]
+    total: int  # Provider-reported total for artist searches, else the number of events
+    error: Optional[str] = None
+    shared_with: Optional[int] = None  # Index of the earlier query whose fetch answered this one
+
+
+class BatchSearchResponse(BaseModel):
+    """Results of a batch search."""
+    results: list[BatchResult]
+    fetches: int  # Upstream searches actually run after deduplication
@@ -33,6 +33,7 @@ class PaginationMetadata(BaseModel):
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Opaque cursor for the next page, if any
 
 
 class PaginatedEvents(BaseModel):
@@ -75,3 +76,39 @@ class EventPackageResponse(BaseModel):
     tickets: TicketsInfo
     hotels: HotelsInfo
 
+
+class TicketsStatus(BaseModel):
+    """Ticket link of an event package, with whether enrichment has finished."""
+    status: str  # "pending" while the Ticketmaster resolution runs, then "complete"
+    tickets: TicketsInfo
+
+
+class PriceSample(BaseModel):
+    """One point of an event's price history."""
+    timestamp: int  # Unix seconds (bucket start when downsampled)
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class PriceHistory(BaseModel):
+    """Price history of an event, oldest sample first."""
+    event_id: str
+    currency: Optional[str] = None
+    resolution: int  # Bucket size in seconds, 0 for raw samples
+    samples: list[PriceSample]
+
+
+class CalendarDay(BaseModel):
+    """Number of known events on one day, by category."""
+    date: str  # YYYY-MM-DD
+    count: int
+    categories: dict[str, int]
+
+
+class CalendarMonth(BaseModel):
+    """Per-day event counts of a city for one month; days without events are omitted."""
+    city: str
+    month: str  # YYYY-MM
+    category: Optional[str] = None
+    total: int
+    days: list[CalendarDay]
@@ -0,0 +1,18 @@
+"""Autocomplete models."""
+from pydantic import BaseModel
+from typing import Optional
+
+
+class Suggestion(BaseModel):
+    """An event name, venue or city matching the typed prefix."""
+    text: str
+    kind: str  # "event", "venue" or "city"
+    events: int  # Known events naming it
+    score: float  # Summed popularity of those events
+
+
+class SuggestResponse(BaseModel):
+    """Suggestions for a prefix, best first."""
+    query: str
+    kind: Optional[str] = None
+    suggestions: list[Suggestion]
@@ -1,4 +1,7 @@
 """API routes package."""
 from api.routes.events import router as events_router
+from api.routes.debug import router as debug_router
+from api.routes.alerts import router as alerts_router
+from api.routes.suggest import router as suggest_router
 
-__all__ = ["events_router"]
+__all__ = ["events_router", "debug_router", "alerts_router", "suggest_router"]
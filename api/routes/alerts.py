@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Price alert routes."""
+import time
+from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import Response
+from api import config
+from api.models.alert import AlertRequest, AlertResponse
+from api.services.alerts import Alert, AlertLimitError, alert_expiry
+from api.routes import events as events_routes
+
+router = APIRouter(prefix="/api/alerts", tags=["alerts"])
+
+
+def _to_response(alert: Alert) -> AlertResponse:
+    return AlertResponse(
+        id=alert.id, event_id=alert.event_id, below=alert.threshold,
+        target=alert.target, expires_at=alert.expires_at
+    )
+
+
+@router.post("", response_model=AlertResponse, status_code=201)
+async def create_alert(request: AlertRequest) -> AlertResponse:
+    """
+    Register a one-shot alert: fires the next time a refresh of the event
+    reports a min_price at or below ``below``, then is removed.
+
+    The event must be known to this server (404 otherwise); the alert expires
+    unfired at the end of the event's day. 429 when an alert cap is reached.
+    """
+    event = await events_routes._events_cache.fetch(request.event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    now = time.time()
+    expires_at = alert_expiry(event, config.ALERT_MAX_AGE_DAYS * 86400, now=now)
+    if expires_at <= now:
+        raise HTTPException(status_code=422, detail="Event has already taken place")
+    try:
+        alert = events_routes._alert_engine.add(
+            request.event_id, request.below, target=request.target, expires_at=expires_at
+        )
+    except AlertLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _to_response(alert)
+
+
+@router.get("/{alert_id}", response_model=AlertResponse)
+async def get_alert(alert_id: int = Path(..., description="Alert ID")) -> AlertResponse:
+    """Get a pending alert (404 once it has fired or been deleted)."""
+    alert = events_routes._alert_engine.get(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return _to_response(alert)
+
+
+@router.delete("/{alert_id}", status_code=204)
+async def delete_alert(alert_id: int = Path(..., description="Alert ID")) -> Response:
+    """Cancel a pending alert."""
+    if not events_routes._alert_engine.remove(alert_id):
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return Response(status_code=204)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Debug routes for inspecting request internals."""
+from fastapi import APIRouter, HTTPException, Path
+from api import config
+from api.services import tracing
+from api.routes import events as events_routes
+
+router = APIRouter(prefix="/api/debug", tags=["debug"])
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str = Path(..., description="Trace ID from the X-Trace-Id header")) -> dict:
+    """Return the recorded span breakdown of a debug-traced request."""
+    if not config.TRACE_DEBUG:
+        raise HTTPException(status_code=404, detail="Tracing debug mode is disabled")
+    trace = tracing.get_recorded(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found or expired")
+    return trace.to_dict()
+
+
+@router.get("/providers")
+async def get_provider_decisions() -> dict:
+    """Return provider latency estimates and, if enabled, adaptive ordering stats and recent decisions."""
+    if not config.TRACE_DEBUG:
+        raise HTTPException(status_code=404, detail="Tracing debug mode is disabled")
+    collector = events_routes._multi_collector
+    return {
+        "configured_order": [collector._provider_name(c) for c in collector.collectors],
+        "latency": collector.latency.snapshot(),
+        "policy": collector.policy.snapshot() if collector.policy is not None else None
+    }
@@ -1,34 +1,342 @@
 # -*- coding: utf-8 -*-
 """Events API routes."""
-from fastapi import APIRouter, Query, Path, HTTPException
-from typing import List, Optional
-from datetime import datetime, timedelta
-from urllib.parse import urlencode
+from fastapi import APIRouter, Query, Path, Header, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Callable, List, Optional
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlencode
+import asyncio
+import json
 import logging
-from api.models.event import EventMention, EventPackageResponse, TicketsInfo, HotelsInfo, PaginatedEvents
+import os
+import time
+from api.models.batch import BatchResult, BatchSearchRequest, BatchSearchResponse
+from api.models.event import EventMention, EventPackageResponse, TicketsInfo, TicketsStatus, HotelsInfo, PaginatedEvents, PaginationMetadata, PriceHistory, PriceSample, CalendarDay, CalendarMonth
 from api.collectors.ticketmaster import TicketmasterCollector
 from api.collectors.viagogo import ViagogoCollector
 from api.services.collector import MultiCollector
 from api.collectors.base import EventSearchQuery, ArtistSearchQuery
+from api.services.deadline import Deadline, reset_provider_timeout, set_provider_timeout
+from api.services.cache import CacheEntry, TieredCache, content_version, get_shared_backend
+from api.services.store import EventStore
+from api.services.snapshot import EventSnapshot, write_snapshot
+from api.services.packages import PackageMaterializer
+from api.services.sse import KEEPALIVE, SSE_HEADERS, sse_frame, sse_frame_bytes
+from api.services.watcher import PriceWatcher
+from api.services.prefetch import DatePrefetcher
+from api.services.price_history import PriceHistoryStore
+from api.services.calendar import EventCalendar
+from api.services.suggest import SuggestIndex
+from api.services.resolver import TrigramResolver
+from api.services.alerts import AlertEngine, LogSink, MemorySink
+from api.services.batch import plan_batch
+from api.services.columnar import ColumnarViews, ResultFilter
+from api.services.search_cache import SearchCache, derive_entry
+from api.services.canonical import LIMIT_BUCKETS, CanonicalQuery, canonical_fields, canonicalize
+from api.services.pagination import ResultSnapshots, decode_cursor, encode_cursor
+from api.services.provider_policy import AdaptiveProviderPolicy, parse_tiers
+from api.services.projection import encode_events, encode_paginated, parse_fields, Projection
+from api.services.tracing import span
 from api import config
 
 router = APIRouter(prefix="/api", tags=["events"])
 
+# Shared cache tier (Redis protocol), None unless REDIS_URL is set
+_l2_backend = get_shared_backend()
+
+# Optional adaptive ordering; without it the list order below is the priority order
+_provider_policy = AdaptiveProviderPolicy(
+    tiers=parse_tiers(config.PROVIDER_PRIORITY_TIERS),
+    min_samples=config.PROVIDER_POLICY_MIN_SAMPLES,
+    skip_below=config.PROVIDER_SKIP_HIT_RATE,
+    explore_rate=config.PROVIDER_EXPLORE_RATE
+) if config.ADAPTIVE_PROVIDER_ORDER else None
+
 # Initialize MultiCollector with Ticketmaster first (primary), then Viagogo (fallback)
 # Order matters: first collector in list has highest priority
 _multi_collector = MultiCollector(collectors=[
     TicketmasterCollector(), # Primary: Ticketmaster for event discovery
     ViagogoCollector()      # Fallback: Viagogo if Ticketmaster returns empty
-])
+], l2=_l2_backend, policy=_provider_policy)
+
+# Events by ID for package lookup (in-process, plus the shared tier if configured)
+_events_cache = EventStore(l2=_l2_backend, ttl=config.EVENT_STORE_TTL)
+
+# Search results and Ticketmaster resolutions, versioned for ETags
+_search_cache = SearchCache(
+    ttl=config.SEARCH_CACHE_TTL,
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+    l2=_l2_backend,
+    subsume=config.SEARCH_SUBSUMPTION,
+    subsumable_categories=config.SUBSUMABLE_CATEGORIES
+)
+_resolution_cache = TieredCache(
+    "resolution",
+    ttl=config.RESOLUTION_CACHE_TTL,
+    encode=lambda url: (url or "").encode(),
+    decode=lambda data: data.decode() or None,
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+    l2=_l2_backend
+)
+
+# Matches package events to stored Ticketmaster events before asking the API
+_local_resolver = TrigramResolver(
+    _events_cache,
+    min_similarity=config.RESOLVER_MIN_SIMILARITY,
+    min_margin=config.RESOLVER_MIN_MARGIN
+)
+
+# Frozen by-artist windows that cursor pages are sliced from
+_result_snapshots = ResultSnapshots(
+    ttl=config.ARTIST_SNAPSHOT_TTL,
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+    l2=_l2_backend
+)
+
+# (timestamp, min, max) samples recorded on every provider refresh of an event
+_price_history = PriceHistoryStore(
+    retention=config.PRICE_HISTORY_RETENTION_DAYS * 86400,
+    max_samples=config.PRICE_HISTORY_MAX_SAMPLES
+)
+_events_cache.add_refresh_listener(_price_history.record)
 
-# In-memory cache for events (simulates storage for package lookup)
-_events_cache: dict[str, EventMention] = {}
+# Per-(city, category, day) counts of stored events for the date picker
+_calendar = EventCalendar(_events_cache)
 
+# Autocomplete over stored event names, venues and cities
+_suggest_index = SuggestIndex(_events_cache)
 
-def _cache_events(events: List[EventMention]) -> None:
+# One-shot price-drop alerts, evaluated on every refresh
+_alert_engine = AlertEngine(
+    sink=MemorySink() if config.ALERT_SINK == "memory" else LogSink(),
+    max_alerts=config.ALERT_MAX_ALERTS,
+    max_per_event=config.ALERT_MAX_PER_EVENT,
+    max_per_target=config.ALERT_MAX_PER_TARGET
+)
+_events_cache.add_refresh_listener(_alert_engine.on_refresh)
+
+# Polls prices/availability of events open in clients, shared by all watchers
+_price_watcher = PriceWatcher(
+    _events_cache,
+    _multi_collector.collectors,
+    interval=config.WATCH_POLL_INTERVAL,
+    batch_size=config.WATCH_BATCH_SIZE,
+    latency=_multi_collector.latency
+)
+
+# NumPy columns of cached result sets, for server-side filter/sort
+_columnar_views = ColumnarViews(max_entries=config.SEARCH_CACHE_MAX_ENTRIES)
+# Results a filtered date search is applied to: one fetch of the largest page size
+FILTER_WINDOW = LIMIT_BUCKETS[-1]
+
+
+# Latency key for package-time Ticketmaster resolutions
+_RESOLVE_PROVIDER = "ticketmaster.resolve"
+
+
+async def _cache_events(events: List[EventMention]) -> None:
     """Cache events for package lookup."""
-    for event in events:
-        _events_cache[event.id] = event
+    await _events_cache.upsert_many(events)
+
+
+# Single-day misses fetch a window of PREFETCH_DAYS days upstream (1 = off)
+_date_prefetcher = DatePrefetcher(
+    _multi_collector,
+    _search_cache,
+    on_events=_cache_events,
+    days=config.PREFETCH_DAYS,
+    max_events=config.PREFETCH_MAX_EVENTS,
+    ttl=config.SEARCH_CACHE_TTL
+)
+
+
+def restore_snapshot(path: str) -> Optional[EventSnapshot]:
+    """
+    Warm the caches from a snapshot written by a previous process.
+
+    Search results and resolutions are loaded into L1 (expired ones are
+    skipped); events stay in the memory-mapped file until fetched or until
+    ``_events_cache.hydrate()`` copies them over.
+    """
+    if not os.path.exists(path):
+        return None
+    started = time.monotonic()
+    try:
+        snapshot = EventSnapshot(path)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring snapshot {path}: {e}")
+        return None
+    if snapshot.age > config.SNAPSHOT_MAX_AGE:
+        logging.info(f"Ignoring snapshot {path}: {snapshot.age:.0f}s old")
+        snapshot.close()
+        return None
+    searches = _search_cache.load(snapshot.cache_items("search"))
+    resolutions = _resolution_cache.load_local(snapshot.cache_items("resolution"))
+    _events_cache.attach_snapshot(snapshot)
+    logging.info(
+        f"Restored snapshot {path} in {time.monotonic() - started:.2f}s: "
+        f"{len(snapshot)} events, {searches} searches, {resolutions} resolutions"
+    )
+    return snapshot
+
+
+async def save_snapshot(path: str) -> None:
+    """Write the event store and caches to ``path``; encoding runs in a worker thread."""
+    if _events_cache.hydrating:
+        # The previous snapshot still holds events this process has not loaded yet
+        logging.info("Skipping snapshot while the previous one is still being loaded")
+        return
+    started = time.monotonic()
+    events = _events_cache.local_events()
+    caches = {"search": _search_cache.dump(), "resolution": _resolution_cache.dump_local()}
+    size = await asyncio.to_thread(write_snapshot, path, events, caches)
+    logging.info(f"Wrote snapshot of {len(events)} events ({size / 1e6:.1f} MB) to {path} in {time.monotonic() - started:.2f}s")
+
+
+async def run_snapshots(path: str, interval: float) -> None:
+    """Write a snapshot every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await save_snapshot(path)
+        except Exception as e:
+            logging.error(f"Snapshot to {path} failed: {e}")
+
+
+async def load_feed_snapshot(path: str, loaded_at: float = 0.0) -> float:
+    """
+    Merge the feed snapshot at ``path`` into the event store if it was
+    written after ``loaded_at``; returns the creation time of the snapshot
+    now loaded (``loaded_at`` when there was nothing new).
+    """
+    if not os.path.exists(path):
+        return loaded_at
+    try:
+        snapshot = EventSnapshot(path)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring feed snapshot {path}: {e}")
+        return loaded_at
+    try:
+        if snapshot.created_at <= loaded_at:
+            return loaded_at
+        started = time.monotonic()
+        stored = await _events_cache.load(snapshot, replace=True)
+        logging.info(
+            f"Loaded feed snapshot {path} in {time.monotonic() - started:.2f}s: "
+            f"{stored} of {len(snapshot)} events new or updated"
+        )
+        return snapshot.created_at
+    finally:
+        snapshot.close()
+
+
+async def run_feed_loader(path: str, interval: float) -> None:
+    """Load the feed snapshot now and whenever it is replaced, until cancelled."""
+    loaded_at = 0.0
+    while True:
+        try:
+            loaded_at = await load_feed_snapshot(path, loaded_at)
+        except Exception as e:
+            logging.error(f"Loading feed snapshot {path} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def is_cached_request(path: str, query_string: str) -> bool:
+    """Whether a date search can be answered from this worker's search cache (for admission control)."""
+    if path != "/api/events":
+        return False
+    params = {k: v[0] for k, v in parse_qs(query_string).items()}
+    # Filtered searches read one window of results (see search_events)
+    filtered = any(params.get(k) for k in ("min_price", "max_price", "has_tickets", "sort"))
+    try:
+        query = EventSearchQuery(
+            date=params["date"],
+            city=params.get("city"),
+            category=params.get("category"),
+            limit=FILTER_WINDOW if filtered else int(params.get("limit", 20)),
+            country_code=params.get("country_code", config.DEFAULT_COUNTRY_CODE),
+            page=0 if filtered else int(params.get("page", 0))
+        )
+    except (KeyError, ValueError):
+        return False
+    return _search_cache.cached_locally(canonicalize(query).query)
+
+
+def _json_response(encode: Callable[[], bytes]) -> Response:
+    """Encode a response body ourselves so serialization shows up as a trace span."""
+    with span("serialize"):
+        body = encode()
+    return Response(content=body, media_type="application/json")
+
+
+def _parse_projection(fields: Optional[str]) -> Projection:
+    """Validate the fields= parameter, mapping unknown names to a 422."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _parse_result_filter(
+    min_price: Optional[float],
+    max_price: Optional[float],
+    has_tickets: Optional[bool],
+    sort: Optional[str]
+) -> ResultFilter:
+    try:
+        return ResultFilter(min_price=min_price, max_price=max_price, has_tickets=has_tickets, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _apply_filter(version: str, events: List[EventMention], result_filter: ResultFilter) -> List[EventMention]:
+    """Filter/sort a cached result set through its (memoized) columnar view."""
+    if not result_filter.active:
+        return events
+    with span("filter", count=len(events)):
+        return _columnar_views.get(version, events).apply(result_filter)
+
+
+def _projection_variant(projection: Projection) -> str:
+    return ",".join(projection) if projection else "*"
+
+
+def _etag(*parts: str) -> str:
+    """Strong ETag derived from cached result versions and response variant."""
+    return f'"{content_version(":".join(parts).encode())}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (list, weak or '*') against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _conditional_response(
+    encode: Callable[[], bytes],
+    etag: str,
+    max_age: int,
+    if_none_match: Optional[str]
+) -> Response:
+    """
+    Return 304 when the client already has ``etag``, else the encoded payload.
+
+    The body is encoded lazily so a revalidation skips serialization.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response = _json_response(encode)
+    response.headers.update(headers)
+    return response
 
 
 def _build_booking_url(city: str, check_in: str, check_out: str) -> str:
@@ -70,24 +378,66 @@ async def search_events(
         default=config.DEFAULT_COUNTRY_CODE,
         description="Country code (e.g., 'IL', 'US')"
     ),
-    page: int = Query(default=0, ge=0, description="Page number (0-indexed)")
-) -> List[EventMention]:
+    page: int = Query(default=0, ge=0, description="Page number (0-indexed)"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated EventMention fields to return (e.g. 'id,text,url'). Default: all."
+    ),
+    min_price: Optional[float] = Query(default=None, ge=0, description="Lowest ticket price at least this"),
+    max_price: Optional[float] = Query(default=None, ge=0, description="Lowest ticket price at most this"),
+    has_tickets: Optional[bool] = Query(default=None, description="Only events with (true) or without (false) tickets"),
+    sort: Optional[str] = Query(
+        default=None,
+        pattern="^(price|popularity|date)$",
+        description="Sort by price (cheapest first), popularity (highest first) or date (soonest first)"
+    ),
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
     """
     Search for events by date with optional city and category filters.
     
     Returns a list of events with affiliate ticket URLs for monetization.
+    Price/availability filters and sort apply to the first FILTER_WINDOW
+    results as a whole; the requested page is sliced from the matches, and a
+    filtered page starting past the window is rejected with 422.
     """
-    query = EventSearchQuery(
-        date=date,
-        city=city,
-        category=category,
-        limit=limit,
-        country_code=country_code,
-        page=page
+    deadline = Deadline(config.REQUEST_DEADLINE)
+    projection = _parse_projection(fields)
+    result_filter = _parse_result_filter(min_price, max_price, has_tickets, sort)
+    if result_filter.active:
+        if page * limit >= FILTER_WINDOW:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Filtered or sorted results cover the first {FILTER_WINDOW} events only"
+            )
+        # Filter one window of results, then page through the matches
+        query = EventSearchQuery(
+            date=date,
+            city=city,
+            category=category,
+            limit=FILTER_WINDOW,
+            country_code=country_code,
+            page=0
+        )
+    else:
+        query = EventSearchQuery(
+            date=date,
+            city=city,
+            category=category,
+            limit=limit,
+            country_code=country_code,
+            page=page
+        )
+    entry = await _search_cached(query, deadline)
+    events = _apply_filter(entry.version, entry.value.events, result_filter)
+    if result_filter.active:
+        events = events[page * limit:(page + 1) * limit]
+    return _conditional_response(
+        lambda: encode_events(events, projection),
+        etag=_etag(entry.version, str(page), str(limit), _projection_variant(projection), result_filter.variant()),
+        max_age=entry.max_age(),
+        if_none_match=if_none_match
     )
-    events = await _multi_collector.search(query)
-    _cache_events(events)
-    return events
 
 
 @router.get("/events/by-artist", response_model=PaginatedEvents)
@@ -111,38 +461,362 @@ async def search_events_by_artist(
         description="Country code (e.g., 'US', 'GB', 'IL')"
     ),
     limit: int = Query(default=20, ge=1, le=100, description="Max events to return"),
-    page: int = Query(default=0, ge=0, description="Page number (0-indexed)")
-) -> PaginatedEvents:
+    page: int = Query(default=0, ge=0, description="Page number (0-indexed)"),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from pagination.next_cursor; takes precedence over page"
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated EventMention fields to return (e.g. 'id,text,url'). Default: all."
+    ),
+    min_price: Optional[float] = Query(default=None, ge=0, description="Lowest ticket price at least this"),
+    max_price: Optional[float] = Query(default=None, ge=0, description="Lowest ticket price at most this"),
+    has_tickets: Optional[bool] = Query(default=None, description="Only events with (true) or without (false) tickets"),
+    sort: Optional[str] = Query(
+        default=None,
+        pattern="^(price|popularity|date)$",
+        description="Sort by price (cheapest first), popularity (highest first) or date (soonest first)"
+    ),
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
     """
     Search for events by artist/performer name.
     
     Returns a list of upcoming events for the specified artist with affiliate ticket URLs.
+    The first request fetches a window of ARTIST_SNAPSHOT_WINDOW results once;
+    later pages (by cursor or page) are sliced from that snapshot locally.
+    Cursors end with the window; when the provider has more results,
+    has_more stays true and the next page is requested by page number.
+    Price/availability filters and sort apply to the whole snapshot window;
+    a cursor carries them, so its pages ignore the filter parameters. A
+    filtered or sorted page past the window is rejected with 422.
     """
-    query = ArtistSearchQuery(
-        artist=artist,
-        date_from=date_from,
-        date_to=date_to,
-        country_code=country_code,
+    deadline = Deadline(config.REQUEST_DEADLINE)
+    projection = _parse_projection(fields)
+    result_filter = _parse_result_filter(min_price, max_price, has_tickets, sort)
+
+    if cursor:
+        try:
+            snapshot_id, offset, view = decode_cursor(cursor)
+            result_filter = ResultFilter.from_dict(view)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid cursor")
+        snapshot = await _result_snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise HTTPException(status_code=410, detail="Cursor expired; restart the search")
+    elif (page + 1) * limit <= config.ARTIST_SNAPSHOT_WINDOW:
+        # Fetch one large window upstream and serve every page inside it locally
+        offset = page * limit
+        window_query = ArtistSearchQuery(
+            artist=artist,
+            date_from=date_from,
+            date_to=date_to,
+            country_code=country_code,
+            limit=config.ARTIST_SNAPSHOT_WINDOW,
+            page=0
+        )
+        snapshot = await _result_snapshots.add(await _search_by_artist_cached(window_query, deadline))
+    elif result_filter.active:
+        # Filtering one provider page would change what page numbers mean
+        raise HTTPException(
+            status_code=422,
+            detail=f"Filtered or sorted results cover the first {config.ARTIST_SNAPSHOT_WINDOW} events only"
+        )
+    else:
+        # Beyond the snapshot window: page straight through to the provider
+        query = ArtistSearchQuery(
+            artist=artist,
+            date_from=date_from,
+            date_to=date_to,
+            country_code=country_code,
+            limit=limit,
+            page=page
+        )
+        entry = await _search_by_artist_cached(query, deadline)
+        events, total = entry.value.events, entry.value.total
+        has_more = total > (page + 1) * limit
+        return _conditional_response(
+            lambda: encode_paginated(
+                events,
+                PaginationMetadata(total=total, page=page, limit=limit, has_more=has_more),
+                projection
+            ),
+            etag=_etag(entry.version, str(page), str(limit), _projection_variant(projection), result_filter.variant()),
+            max_age=entry.max_age(),
+            if_none_match=if_none_match
+        )
+
+    window = _apply_filter(snapshot.version, snapshot.value.events, result_filter)
+    events = window[offset:offset + limit]
+    # A filtered view only knows the matches inside the snapshot window
+    total = len(window) if result_filter.active else snapshot.value.total
+    logging.info(f"Artist search for {artist}: serving {len(events)} of {len(window)} snapshot events (total: {total})")
+
+    # Cursors walk the snapshot window; past its end, unfiltered paging
+    # continues by page number through the provider
+    in_window = offset + limit < len(window)
+    has_more = in_window if result_filter.active else total > offset + limit
+    pagination = PaginationMetadata(
+        total=total,
+        page=offset // limit,
         limit=limit,
-        page=page
+        has_more=has_more,
+        next_cursor=encode_cursor(snapshot.version, offset + limit, result_filter.to_dict()) if in_window else None
     )
-    events, total = await _multi_collector.search_by_artist(query)
-    _cache_events(events)
-    
-    logging.info(f"Artist search for {artist}: found {len(events)} events (total: {total})")
-    
-    # Calculate has_more
-    has_more = total > (page + 1) * limit
-    
-    return PaginatedEvents(
-        events=events,
-        pagination={
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "has_more": has_more
+    return _conditional_response(
+        lambda: encode_paginated(events, pagination, projection),
+        etag=_etag(snapshot.version, str(offset), str(limit), _projection_variant(projection), result_filter.variant()),
+        max_age=snapshot.max_age(),
+        if_none_match=if_none_match
+    )
+
+
+@router.get("/events/watch")
+async def watch_events(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated event IDs to watch")
+) -> StreamingResponse:
+    """
+    Stream live price and availability changes for events (Server-Sent Events).
+
+    Sends a "snapshot" frame with the current min_price/max_price/has_tickets,
+    then a "change" frame holding only the fields that changed whenever the
+    shared poller sees an update.
+    """
+    event_ids = [i.strip() for i in ids.split(",") if i.strip()]
+    if not event_ids:
+        raise HTTPException(status_code=422, detail="ids must list at least one event ID")
+    if len(event_ids) > config.WATCH_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {config.WATCH_MAX_IDS} events can be watched")
+
+    async def stream():
+        # Subscribing here ties the subscription to the stream: a response
+        # that is never iterated leaves nothing to clean up
+        subscription = _price_watcher.subscribe(event_ids)
+        try:
+            yield sse_frame("snapshot", _price_watcher.snapshot(subscription))
+            while not await request.is_disconnected():
+                change = await _price_watcher.next_change(subscription, timeout=config.WATCH_KEEPALIVE)
+                yield KEEPALIVE if change is None else sse_frame("change", change)
+        finally:
+            _price_watcher.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _stream_frame(kind: str, payload: bytes, fmt: str) -> bytes:
+    """Wrap an encoded JSON object as an NDJSON line or an SSE frame."""
+    return sse_frame_bytes(kind, payload) if fmt == "sse" else payload + b"\n"
+
+
+@router.get("/events/stream")
+async def stream_events(
+    date: str = Query(
+        ...,
+        description="Event date in YYYY-MM-DD format (required)",
+        pattern=r"^\d{4}-\d{2}-\d{2}$"
+    ),
+    city: Optional[str] = Query(
+        default=None,
+        description="City name, or several comma-separated (each is searched separately)"
+    ),
+    category: Optional[str] = Query(
+        default=None,
+        description="Event category: music, sports, arts, family. Optional filter."
+    ),
+    limit: int = Query(default=20, ge=1, le=100, description="Max events per provider and city"),
+    country_code: str = Query(
+        default=config.DEFAULT_COUNTRY_CODE,
+        description="Country code (e.g., 'IL', 'US')"
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated EventMention fields to return (e.g. 'id,text,url'). Default: all."
+    ),
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson or sse")
+) -> StreamingResponse:
+    """
+    Search for events, streaming results from each provider as they arrive.
+
+    Every provider is queried for every city at once (no fallback). Each
+    answer is sent as an "events" frame holding the events not sent yet;
+    cached searches are sent first without calling providers. A final
+    "summary" frame reports the total, events per provider and failures.
+    """
+    projection = _parse_projection(fields)
+    cities = [c.strip() for c in city.split(",") if c.strip()] if city else []
+    if len(cities) > config.STREAM_MAX_CITIES:
+        raise HTTPException(status_code=422, detail=f"At most {config.STREAM_MAX_CITIES} cities can be searched at once")
+    queries = [
+        canonical_fields(EventSearchQuery(date=date, city=c, category=category, limit=limit, country_code=country_code))
+        for c in cities or [None]
+    ]
+    deadline = Deadline(config.STREAM_DEADLINE)
+
+    async def stream():
+        started = time.monotonic()
+        sent = set()
+        providers = {}
+        failures = []
+
+        def events_frame(provider: str, query: EventSearchQuery, events: List[EventMention]) -> Optional[bytes]:
+            fresh = [e for e in events if e.id not in sent]
+            if not fresh:
+                return None
+            sent.update(e.id for e in fresh)
+            providers[provider] = providers.get(provider, 0) + len(fresh)
+            head = json.dumps({
+                "type": "events",
+                "provider": provider,
+                "city": query.city,
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 1)
+            }, separators=(",", ":")).encode()
+            return _stream_frame("events", head[:-1] + b',"events":' + encode_events(fresh, projection) + b"}", fmt)
+
+        pending = []
+        for query in queries:
+            entry = await _search_cache.get(query)
+            if entry is None:
+                pending.append(query)
+            elif (frame := events_frame("cache", query, entry.value.events)) is not None:
+                yield frame
+
+        async for result in _multi_collector.search_each(pending, deadline):
+            if result.events:
+                await _cache_events(result.events)
+                if (frame := events_frame(result.provider, result.query, result.events)) is not None:
+                    yield frame
+            elif result.status != "empty":
+                failures.append({
+                    "provider": result.provider,
+                    "city": result.query.city,
+                    "status": result.status,
+                    "error": result.error
+                })
+
+        summary = {
+            "type": "summary",
+            "total": len(sent),
+            "providers": providers,
+            "failures": failures,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1)
         }
+        yield _stream_frame("summary", json.dumps(summary, separators=(",", ":")).encode(), fmt)
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type, headers=SSE_HEADERS)
+
+
+@router.post("/events/search-batch", response_model=BatchSearchResponse)
+async def search_events_batch(request: BatchSearchRequest) -> Response:
+    """
+    Run several date and artist searches in one request.
+
+    Identical queries are fetched once, and queries differing only in page or
+    limit share one wider fetch. At most BATCH_CONCURRENCY searches run at a
+    time, all under one request deadline. Results come back in request order,
+    each with its own status, so one failing search does not fail the batch.
+    """
+    if len(request.queries) > config.BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=422, detail=f"At most {config.BATCH_MAX_QUERIES} queries per batch")
+    deadline = Deadline(config.REQUEST_DEADLINE)
+    queries = [q.to_query(config.DEFAULT_COUNTRY_CODE) for q in request.queries]
+    plan = plan_batch(queries)
+    semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+
+    async def fetch(query) -> CacheEntry:
+        async with semaphore:
+            if isinstance(query, ArtistSearchQuery):
+                return await _search_by_artist_cached(query, deadline)
+            return await _search_cached(query, deadline)
+
+    with span("batch", queries=len(queries), fetches=len(plan.fetches)):
+        outcomes = await asyncio.gather(*(fetch(q) for q in plan.fetches), return_exceptions=True)
+
+    results = []
+    first_user = {}
+    for i, (n, start, stop) in enumerate(plan.slices):
+        shared_with = first_user.setdefault(n, i)
+        outcome = outcomes[n]
+        if isinstance(outcome, Exception):
+            logging.error(f"Batch search {plan.fetches[n]} failed: {outcome}")
+            result = BatchResult(status="error", events=[], total=0, error=str(outcome))
+        else:
+            events = outcome.value.events[start:stop]
+            total = outcome.value.total if isinstance(queries[i], ArtistSearchQuery) else len(events)
+            result = BatchResult(status="ok" if events else "empty", events=events, total=total)
+        result.shared_with = shared_with if shared_with != i else None
+        results.append(result)
+
+    response = BatchSearchResponse(results=results, fetches=len(plan.fetches))
+    return _json_response(lambda: response.model_dump_json().encode())
+
+
+@router.get("/events/calendar", response_model=CalendarMonth)
+async def get_event_calendar(
+    city: str = Query(..., min_length=1, description="City name (e.g., 'Tel Aviv')"),
+    month: str = Query(..., description="Month in YYYY-MM format", pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    category: Optional[str] = Query(default=None, description="Only count this category (e.g., 'music')")
+) -> Response:
+    """
+    Get the number of events on each day of a month in a city.
+
+    Counts come from events already fetched or loaded from a feed snapshot,
+    maintained as the event store changes, so this never calls a provider.
+    """
+    with span("calendar"):
+        counts = _calendar.month(city, month, category)
+    days = [
+        CalendarDay(date=day, count=sum(categories.values()), categories=categories)
+        for day, categories in counts.items()
+    ]
+    calendar = CalendarMonth(
+        city=city,
+        month=month,
+        category=category,
+        total=sum(day.count for day in days),
+        days=days
     )
+    return _json_response(lambda: calendar.model_dump_json().encode())
+
+
+def _narrow(entry: CacheEntry, canonical: CanonicalQuery, total: Optional[int] = None) -> CacheEntry:
+    """The part of a canonical query's cached result that answers the original query."""
+    if not canonical.sliced:
+        return entry
+    events = entry.value.events[canonical.start:canonical.stop]
+    return derive_entry(entry, events, len(events) if total is None else total, f"{canonical.start}:{canonical.stop}")
+
+
+async def _search_cached(query: EventSearchQuery, deadline: Deadline) -> CacheEntry:
+    """Run a date search through the search cache (and the date prefetch, if on), canonicalized."""
+    canonical = canonicalize(query)
+    query = canonical.query
+    entry = await _search_cache.get(query)
+    if entry is None and _date_prefetcher.enabled:
+        with span("prefetch"):
+            wait = min(config.PREFETCH_WAIT, deadline.remaining() - config.PROVIDER_TIMEOUT_MIN)
+            entry = await _date_prefetcher.get(query, wait)
+    if entry is None:
+        with span("search"):
+            events = await _multi_collector.search(query, deadline=deadline)
+        await _cache_events(events)
+        entry = await _search_cache.put(query, events, len(events))
+    return _narrow(entry, canonical)
+
+
+async def _search_by_artist_cached(query: ArtistSearchQuery, deadline: Deadline) -> CacheEntry:
+    """Run an artist search through the search cache, canonicalized."""
+    canonical = canonicalize(query)
+    query = canonical.query
+    entry = await _search_cache.get(query)
+    if entry is None:
+        with span("search"):
+            events, total = await _multi_collector.search_by_artist(query, deadline=deadline)
+        await _cache_events(events)
+        entry = await _search_cache.put(query, events, total)
+    return _narrow(entry, canonical, total=entry.value.total)
 
 
 def _determine_ticket_info(event: EventMention, tm_url: Optional[str] = None) -> TicketsInfo:
@@ -214,49 +888,79 @@ def _determine_ticket_info(event: EventMention, tm_url: Optional[str] = None) ->
     return TicketsInfo(url=None, ticket_provider=None)
 
 
-@router.get("/events/{event_id}/package", response_model=EventPackageResponse)
-async def get_event_package(
-    event_id: str = Path(..., description="Event ID from any provider"),
-    origin_city: Optional[str] = Query(
-        default=None,
-        description="Origin city for flights (for future use)"
-    )
-) -> EventPackageResponse:
+def _resolution_key(event: EventMention) -> str:
+    return "|".join((event.text, event.city, event.timestamp))
+
+
+async def _resolve_locally(event: EventMention) -> Optional[CacheEntry]:
+    """The cached resolution of an event, or a confident local match; None otherwise."""
+    key = _resolution_key(event)
+    entry = await _resolution_cache.get(key)
+    if entry is not None:
+        return entry
+
+    with span("resolve.local"):
+        local_match = _local_resolver.resolve(event.text, event.city, event.timestamp)
+    if local_match is not None:
+        return await _resolution_cache.set(key, local_match.url, version=local_match.url)
+    return None
+
+
+async def _resolve_ticketmaster_url(event: EventMention, deadline: Deadline) -> CacheEntry:
     """
-    Get a package for an event including tickets and hotel links.
-    
-    Returns event details with affiliate URLs for tickets and hotels.
-    Ticket provider is determined by priority: Ticketmaster -> Official site -> Viagogo.
+    Resolve (and cache) the Ticketmaster URL matching an event, or None.
+
+    A confident match among stored Ticketmaster events answers locally.
+    Otherwise the lookup gets whatever is left of the request deadline,
+    capped by the adaptive estimate for resolutions. A timeout yields an
+    uncached None so the next request tries again.
     """
-    # Try to find event in cache
-    event = _events_cache.get(event_id)
-    
-    if not event:
-        # Return mock event for demo purposes if not in cache
-        event = EventMention(
-            id=event_id,
-            text="Event Package Demo",
-            url="https://www.ticketmaster.com/",
-            timestamp=datetime.now().strftime("%Y-%m-%d"),
-            venue_name="Demo Venue",
-            city="New York",
-            category="music",
-            provider="ticketmaster"
-        )
+    entry = await _resolve_locally(event)
+    if entry is not None:
+        return entry
 
-    
+    key = _resolution_key(event)
+    timeout = min(_multi_collector.latency.timeout_cap(_RESOLVE_PROVIDER), deadline.remaining())
+    tm_collector = TicketmasterCollector()
+    token = set_provider_timeout(timeout)
+    started = time.monotonic()
+    try:
+        with span("resolve"):
+            tm_match = await asyncio.wait_for(
+                tm_collector.resolve_event(event.text, event.city, event.timestamp),
+                timeout=timeout
+            )
+    except asyncio.TimeoutError:
+        logging.warning(f"Ticketmaster resolution timed out after {timeout:.2f}s for {event.id}")
+        now = time.time()
+        return CacheEntry(value=None, version="timeout", stored_at=now, expires_at=now)
+    finally:
+        _multi_collector.latency.record(_RESOLVE_PROVIDER, time.monotonic() - started)
+        reset_provider_timeout(token)
+
+    tm_url = tm_match.url if tm_match else None
+    return await _resolution_cache.set(key, tm_url, version=tm_url or "none")
+
+
+def _pending_resolution() -> CacheEntry:
+    """Stand-in for a resolution still running in the background (never fresh)."""
+    now = time.time()
+    return CacheEntry(value=None, version="pending", stored_at=now, expires_at=now)
+
+
+def _build_package(event: EventMention, resolution: CacheEntry) -> CacheEntry:
+    """
+    Assemble and encode the package for ``event`` given its Ticketmaster resolution.
+
+    The entry's version is the response ETag and it stays fresh as long as
+    the resolution it was built from.
+    """
     # Calculate check-in/check-out dates
     event_date = datetime.strptime(event.timestamp, "%Y-%m-%d")
     check_in = event.timestamp
     check_out = (event_date + timedelta(days=1)).strftime("%Y-%m-%d")
     
-    # Try to resolve a matching Ticketmaster event for priority selling
-    tm_url = None
-    # We always check TM even if provider is Viagogo
-    tm_collector = TicketmasterCollector()
-    tm_match = await tm_collector.resolve_event(event.text, event.city, event.timestamp)
-    if tm_match:
-        tm_url = tm_match.url
+    tm_url = resolution.value
         
     # Determine ticket source using priority logic
     tickets = _determine_ticket_info(event, tm_url=tm_url)
@@ -274,8 +978,187 @@ async def get_event_package(
         affiliate_url=_build_booking_url(event.city, check_in, check_out)
     )
     
-    return EventPackageResponse(
-        event=event_with_ticket_provider,
-        tickets=tickets,
-        hotels=hotels
+    etag = _etag(
+        content_version(event.model_dump_json().encode()),
+        resolution.version,
+        config.BOOKING_AFFILIATE_ID
     )
+    with span("serialize"):
+        body = EventPackageResponse(
+            event=event_with_ticket_provider,
+            tickets=tickets,
+            hotels=hotels
+        ).model_dump_json().encode()
+    return CacheEntry(value=body, version=etag, stored_at=time.time(), expires_at=resolution.expires_at)
+
+
+async def _materialize_package(event: EventMention, network: bool) -> Optional[CacheEntry]:
+    """
+    Background package build; resolution gets a longer budget than requests do.
+
+    Without ``network`` (prebuilds) only cached or local resolutions are
+    used, and an event without one is left for the request path.
+    """
+    # We always check TM even if provider is Viagogo
+    if network:
+        resolution = await _resolve_ticketmaster_url(event, Deadline(config.PACKAGE_BUILD_DEADLINE))
+    else:
+        resolution = await _resolve_locally(event)
+        if resolution is None:
+            return None
+    return _build_package(event, resolution)
+
+
+# Packages for stored events, rebuilt in the background whenever an event changes
+_packages = PackageMaterializer(
+    _events_cache,
+    build=_materialize_package,
+    ttl=config.RESOLUTION_CACHE_TTL,
+    max_entries=config.PACKAGE_CACHE_MAX_ENTRIES,
+    concurrency=config.PACKAGE_BUILD_CONCURRENCY,
+    prebuild=config.PACKAGE_PREBUILD,
+    max_pending=config.PACKAGE_BUILD_MAX_PENDING
+)
+
+
+@router.get("/events/{event_id}/package", response_model=EventPackageResponse)
+async def get_event_package(
+    event_id: str = Path(..., description="Event ID from any provider"),
+    origin_city: Optional[str] = Query(
+        default=None,
+        description="Origin city for flights (for future use)"
+    ),
+    enrichment: str = Query(
+        default="sync",
+        pattern="^(sync|deferred)$",
+        description="'deferred' answers without waiting for Ticketmaster resolution; "
+                    "poll /api/events/{event_id}/tickets for the upgraded link"
+    ),
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    Get a package for an event including tickets and hotel links.
+    
+    Returns event details with affiliate URLs for tickets and hotels.
+    Ticket provider is determined by priority: Ticketmaster -> Official site -> Viagogo.
+    Packages of stored events are usually prebuilt, making this a cache lookup.
+
+    With enrichment=deferred, a package that is not prebuilt is returned with
+    the best ticket source known so far (X-Enrichment: pending) while the
+    resolution runs in the background.
+    """
+    package = _packages.get(event_id)
+    is_known_event = True
+    pending = False
+
+    if package is None:
+        deadline = Deadline(config.REQUEST_DEADLINE)
+
+        # Try to find event in cache
+        event = await _events_cache.fetch(event_id)
+        is_known_event = event is not None
+        
+        if not event:
+            # Return mock event for demo purposes if not in cache
+            event = EventMention(
+                id=event_id,
+                text="Event Package Demo",
+                url="https://www.ticketmaster.com/",
+                timestamp=datetime.now().strftime("%Y-%m-%d"),
+                venue_name="Demo Venue",
+                city="New York",
+                category="music",
+                provider="ticketmaster"
+            )
+
+        if enrichment == "deferred":
+            resolution = await _resolution_cache.get(_resolution_key(event))
+            if resolution is None:
+                resolution = _pending_resolution()
+                # Demo packages have nothing to upgrade
+                pending = is_known_event
+                if pending:
+                    _packages.schedule(event.id)
+        else:
+            # Try to resolve a matching Ticketmaster event for priority selling
+            # We always check TM even if provider is Viagogo
+            resolution = await _resolve_ticketmaster_url(event, deadline)
+
+        package = _build_package(event, resolution)
+        if is_known_event and not pending:
+            _packages.put(event, package)
+
+    response = _conditional_response(
+        lambda: package.value,
+        etag=package.version,
+        max_age=package.max_age() if is_known_event else 0,
+        if_none_match=if_none_match
+    )
+    if enrichment == "deferred":
+        response.headers["X-Enrichment"] = "pending" if pending else "complete"
+        if pending:
+            response.headers["Link"] = f'</api/events/{event_id}/tickets>; rel="enrichment"'
+    return response
+
+
+@router.get("/events/{event_id}/price-history", response_model=PriceHistory)
+async def get_price_history(
+    event_id: str = Path(..., description="Event ID from any provider"),
+    since: Optional[str] = Query(
+        default=None,
+        description="Only samples from this date on (YYYY-MM-DD)",
+        pattern=r"^\d{4}-\d{2}-\d{2}$"
+    ),
+    resolution: int = Query(
+        default=0,
+        ge=0,
+        description="Bucket size in seconds (lowest min / highest max per bucket); 0 for raw samples"
+    )
+) -> Response:
+    """Get the recorded min/max price history of an event."""
+    try:
+        since_ts = int(datetime.strptime(since, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) if since else 0
+    except ValueError:
+        raise HTTPException(status_code=422, detail="since must be a valid date (YYYY-MM-DD)")
+    samples = _price_history.samples(event_id, since=since_ts, resolution=resolution)
+    if samples is None:
+        raise HTTPException(status_code=404, detail="No price history for this event")
+
+    event = _events_cache.get(event_id)
+    history = PriceHistory(
+        event_id=event_id,
+        currency=event.currency if event else None,
+        resolution=resolution,
+        samples=[PriceSample(timestamp=ts, min_price=lo, max_price=hi) for ts, lo, hi in samples]
+    )
+    return _json_response(lambda: history.model_dump_json().encode())
+
+
+@router.get("/events/{event_id}/tickets", response_model=TicketsStatus)
+async def get_event_tickets(
+    event_id: str = Path(..., description="Event ID from any provider")
+) -> Response:
+    """
+    Poll the ticket link of a package returned with X-Enrichment: pending.
+
+    Answers from cached state only; while the Ticketmaster resolution is still
+    running the status is "pending" and Retry-After suggests when to ask again.
+    """
+    event = await _events_cache.fetch(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    resolution = await _resolution_cache.get(_resolution_key(event))
+    if resolution is None:
+        # Covers prebuilding being off and resolutions that timed out
+        _packages.schedule(event_id)
+        status = TicketsStatus(status="pending", tickets=_determine_ticket_info(event))
+        response = _json_response(lambda: status.model_dump_json().encode())
+        response.headers["Retry-After"] = "1"
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    status = TicketsStatus(status="complete", tickets=_determine_ticket_info(event, tm_url=resolution.value))
+    response = _json_response(lambda: status.model_dump_json().encode())
+    response.headers["Cache-Control"] = f"private, max-age={resolution.max_age()}"
+    return response
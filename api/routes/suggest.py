@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Autocomplete routes."""
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import Response
+from api.models.suggest import Suggestion, SuggestResponse
+from api.routes import events as events_routes
+
+router = APIRouter(prefix="/api/suggest", tags=["suggest"])
+
+
+@router.get("", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix (any word of the name)"),
+    limit: int = Query(default=8, ge=1, le=20, description="Max suggestions"),
+    kind: Optional[str] = Query(default=None, pattern="^(event|venue|city)$", description="Only this kind")
+) -> Response:
+    """
+    Suggest event names, venues and cities for a search box as the user types.
+
+    Answers from a local index of events this worker has fetched or loaded
+    from a feed snapshot (FEED_SNAPSHOT_PATH), ranked by their popularity;
+    no provider is called.
+    """
+    terms = events_routes._suggest_index.suggest(q, limit=limit, kind=kind)
+    response = SuggestResponse(
+        query=q,
+        kind=kind,
+        suggestions=[
+            Suggestion(text=t.text, kind=t.kind, events=t.events, score=round(t.weight, 4))
+            for t in terms
+        ]
+    )
+    return events_routes._json_response(lambda: response.model_dump_json().encode())
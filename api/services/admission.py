@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Admission control: per-route-class concurrency limits with a bounded wait queue."""
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from api import config
+
+
+@dataclass
+class RouteLimit:
+    """Concurrency limit of one class of routes; ``max_queue`` 0 rejects as soon as it is full."""
+    max_concurrent: int
+    max_queue: int = 0
+    max_wait: float = 0.0
+
+
+@dataclass
+class _RouteState:
+    limit: RouteLimit
+    active: int = 0
+    queued: int = 0
+    # (priority, arrival, future) - lower priority values are admitted first
+    waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = field(default_factory=list)
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    peak_queued: int = 0
+    wait_total: float = 0.0
+
+
+class AdmissionController:
+    """
+    Limits concurrent requests per route class so overload sheds instead of queueing forever.
+
+    A request beyond ``max_concurrent`` waits in a queue of at most
+    ``max_queue`` requests for up to ``max_wait`` seconds; a full queue or
+    an expired wait is rejected, so callers can answer 503 immediately.
+    Freed slots go to the waiter with the lowest priority value, then the
+    longest-waiting one. Not thread-safe; one controller per event loop.
+    """
+
+    def __init__(self, limits: Dict[str, RouteLimit]):
+        self._routes = {name: _RouteState(limit) for name, limit in limits.items()}
+        self._arrivals = itertools.count()
+
+    @classmethod
+    def from_config(cls) -> "AdmissionController":
+        return cls({
+            "search": RouteLimit(
+                max_concurrent=config.ADMISSION_SEARCH_CONCURRENCY,
+                max_queue=config.ADMISSION_SEARCH_QUEUE,
+                max_wait=config.ADMISSION_MAX_WAIT
+            ),
+            "stream": RouteLimit(max_concurrent=config.ADMISSION_STREAM_CONCURRENCY)
+        })
+
+    async def acquire(self, route: str, priority: int = 1) -> bool:
+        """Take a slot of ``route``, waiting in its queue if needed; False when shed."""
+        state = self._routes[route]
+        if state.active < state.limit.max_concurrent and not state.queued:
+            state.active += 1
+            state.admitted += 1
+            return True
+        if state.queued >= state.limit.max_queue:
+            state.rejected += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(state.waiters, (priority, next(self._arrivals), future))
+        state.queued += 1
+        state.peak_queued = max(state.peak_queued, state.queued)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=state.limit.max_wait)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                state.timed_out += 1
+                return False
+        except asyncio.CancelledError:
+            # Client went away while waiting; hand on a slot granted meanwhile
+            if future.done() and not future.cancelled():
+                self.release(route)
+            else:
+                future.cancel()
+            raise
+        finally:
+            state.queued -= 1
+            state.wait_total += time.monotonic() - started
+        state.admitted += 1
+        return True
+
+    def release(self, route: str) -> None:
+        """Free a slot, handing it straight to the next waiter if there is one."""
+        state = self._routes[route]
+        while state.waiters:
+            _, _, future = heapq.heappop(state.waiters)
+            if not future.done():
+                # The slot passes to the waiter; ``active`` stays the same
+                future.set_result(None)
+                return
+        state.active -= 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Queue depth and counters per route class, for metrics."""
+        return {
+            name: {
+                "active": state.active,
+                "queued": state.queued,
+                "max_concurrent": state.limit.max_concurrent,
+                "max_queue": state.limit.max_queue,
+                "peak_queued": state.peak_queued,
+                "admitted": state.admitted,
+                "rejected": state.rejected,
+                "timed_out": state.timed_out,
+                "avg_wait_ms": round(state.wait_total / state.admitted * 1000, 2) if state.admitted else 0.0
+            }
+            for name, state in self._routes.items()
+        }
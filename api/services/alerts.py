@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Price-drop alerts indexed by threshold."""
+import heapq
+import logging
+import time
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from api.models.event import EventMention
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Alert:
+    """Fire once when an event's min_price is at or below ``threshold``."""
+    id: int
+    event_id: str
+    threshold: float
+    target: Optional[str] = None  # Opaque recipient for the sink (user ID, webhook, ...)
+    expires_at: Optional[float] = None  # Epoch seconds after which the alert is dropped unfired
+
+
+@dataclass(slots=True)
+class FiredAlert:
+    alert: Alert
+    price: float
+
+
+class AlertLimitError(Exception):
+    """Raised when registering an alert would exceed one of the engine's caps."""
+    pass
+
+
+def alert_expiry(event: EventMention, max_age: float, now: Optional[float] = None) -> float:
+    """
+    When an alert on ``event`` stops being useful: the end of the event's day
+    (UTC), or ``max_age`` seconds from now when the date cannot be parsed.
+    """
+    now = time.time() if now is None else now
+    try:
+        day = datetime.strptime((event.timestamp or "")[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return now + max_age
+    return (day + timedelta(days=1)).timestamp()
+
+
+class AlertSink(ABC):
+    """Where fired alerts are delivered; called synchronously with each batch."""
+
+    @abstractmethod
+    def deliver(self, fired: List[FiredAlert]) -> None:
+        pass
+
+
+class LogSink(AlertSink):
+    """Writes fired alerts to the application log."""
+
+    def deliver(self, fired: List[FiredAlert]) -> None:
+        for item in fired:
+            logger.info(
+                f"Price alert {item.alert.id} for {item.alert.event_id}: "
+                f"{item.price} <= {item.alert.threshold} (target={item.alert.target})"
+            )
+
+
+class MemorySink(AlertSink):
+    """Keeps the most recent fired alerts in memory for an in-process consumer."""
+
+    def __init__(self, max_items: int = 10000):
+        self.items: Deque[FiredAlert] = deque(maxlen=max_items)
+
+    def deliver(self, fired: List[FiredAlert]) -> None:
+        self.items.extend(fired)
+
+
+class _EventIndex:
+    """Thresholds of one event kept sorted, with the alert ID at the same position."""
+
+    __slots__ = ("thresholds", "ids")
+
+    def __init__(self):
+        self.thresholds = array("d")
+        self.ids = array("q")
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+
+class AlertEngine:
+    """
+    Evaluates price updates against registered alerts in O(log n + k).
+
+    Per event, thresholds are held in a sorted array. A price ``p`` matches
+    every alert with threshold >= p, which is always a suffix of that array:
+    one binary search finds it and the matched alerts are cut off in one
+    slice (alerts are one-shot). Events without alerts cost a dict miss.
+
+    Registration is bounded: ``max_alerts`` in total, ``max_per_event`` on
+    one event and ``max_per_target`` for one target (0 = unbounded); going
+    over raises AlertLimitError. Alerts with an ``expires_at`` are dropped
+    unfired once it passes, checked from a heap on every add and refresh.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AlertSink] = None,
+        max_alerts: int = 0,
+        max_per_event: int = 0,
+        max_per_target: int = 0
+    ):
+        self.sink = sink or LogSink()
+        self.max_alerts = max_alerts
+        self.max_per_event = max_per_event
+        self.max_per_target = max_per_target
+        self._alerts: Dict[int, Alert] = {}
+        self._index: Dict[str, _EventIndex] = {}
+        self._per_target: Dict[str, int] = {}
+        self._expiry: List[Tuple[float, int]] = []  # (expires_at, alert ID); may hold fired IDs
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def add(
+        self,
+        event_id: str,
+        threshold: float,
+        target: Optional[str] = None,
+        expires_at: Optional[float] = None
+    ) -> Alert:
+        self.expire()
+        if self.max_alerts and len(self._alerts) >= self.max_alerts:
+            raise AlertLimitError(f"Too many pending alerts (max {self.max_alerts})")
+        index = self._index.get(event_id)
+        if self.max_per_event and index is not None and len(index) >= self.max_per_event:
+            raise AlertLimitError(f"Too many alerts on event {event_id} (max {self.max_per_event})")
+        if self.max_per_target and target is not None and self._per_target.get(target, 0) >= self.max_per_target:
+            raise AlertLimitError(f"Too many alerts for target {target} (max {self.max_per_target})")
+
+        alert = Alert(
+            id=self._next_id, event_id=event_id, threshold=float(threshold),
+            target=target, expires_at=expires_at
+        )
+        self._next_id += 1
+        self._alerts[alert.id] = alert
+        if target is not None:
+            self._per_target[target] = self._per_target.get(target, 0) + 1
+        if expires_at is not None:
+            heapq.heappush(self._expiry, (expires_at, alert.id))
+        if index is None:
+            index = self._index[event_id] = _EventIndex()
+        i = bisect_right(index.thresholds, alert.threshold)
+        index.thresholds.insert(i, alert.threshold)
+        index.ids.insert(i, alert.id)
+        return alert
+
+    def get(self, alert_id: int) -> Optional[Alert]:
+        return self._alerts.get(alert_id)
+
+    def remove(self, alert_id: int) -> bool:
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        self._release(alert)
+        index = self._index[alert.event_id]
+        i = bisect_left(index.thresholds, alert.threshold)
+        while index.ids[i] != alert_id:
+            i += 1
+        del index.thresholds[i]
+        del index.ids[i]
+        if not index:
+            del self._index[alert.event_id]
+        return True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Remove alerts whose expiry has passed; returns how many were dropped."""
+        now = time.time() if now is None else now
+        dropped = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, alert_id = heapq.heappop(self._expiry)
+            if self.remove(alert_id):  # Already fired or deleted otherwise
+                dropped += 1
+        if len(self._expiry) > 2 * len(self._alerts) + 64:
+            # Mostly fired or deleted alerts: rebuild from the live ones
+            self._expiry = [(a.expires_at, a.id) for a in self._alerts.values() if a.expires_at is not None]
+            heapq.heapify(self._expiry)
+        if dropped:
+            logger.debug(f"Expired {dropped} price alerts")
+        return dropped
+
+    def _release(self, alert: Alert) -> None:
+        if alert.target is None:
+            return
+        remaining = self._per_target[alert.target] - 1
+        if remaining:
+            self._per_target[alert.target] = remaining
+        else:
+            del self._per_target[alert.target]
+
+    def evaluate(self, event_id: str, price: float) -> List[FiredAlert]:
+        """Fire and remove every alert on ``event_id`` whose threshold is >= ``price``."""
+        index = self._index.get(event_id)
+        if index is None:
+            return []
+        i = bisect_left(index.thresholds, price)
+        if i == len(index.thresholds):
+            return []
+        fired = [FiredAlert(self._alerts.pop(alert_id), price) for alert_id in index.ids[i:]]
+        for item in fired:
+            self._release(item.alert)
+        del index.thresholds[i:]
+        del index.ids[i:]
+        if not index:
+            del self._index[event_id]
+        return fired
+
+    def on_refresh(self, events: Iterable[EventMention]) -> None:
+        """Evaluate refreshed events (EventStore refresh listener) and deliver what fired."""
+        self.expire()
+        fired: List[FiredAlert] = []
+        for event in events:
+            if event.min_price is not None and event.id in self._index:
+                fired.extend(self.evaluate(event.id, event.min_price))
+        if fired:
+            self.sink.deliver(fired)
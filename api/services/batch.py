@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Planning of batch searches: one upstream fetch per distinct query."""
+from dataclasses import dataclass, replace
+from typing import Dict, List, Tuple, Union
+
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.services.canonical import key_fields
+
+SearchQuery = Union[EventSearchQuery, ArtistSearchQuery]
+
+# Largest page size a fetch may be widened to (the API's own limit cap)
+MAX_FETCH_LIMIT = 100
+
+
+def batch_key(query: SearchQuery) -> Tuple:
+    """Everything but the page window, canonicalized so differently spelled queries match."""
+    return (type(query).__name__,) + key_fields(replace(query, limit=0, page=0))
+
+
+@dataclass
+class BatchPlan:
+    """
+    Fetches to run for a batch, and how each query is answered from them.
+
+    ``slices[i]`` is ``(fetch index, start, stop)``: query ``i`` gets
+    ``fetches[fetch index]`` results ``[start:stop]``.
+    """
+    fetches: List[SearchQuery]
+    slices: List[Tuple[int, int, int]]
+
+
+def plan_batch(queries: List[SearchQuery], max_limit: int = MAX_FETCH_LIMIT) -> BatchPlan:
+    """
+    Deduplicate a batch.
+
+    Identical queries share a fetch. Queries differing only in page or limit
+    are subsumed by a single page-0 fetch wide enough for all of them, as
+    long as it stays within ``max_limit``; otherwise each distinct page is
+    fetched once.
+    """
+    groups: Dict[Tuple, List[int]] = {}
+    for i, query in enumerate(queries):
+        groups.setdefault(batch_key(query), []).append(i)
+
+    fetches: List[SearchQuery] = []
+    slices: List[Tuple[int, int, int]] = [(0, 0, 0)] * len(queries)
+    for members in groups.values():
+        shapes = {(queries[i].page, queries[i].limit) for i in members}
+        end = max((page + 1) * limit for page, limit in shapes)
+        if len(shapes) > 1 and end <= max_limit:
+            fetches.append(replace(queries[members[0]], page=0, limit=end))
+            for i in members:
+                query = queries[i]
+                slices[i] = (len(fetches) - 1, query.page * query.limit, (query.page + 1) * query.limit)
+            continue
+        fetched: Dict[Tuple[int, int], int] = {}
+        for i in members:
+            query = queries[i]
+            shape = (query.page, query.limit)
+            if shape not in fetched:
+                fetched[shape] = len(fetches)
+                fetches.append(query)
+            slices[i] = (fetched[shape], 0, query.limit)
+    return BatchPlan(fetches=fetches, slices=slices)
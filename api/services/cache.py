@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""Caching primitives shared by the search, resolution and package paths.
+
+Two tiers:
+- L1: ``TTLCache``, in-process and synchronous.
+- L2: an optional ``CacheBackend`` shared by every worker and replica
+  (``RedisBackend`` speaks the Redis protocol).
+
+``TieredCache`` combines them: reads go L1 then L2, writes go to both, and
+writes from other processes invalidate the local L1 copy via pub/sub.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import struct
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from api import config
+
+logger = logging.getLogger(__name__)
+
+
+def content_version(data: bytes) -> str:
+    """Stable digest of encoded content, identical across workers and restarts."""
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its content version and freshness window."""
+    value: Any
+    version: str
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+    def max_age(self, now: Optional[float] = None) -> int:
+        """Seconds of freshness left, for Cache-Control max-age."""
+        remaining = self.expires_at - (now if now is not None else time.time())
+        return max(0, int(remaining))
+
+
+class TTLCache:
+    """
+    Small TTL cache with LRU eviction.
+
+    Not thread-safe; the API runs on a single event loop per worker.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the fresh entry for ``key`` or None (expired entries are dropped)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Any, version: str = "", ttl: Optional[float] = None) -> CacheEntry:
+        """Store ``value`` and return its entry."""
+        now = time.time()
+        entry = CacheEntry(
+            value=value,
+            version=version,
+            stored_at=now,
+            expires_at=now + (self.ttl if ttl is None else ttl)
+        )
+        self.put(key, entry)
+        return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        """Store an existing entry, keeping its version and expiry."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def items(self) -> List[Tuple[Hashable, CacheEntry]]:
+        """Fresh entries, least recently used first."""
+        now = time.time()
+        return [(key, entry) for key, entry in self._entries.items() if entry.is_fresh(now)]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+
+# Called with a changed L2 key and the content version of its new payload
+# (None for deletions)
+InvalidationListener = Callable[[str, Optional[str]], None]
+
+
+class CacheBackend(ABC):
+    """Shared (L2) byte store with batched operations and invalidation fan-out."""
+
+    def __init__(self):
+        self._listeners: List[InvalidationListener] = []
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch several keys in one round trip (None for misses)."""
+        pass
+
+    @abstractmethod
+    async def set_many(self, items: Dict[str, Tuple[bytes, float]]) -> None:
+        """Store ``{key: (payload, ttl_seconds)}`` and announce the change."""
+        pass
+
+    @abstractmethod
+    async def delete_many(self, keys: List[str]) -> None:
+        """Remove keys and announce the change."""
+        pass
+
+    def add_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Register a callback for keys changed by other processes."""
+        self._listeners.append(listener)
+
+    def _notify(self, keys: List[str], versions: Optional[Dict[str, str]] = None) -> None:
+        versions = versions or {}
+        for key in keys:
+            for listener in self._listeners:
+                listener(key, versions.get(key))
+
+
+class RedisBackend(CacheBackend):
+    """
+    L2 tier on any Redis-protocol server.
+
+    Every write publishes the changed keys (with the content version of each
+    new payload) on an invalidation channel tagged with this process's ID;
+    ``listen_for_invalidations`` drops matching L1 entries in the other
+    processes.
+    """
+
+    def __init__(self, client, namespace: str = "eventpulse"):
+        super().__init__()
+        self.client = client
+        self.namespace = namespace
+        self.channel = f"{namespace}:invalidate"
+        self.instance_id = uuid.uuid4().hex
+
+    @classmethod
+    def from_url(cls, url: str, namespace: str = "eventpulse") -> "RedisBackend":
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+        return cls(redis_asyncio.from_url(url), namespace=namespace)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self.client.mget([self._key(k) for k in keys])
+
+    async def set_many(self, items: Dict[str, Tuple[bytes, float]]) -> None:
+        if not items:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, (payload, ttl) in items.items():
+                pipe.set(self._key(key), payload, px=max(1, int(ttl * 1000)))
+            await pipe.execute()
+        await self._publish(list(items), {key: content_version(payload) for key, (payload, _) in items.items()})
+
+    async def delete_many(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        await self.client.delete(*[self._key(k) for k in keys])
+        await self._publish(keys)
+
+    async def _publish(self, keys: List[str], versions: Optional[Dict[str, str]] = None) -> None:
+        message = json.dumps({"origin": self.instance_id, "keys": keys, "versions": versions or {}})
+        await self.client.publish(self.channel, message)
+
+    async def listen_for_invalidations(self) -> None:
+        """Apply invalidations from other processes until cancelled."""
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    data = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if data.get("origin") != self.instance_id:
+                    self._notify(data.get("keys", []), data.get("versions"))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+
+
+_ENTRY_HEADER = struct.Struct("!ddH")
+
+
+class TieredCache:
+    """
+    L1 ``TTLCache`` in front of an optional shared ``CacheBackend``.
+
+    Values cross the L2 boundary through the ``encode``/``decode`` pair; the
+    entry's version and expiry travel with them so every worker serves the
+    same ETag and max-age for the same entry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+        max_entries: int = 1024,
+        l2: Optional[CacheBackend] = None
+    ):
+        self.name = name
+        self._l1 = TTLCache(ttl=ttl, max_entries=max_entries)
+        self._encode = encode
+        self._decode = decode
+        self._l2 = l2
+        if l2 is not None:
+            l2.add_invalidation_listener(self._on_invalidate)
+
+    @property
+    def ttl(self) -> float:
+        return self._l1.ttl
+
+    def _l2_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _on_invalidate(self, l2_key: str, version: Optional[str] = None) -> None:
+        prefix = f"{self.name}:"
+        if l2_key.startswith(prefix):
+            self._l1.delete(l2_key[len(prefix):])
+
+    def _pack(self, entry: CacheEntry) -> bytes:
+        version = entry.version.encode()
+        return _ENTRY_HEADER.pack(entry.stored_at, entry.expires_at, len(version)) + version + self._encode(entry.value)
+
+    def _unpack(self, data: bytes) -> Optional[CacheEntry]:
+        try:
+            stored_at, expires_at, version_len = _ENTRY_HEADER.unpack_from(data)
+            offset = _ENTRY_HEADER.size
+            version = data[offset:offset + version_len].decode()
+            value = self._decode(data[offset + version_len:])
+        except (ValueError, struct.error, UnicodeDecodeError, zlib.error) as e:
+            logger.warning(f"Ignoring undecodable {self.name} cache entry: {e}")
+            return None
+        return CacheEntry(value=value, version=version, stored_at=stored_at, expires_at=expires_at)
+
+    def get_local(self, key: str) -> Optional[CacheEntry]:
+        """L1-only lookup, for synchronous callers."""
+        return self._l1.get(key)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, CacheEntry]:
+        """Look keys up in L1, then fetch all L1 misses from L2 in one batch."""
+        found: Dict[str, CacheEntry] = {}
+        missing = []
+        for key in keys:
+            entry = self._l1.get(key)
+            if entry is not None:
+                found[key] = entry
+            else:
+                missing.append(key)
+        if not missing or self._l2 is None:
+            return found
+
+        try:
+            payloads = await self._l2.get_many([self._l2_key(k) for k in missing])
+        except Exception as e:
+            logger.error(f"L2 cache read failed for {self.name}: {e}")
+            return found
+        for key, payload in zip(missing, payloads):
+            if payload is None:
+                continue
+            entry = self._unpack(payload)
+            if entry is not None and entry.is_fresh():
+                self._l1.put(key, entry)
+                found[key] = entry
+        return found
+
+    async def set(self, key: str, value: Any, version: str = "", ttl: Optional[float] = None) -> CacheEntry:
+        return (await self.set_many({key: (value, version)}, ttl=ttl))[key]
+
+    async def set_many(
+        self,
+        items: Dict[str, Tuple[Any, str]],
+        ttl: Optional[float] = None
+    ) -> Dict[str, CacheEntry]:
+        """Store ``{key: (value, version)}`` in L1 and, in one batch, in L2."""
+        entries = {key: self._l1.set(key, value, version=version, ttl=ttl) for key, (value, version) in items.items()}
+        if self._l2 is not None and entries:
+            try:
+                await self._l2.set_many({
+                    self._l2_key(key): (self._pack(entry), entry.expires_at - entry.stored_at)
+                    for key, entry in entries.items()
+                })
+            except Exception as e:
+                logger.error(f"L2 cache write failed for {self.name}: {e}")
+        return entries
+
+    async def delete(self, key: str) -> None:
+        self._l1.delete(key)
+        if self._l2 is not None:
+            try:
+                await self._l2.delete_many([self._l2_key(key)])
+            except Exception as e:
+                logger.error(f"L2 cache delete failed for {self.name}: {e}")
+
+    def clear_local(self) -> None:
+        """Drop the L1 tier only (the shared tier is left alone)."""
+        self._l1.clear()
+
+    def dump_local(self) -> List[Tuple[str, bytes]]:
+        """Fresh L1 entries encoded as in L2, for snapshots."""
+        return [(key, self._pack(entry)) for key, entry in self._l1.items()]
+
+    def load_local(self, items: List[Tuple[str, bytes]]) -> int:
+        """Restore ``dump_local`` output into L1, skipping expired entries; returns the count."""
+        loaded = 0
+        for key, payload in items:
+            entry = self._unpack(payload)
+            if entry is not None and entry.is_fresh():
+                self._l1.put(key, entry)
+                loaded += 1
+        return loaded
+
+
+_shared_backend: Optional[CacheBackend] = None
+_shared_backend_loaded = False
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """Return the process-wide L2 backend configured by REDIS_URL, if any."""
+    global _shared_backend, _shared_backend_loaded
+    if not _shared_backend_loaded:
+        _shared_backend_loaded = True
+        if config.REDIS_URL:
+            _shared_backend = RedisBackend.from_url(config.REDIS_URL, namespace=config.CACHE_NAMESPACE)
+    return _shared_backend
+
+
+async def run_invalidation_listener(backend: CacheBackend) -> None:
+    """Keep applying remote invalidations, reconnecting after errors."""
+    if not isinstance(backend, RedisBackend):
+        return
+    while True:
+        try:
+            await backend.listen_for_invalidations()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache invalidation listener failed, retrying: {e}")
+            await asyncio.sleep(1.0)
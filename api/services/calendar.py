@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Per-day event counts by city and category, kept in step with the event store."""
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from api.models.event import EventMention
+from api.services.canonical import canonical_category, city_key
+from api.services.store import EventStore
+
+_DAY = re.compile(r"^(\d{4}-\d{2})-\d{2}")
+
+# Category counted for events that have none
+UNCATEGORIZED = "other"
+
+# (city key, "YYYY-MM", "YYYY-MM-DD", category) an event is counted under
+Slot = Tuple[str, str, str, str]
+
+
+def _slot(event: EventMention) -> Optional[Slot]:
+    match = _DAY.match(event.timestamp or "")
+    if match is None or not event.city:
+        return None
+    category = canonical_category(event.category) or UNCATEGORIZED
+    return city_key(event.city), match.group(1), match.group(0), category
+
+
+class EventCalendar:
+    """
+    Counts of stored events per (city, category, day), bucketed by month.
+
+    Counters move by one as events are added, changed (a new date, city or
+    category moves the event to another bucket) or dropped, so a month view
+    is a single dictionary lookup and never touches the providers. Only
+    events the store has seen are counted.
+    """
+
+    def __init__(self, store: EventStore):
+        self._store = store
+        self._slots: Dict[str, Slot] = {}
+        self._months: Dict[Tuple[str, str], Dict[str, Counter]] = {}
+        for event_id in list(store):
+            self._add(event_id, store[event_id])
+        store.add_change_listener(self.on_change)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def on_change(self, event_ids: List[str]) -> None:
+        """Re-bucket events the store added, changed or dropped."""
+        for event_id in event_ids:
+            self._remove(event_id)
+            event = self._store.get(event_id)
+            if event is not None:
+                self._add(event_id, event)
+
+    def _add(self, event_id: str, event: EventMention) -> None:
+        slot = _slot(event)
+        if slot is None:
+            return
+        city, month, day, category = slot
+        self._months.setdefault((city, month), {}).setdefault(day, Counter())[category] += 1
+        self._slots[event_id] = slot
+
+    def _remove(self, event_id: str) -> None:
+        slot = self._slots.pop(event_id, None)
+        if slot is None:
+            return
+        city, month, day, category = slot
+        days = self._months[(city, month)]
+        counts = days[day]
+        counts[category] -= 1
+        if counts[category] <= 0:
+            del counts[category]
+            if not counts:
+                del days[day]
+                if not days:
+                    del self._months[(city, month)]
+
+    def month(self, city: str, month: str, category: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Category counts per day of ``month`` ("YYYY-MM") in ``city``.
+
+        Days without events are omitted; with ``category`` only that
+        category is counted. Categories match like search queries
+        ("concerts" counts music, "arts & theatre" counts arts).
+        """
+        days = self._months.get((city_key(city), month), {})
+        if category is None:
+            return {day: dict(counts) for day, counts in sorted(days.items())}
+        category = canonical_category(category) or UNCATEGORIZED
+        return {
+            day: {category: counts[category]}
+            for day, counts in sorted(days.items())
+            if category in counts
+        }
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._months.clear()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Query canonicalization: one spelling per city, category and page window.
+
+"tel aviv", "Tel-Aviv", "TLV" and "Tel Aviv-Yafo" are one city; "Music" and
+"concerts" one category. Queries are rewritten to the canonical spelling
+before they reach the search cache or MultiCollector, so they share cache
+entries, negative-cache entries and upstream requests.
+"""
+from dataclasses import astuple, dataclass, replace
+from typing import Dict, List, Optional, Tuple, Union
+
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.services.suggest import normalize
+from api import config
+
+SearchQuery = Union[EventSearchQuery, ArtistSearchQuery]
+
+# Folded alias -> canonical city name (extended by CITY_ALIASES)
+_CITY_ALIASES: Dict[str, str] = {
+    "tel aviv": "Tel Aviv",
+    "tlv": "Tel Aviv",
+    "tel aviv yafo": "Tel Aviv",
+    "tel aviv jaffa": "Tel Aviv",
+    "telaviv": "Tel Aviv",
+    "jerusalem": "Jerusalem",
+    "jlm": "Jerusalem",
+    "haifa": "Haifa",
+    "eilat": "Eilat",
+    "new york": "New York",
+    "new york city": "New York",
+    "nyc": "New York",
+    "ny": "New York",
+    "los angeles": "Los Angeles",
+    "la": "Los Angeles",
+    "san francisco": "San Francisco",
+    "sf": "San Francisco",
+    "london": "London",
+    "washington dc": "Washington",
+    "washington d c": "Washington",
+}
+
+# Folded category -> API category, matching the provider classification it is sent as
+_CATEGORY_ALIASES: Dict[str, str] = {
+    "music": "music",
+    "concert": "music",
+    "concerts": "music",
+    "sport": "sports",
+    "sports": "sports",
+    "arts": "arts",
+    "art": "arts",
+    "arts theatre": "arts",
+    "arts theater": "arts",
+    "theatre": "arts",
+    "theater": "arts",
+    "family": "family",
+    "kids": "family",
+}
+
+# Categories the aliases map to
+KNOWN_CATEGORIES = frozenset(_CATEGORY_ALIASES.values())
+
+# Page sizes requested upstream; other limits are served from the smallest
+# bucket whose page still holds the whole requested window
+LIMIT_BUCKETS = (10, 20, 50, 100)
+
+
+def _parse_aliases(spec: List[str]) -> Dict[str, str]:
+    """``["tlv=Tel Aviv", ...]`` -> ``{"tlv": "Tel Aviv"}``; malformed items are ignored."""
+    aliases = {}
+    for item in spec:
+        alias, sep, city = item.partition("=")
+        if sep and normalize(alias) and city.strip():
+            aliases[normalize(alias)] = " ".join(city.split())
+    return aliases
+
+
+_CITY_ALIASES.update(_parse_aliases(config.CITY_ALIASES))
+
+
+def canonical_city(city: Optional[str]) -> Optional[str]:
+    """Canonical name of a known city, else the name with whitespace collapsed; None when blank."""
+    if not city or not city.strip():
+        return None
+    return _CITY_ALIASES.get(normalize(city)) or " ".join(city.split())
+
+
+def city_key(city: Optional[str]) -> str:
+    """Folded canonical city, for comparing city names (e.g. an event's against a query's)."""
+    return normalize(canonical_city(city) or "")
+
+
+def canonical_category(category: Optional[str]) -> Optional[str]:
+    if not category or not category.strip():
+        return None
+    folded = normalize(category)
+    return _CATEGORY_ALIASES.get(folded, folded)
+
+
+def canonical_fields(query: SearchQuery) -> SearchQuery:
+    """``query`` with canonical city, category, artist and country spelling (page window unchanged)."""
+    if isinstance(query, ArtistSearchQuery):
+        return replace(query, artist=" ".join(query.artist.split()), country_code=query.country_code.upper())
+    return replace(
+        query,
+        city=canonical_city(query.city),
+        category=canonical_category(query.category),
+        country_code=query.country_code.upper()
+    )
+
+
+def key_fields(query: SearchQuery) -> Tuple:
+    """
+    Fields identifying ``query`` in caches: canonical, then folded.
+
+    Same order as the query's dataclass fields, so the query can be rebuilt
+    from them.
+    """
+    query = canonical_fields(query)
+    if isinstance(query, ArtistSearchQuery):
+        return astuple(replace(query, artist=normalize(query.artist) or query.artist.casefold()))
+    return astuple(replace(query, city=normalize(query.city) if query.city else None))
+
+
+def page_window(limit: int, page: int) -> Tuple[int, int, int]:
+    """
+    Upstream ``(limit, page, offset)`` for a requested page: the smallest
+    bucket page holding events ``[page * limit, (page + 1) * limit)``, which
+    start at ``offset`` in it. Unbucketable windows are returned unchanged.
+    """
+    start = page * limit
+    for size in LIMIT_BUCKETS:
+        if size >= limit and start // size == (start + limit - 1) // size:
+            return size, start // size, start - (start // size) * size
+    return limit, page, 0
+
+
+@dataclass
+class CanonicalQuery:
+    """A canonical query and the slice of its results that answers the original one."""
+    query: SearchQuery
+    start: int
+    stop: int
+
+    @property
+    def sliced(self) -> bool:
+        return (self.start, self.stop) != (0, self.query.limit)
+
+
+def canonicalize(query: SearchQuery) -> CanonicalQuery:
+    """Canonical spelling and page window for ``query``."""
+    limit, page, offset = page_window(query.limit, query.page)
+    return CanonicalQuery(
+        query=replace(canonical_fields(query), limit=limit, page=page),
+        start=offset,
+        stop=offset + query.limit
+    )
@@ -1,41 +1,186 @@
 # -*- coding: utf-8 -*-
 """Multi-collector service for orchestrating event collectors."""
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
+import asyncio
 import logging
-from api.collectors.base import EventCollector, EventSearchQuery, ArtistSearchQuery
+import time
+from api.collectors.base import EventCollector, EventSearchQuery, ArtistSearchQuery, ProviderCall, track_provider_call
+from api.services.cache import CacheBackend, TieredCache
+from api.services.canonical import key_fields
 from api.models.event import EventMention
+from api.services.deadline import Deadline, LatencyTracker, reset_provider_timeout, set_provider_timeout
+from api.services.provider_policy import AdaptiveProviderPolicy, Segment, query_segment
+from api.services.tracing import span
+from api import config
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ProviderResult:
+    """
+    What one provider returned for one query in a fan-out search.
+
+    ``status`` is "ok", "empty", "error", "timeout" or "skipped" (no time
+    left before the deadline).
+    """
+    provider: str
+    query: EventSearchQuery
+    events: List[EventMention]
+    status: str
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("error", "timeout")
+
+
 class MultiCollector:
     """
     Service to orchestrate multiple event collectors with priority-based fallback.
     
-    Priority order: Viagogo first, then Ticketmaster fallback.
+    Priority order is the order of ``collectors`` (Ticketmaster first, then
+    Viagogo in the API), unless an adaptive ``policy`` reorders it per query.
     Stops on first collector that returns results.
     """
 
-    def __init__(self, collectors: List[EventCollector]):
+    def __init__(
+        self,
+        collectors: List[EventCollector],
+        l2: Optional[CacheBackend] = None,
+        policy: Optional[AdaptiveProviderPolicy] = None
+    ):
         """
         Initialize with list of collectors in priority order.
         First collector in the list has highest priority.
+        ``l2`` shares the negative-result cache across workers.
+        ``policy`` optionally reorders/skips collectors from observed hit rate and latency.
         """
         self.collectors = collectors
+        self.policy = policy
+        self.latency = LatencyTracker()
+        # Provider/query pairs that recently returned nothing (not errors)
+        self.negative_cache = TieredCache(
+            "negative",
+            ttl=config.NEGATIVE_CACHE_TTL,
+            encode=lambda _: b"1",
+            decode=lambda _: True,
+            max_entries=config.NEGATIVE_CACHE_MAX_ENTRIES,
+            l2=l2
+        )
+
+    @staticmethod
+    def _provider_name(collector: EventCollector) -> str:
+        """Short provider name used for trace spans and stats, e.g. 'ticketmaster'."""
+        name = getattr(collector, "name", None)
+        if isinstance(name, str) and name:
+            return name
+        return collector.__class__.__name__.replace("Collector", "").lower() or "collector"
+
+    def _negative_key(self, collector: EventCollector, query: Any) -> str:
+        """Provider + canonical query, so differently spelled queries share an entry."""
+        kind = "artist" if isinstance(query, ArtistSearchQuery) else "date"
+        fields = ("" if f is None else str(f) for f in key_fields(query))
+        return "|".join((self._provider_name(collector), kind, *fields))
+
+    async def _known_empty(self, key: str) -> bool:
+        return await self.negative_cache.get(key) is not None
+
+    def _chain(self, query: Any) -> List[EventCollector]:
+        """Collectors to try for ``query``, in order (the static list without a policy)."""
+        if self.policy is None:
+            return self.collectors
+        by_name = {self._provider_name(c): c for c in self.collectors}
+        segment = query_segment(query)
+        ordered, skipped = self.policy.order(list(by_name), segment)
+        if skipped:
+            logger.info(f"Provider policy skipped {', '.join(skipped)} for segment {segment}")
+        return [by_name[name] for name in ordered]
+
+    def primary(self, query: Any) -> Optional[EventCollector]:
+        """The collector ``search`` would try first for ``query``."""
+        chain = self._chain(query)
+        return chain[0] if chain else None
+
+    async def remember_empty(self, collector: EventCollector, query: Any) -> None:
+        """Record that ``collector`` has no events for ``query``, as if a search had found none."""
+        await self.negative_cache.set(self._negative_key(collector, query), True)
+
+    def _provider_timeout(self, collector: EventCollector, later: int, deadline: Optional[Deadline]) -> float:
+        """
+        Timeout for ``collector`` with ``later`` collectors still behind it in the chain.
+
+        Capped by the provider's adaptive latency estimate, and - with a
+        deadline - by the time left minus a minimal slot for every collector
+        still behind it, so the fallback chain always gets a chance to run.
+        """
+        cap = self.latency.timeout_cap(self._provider_name(collector))
+        if deadline is None:
+            return cap
+        return min(cap, deadline.remaining() - later * config.PROVIDER_TIMEOUT_MIN)
+
+    @staticmethod
+    def _has_events(result: Any) -> bool:
+        """True for a non-empty list or (list, total) result."""
+        events = result[0] if isinstance(result, tuple) else result
+        return bool(events)
 
-    async def search(self, query: EventSearchQuery) -> List[EventMention]:
+    async def _call_with_timeout(
+        self,
+        collector: EventCollector,
+        timeout: float,
+        call: Callable[[], Awaitable[Any]],
+        segment: Optional[Segment] = None
+    ) -> Tuple[Any, ProviderCall]:
+        """
+        Run one provider call under ``timeout``, recording latency and handled errors.
+
+        With a policy, the call is also recorded as a hit or miss for ``segment``
+        (errors and timeouts count as misses).
+        """
+        name = self._provider_name(collector)
+        token = set_provider_timeout(timeout)
+        started = time.monotonic()
+        hit = False
+        try:
+            with span(name), track_provider_call() as outcome:
+                result = await asyncio.wait_for(call(), timeout=timeout)
+            hit = self._has_events(result)
+            return result, outcome
+        finally:
+            elapsed = time.monotonic() - started
+            self.latency.record(name, elapsed)
+            if self.policy is not None and segment is not None:
+                self.policy.record(name, segment, hit, elapsed)
+            reset_provider_timeout(token)
+
+    async def search(self, query: EventSearchQuery, deadline: Optional[Deadline] = None) -> List[EventMention]:
         """
         Search for events using priority-based fallback.
         
         Tries each collector in order until one returns results.
-        If a collector fails or returns empty, moves to next.
+        If a collector fails, times out or returns empty, moves to next.
         """
-        for collector in self.collectors:
+        chain = self._chain(query)
+        segment = query_segment(query)
+        for position, collector in enumerate(chain):
             provider_name = collector.__class__.__name__
+            timeout = self._provider_timeout(collector, len(chain) - position - 1, deadline)
+            if timeout <= 0:
+                logger.warning(f"Deadline exhausted, skipping {provider_name}")
+                continue
+            negative_key = self._negative_key(collector, query)
+            if await self._known_empty(negative_key):
+                logger.info(f"{provider_name} recently had no events for this query, skipping")
+                continue
             try:
-                logger.info(f"Trying {provider_name} for event search...")
-                events = await collector.search(query)
+                logger.info(f"Trying {provider_name} for event search (timeout {timeout:.2f}s)...")
+                events, outcome = await self._call_with_timeout(
+                    collector, timeout, lambda: collector.search(query), segment
+                )
                 
                 if events:
                     count = len(events)
@@ -43,7 +188,11 @@ class MultiCollector:
                     return events
                 else:
                     logger.info(f"{provider_name} returned no events, trying next collector...")
+                    if not outcome.failed:
+                        await self.negative_cache.set(negative_key, True)
                     
+            except asyncio.TimeoutError:
+                logger.warning(f"{provider_name} timed out after {timeout:.2f}s, trying next collector...")
             except Exception as e:
                 logger.error(f"Error collecting from {provider_name}: {e}")
                 logger.info(f"Falling back to next collector...")
@@ -51,18 +200,91 @@ class MultiCollector:
         logger.warning("All collectors returned empty results")
         return []
 
-    async def search_by_artist(self, query: ArtistSearchQuery) -> Tuple[List[EventMention], int]:
+    async def _search_one(
+        self,
+        collector: EventCollector,
+        query: EventSearchQuery,
+        deadline: Optional[Deadline]
+    ) -> ProviderResult:
+        """One provider call for ``search_each``; never raises."""
+        name = self._provider_name(collector)
+        negative_key = self._negative_key(collector, query)
+        if await self._known_empty(negative_key):
+            return ProviderResult(name, query, [], "empty")
+        timeout = self._provider_timeout(collector, 0, deadline)
+        if timeout <= 0:
+            return ProviderResult(name, query, [], "skipped")
+        started = time.monotonic()
+        try:
+            events, outcome = await self._call_with_timeout(
+                collector, timeout, lambda: collector.search(query), query_segment(query)
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} timed out after {timeout:.2f}s")
+            return ProviderResult(name, query, [], "timeout", time.monotonic() - started)
+        except Exception as e:
+            logger.error(f"Error collecting from {name}: {e}")
+            return ProviderResult(name, query, [], "error", time.monotonic() - started, str(e))
+        elapsed = time.monotonic() - started
+        if outcome.failed and not events:
+            return ProviderResult(name, query, [], "error", elapsed, "; ".join(outcome.errors))
+        if not events:
+            await self.negative_cache.set(negative_key, True)
+            return ProviderResult(name, query, [], "empty", elapsed)
+        return ProviderResult(name, query, events, "ok", elapsed)
+
+    async def search_each(
+        self,
+        queries: List[EventSearchQuery],
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[ProviderResult]:
+        """
+        Query every provider for every query at once, yielding results as they land.
+
+        Unlike search() there is no fallback: all providers in the chain run
+        concurrently, so the first result arrives after the fastest provider's
+        latency. Calls still pending when the consumer stops are cancelled.
+        """
+        tasks = [
+            asyncio.create_task(self._search_one(collector, query, deadline))
+            for query in queries
+            for collector in self._chain(query)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_by_artist(
+        self,
+        query: ArtistSearchQuery,
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[List[EventMention], int]:
         """
         Search by artist using priority-based fallback.
         
         Same logic as search(): tries collectors in order, 
         returns results from first successful one.
         """
-        for collector in self.collectors:
+        chain = self._chain(query)
+        segment = query_segment(query)
+        for position, collector in enumerate(chain):
             provider_name = collector.__class__.__name__
+            timeout = self._provider_timeout(collector, len(chain) - position - 1, deadline)
+            if timeout <= 0:
+                logger.warning(f"Deadline exhausted, skipping {provider_name}")
+                continue
+            negative_key = self._negative_key(collector, query)
+            if await self._known_empty(negative_key):
+                logger.info(f"{provider_name} recently had no events for artist {query.artist}, skipping")
+                continue
             try:
                 logger.info(f"Trying {provider_name} for artist search: {query.artist}")
-                events, total = await collector.search_by_artist(query)
+                (events, total), outcome = await self._call_with_timeout(
+                    collector, timeout, lambda: collector.search_by_artist(query), segment
+                )
                 
                 if events:
                     count = len(events)
@@ -70,7 +292,11 @@ class MultiCollector:
                     return events, total
                 else:
                     logger.info(f"{provider_name} returned no artist events, trying next collector...")
+                    if not outcome.failed:
+                        await self.negative_cache.set(negative_key, True)
                     
+            except asyncio.TimeoutError:
+                logger.warning(f"{provider_name} timed out after {timeout:.2f}s, trying next collector...")
             except Exception as e:
                 logger.error(f"Error collecting artist events from {provider_name}: {e}")
                 logger.info(f"Falling back to next collector...")
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Vectorized filtering and sorting of cached result sets."""
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from api.models.event import EventMention
+
+SORT_KEYS = ("price", "popularity", "date")
+
+
+@dataclass(frozen=True)
+class ResultFilter:
+    """
+    Server-side view over a result set.
+
+    ``min_price``/``max_price`` bound an event's lowest ticket price (events
+    without a price are excluded once either is set); ``sort`` is "price"
+    (cheapest first), "popularity" (most popular first) or "date" (soonest
+    first). Sorting is stable, so ties keep provider order.
+    """
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    has_tickets: Optional[bool] = None
+    sort: Optional[str] = None
+
+    def __post_init__(self):
+        if self.sort is not None and self.sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}")
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise ValueError("min_price must not exceed max_price")
+
+    @property
+    def active(self) -> bool:
+        return any(v is not None for v in asdict(self).values())
+
+    def to_dict(self) -> dict:
+        """Non-default settings only, for cursors."""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResultFilter":
+        try:
+            return cls(
+                min_price=None if data.get("min_price") is None else float(data["min_price"]),
+                max_price=None if data.get("max_price") is None else float(data["max_price"]),
+                has_tickets=None if data.get("has_tickets") is None else bool(data["has_tickets"]),
+                sort=data.get("sort")
+            )
+        except (TypeError, AttributeError) as e:
+            raise ValueError("Malformed filter") from e
+
+    def variant(self) -> str:
+        """Stable string identifying this view, for ETags."""
+        return ",".join(f"{k}={v}" for k, v in self.to_dict().items()) or "*"
+
+
+class ColumnarView:
+    """NumPy columns of the numeric fields of a fixed list of events."""
+
+    __slots__ = ("events", "min_price", "popularity", "has_tickets", "date")
+
+    def __init__(self, events: List[EventMention]):
+        self.events = events
+        self.min_price = np.array(
+            [np.nan if e.min_price is None else e.min_price for e in events], dtype=np.float64
+        )
+        self.popularity = np.array(
+            [_popularity(e) for e in events], dtype=np.float64
+        )
+        self.has_tickets = np.array([e.has_tickets for e in events], dtype=bool)
+        self.date = np.array([_date(e.timestamp) for e in events], dtype="datetime64[D]")
+
+    def select(self, view: ResultFilter) -> np.ndarray:
+        """Indices of matching events in view order."""
+        mask = np.ones(len(self.events), dtype=bool)
+        if view.min_price is not None:
+            mask &= self.min_price >= view.min_price
+        if view.max_price is not None:
+            mask &= self.min_price <= view.max_price
+        if view.has_tickets is not None:
+            mask &= self.has_tickets == view.has_tickets
+        indices = np.flatnonzero(mask)
+
+        if view.sort == "price":
+            # NaN (no price) sorts last
+            order = np.argsort(self.min_price[indices], kind="stable")
+        elif view.sort == "popularity":
+            order = np.argsort(-self.popularity[indices], kind="stable")
+        elif view.sort == "date":
+            # NaT (unparseable date) sorts last
+            order = np.argsort(self.date[indices], kind="stable")
+        else:
+            return indices
+        return indices[order]
+
+    def apply(self, view: ResultFilter) -> List[EventMention]:
+        if not view.active:
+            return self.events
+        return [self.events[i] for i in self.select(view)]
+
+
+def _popularity(event: EventMention) -> float:
+    value = event.scores.get("popularity", 0) if isinstance(event.scores, dict) else 0
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _date(timestamp: str) -> np.datetime64:
+    try:
+        return np.datetime64(timestamp[:10], "D")
+    except (ValueError, TypeError):
+        return np.datetime64("NaT")
+
+
+class ColumnarViews:
+    """
+    Columnar views of cached result sets, keyed by the result's content version.
+
+    A view is built once per cached result and reused by every filtered or
+    sorted request for it.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._views: "OrderedDict[str, ColumnarView]" = OrderedDict()
+
+    def get(self, version: str, events: List[EventMention]) -> ColumnarView:
+        view = self._views.get(version)
+        if view is None:
+            view = self._views[version] = ColumnarView(events)
+        self._views.move_to_end(version)
+        while len(self._views) > self.max_entries:
+            self._views.popitem(last=False)
+        return view
+
+    def clear(self) -> None:
+        self._views.clear()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Request deadlines and adaptive per-provider timeouts."""
+import math
+import time
+from collections import deque
+from contextvars import ContextVar, Token
+from typing import Deque, Dict, Optional
+
+from api import config
+
+
+class Deadline:
+    """A point in time by which a request must have finished its upstream work."""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class LatencyTracker:
+    """
+    Rolling latency samples per provider, used to size timeouts.
+
+    The timeout cap for a provider is its recent high-percentile latency times
+    a safety multiplier, clamped to [PROVIDER_TIMEOUT_MIN, PROVIDER_TIMEOUT_MAX].
+    Until enough samples exist the cap is PROVIDER_TIMEOUT_MAX.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 10):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, seconds: float) -> None:
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = self._samples[provider] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, provider: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of recent samples, or None without enough data."""
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def timeout_cap(self, provider: str) -> float:
+        estimate = self.percentile(provider, config.PROVIDER_TIMEOUT_PERCENTILE)
+        if estimate is None:
+            return config.PROVIDER_TIMEOUT_MAX
+        cap = estimate * config.PROVIDER_TIMEOUT_MULTIPLIER
+        return min(config.PROVIDER_TIMEOUT_MAX, max(config.PROVIDER_TIMEOUT_MIN, cap))
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Current estimates per provider, for debugging."""
+        return {
+            provider: {
+                "samples": len(samples),
+                "p50": self.percentile(provider, 50),
+                "p95": self.percentile(provider, 95),
+                "timeout_cap": self.timeout_cap(provider)
+            }
+            for provider, samples in self._samples.items()
+        }
+
+
+# Timeout granted to the provider call currently running in this context
+_provider_timeout: ContextVar[Optional[float]] = ContextVar("provider_timeout", default=None)
+
+
+def set_provider_timeout(seconds: float) -> Token:
+    return _provider_timeout.set(seconds)
+
+
+def reset_provider_timeout(token: Token) -> None:
+    _provider_timeout.reset(token)
+
+
+def current_provider_timeout(default: float) -> float:
+    """Timeout a collector should use for its HTTP calls."""
+    timeout = _provider_timeout.get()
+    return default if timeout is None else timeout
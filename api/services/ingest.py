@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""Streaming ingest of Ticketmaster Discovery Feed files."""
+import csv
+import gzip
+import io
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, IO, Iterator, List, Optional
+
+from api.collectors.ticketmaster import TicketmasterCollector
+from api.models.event import EventMention
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "ndjson", "csv")
+
+# Read size for JSON files; memory use is bounded by this plus one record
+CHUNK_SIZE = 1 << 20
+# A JSON record that does not decode within this many characters is malformed
+MAX_RECORD_SIZE = 16 << 20
+
+# Receives each batch of parsed events, e.g. EventStore.upsert_many
+EventSink = Callable[[List[EventMention]], Awaitable[None]]
+# Called with a short reason for each record that could not be decoded
+MalformedHandler = Callable[[str], None]
+
+
+def detect_format(path: str) -> str:
+    """Feed format from the file name: .json, .ndjson/.jsonl or .csv (optionally .gz)."""
+    name = path.lower().removesuffix(".gz")
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".json"):
+        return "json"
+    raise ValueError(f"Cannot tell the feed format of {path}; pass one of: {', '.join(FORMATS)}")
+
+
+def open_feed(path: str) -> IO[str]:
+    """Open a feed file as text, decompressing .gz on the fly."""
+    if path.lower().endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _value_end(buffer: str, pos: int) -> int:
+    """
+    Index just past the JSON value starting at ``pos``, found by bracket and
+    string matching only (the value need not be valid); -1 if it continues
+    past the end of ``buffer``.
+    """
+    depth, in_string, escaped = 0, False, False
+    for i in range(pos, len(buffer)):
+        char = buffer[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            if depth == 0:
+                return i
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif char == "," and depth == 0:
+            return i
+    return -1
+
+
+def iter_json_array(
+    stream: IO[str],
+    key: str = "events",
+    on_malformed: Optional[MalformedHandler] = None
+) -> Iterator[dict]:
+    """
+    Yield the objects of a JSON array one at a time.
+
+    The array is either the whole document or the value of ``key`` in the
+    top-level object (``{"events": [...]}``). Only the current chunk and the
+    object being decoded are held in memory. An element that is not valid
+    JSON is skipped and reported to ``on_malformed``; the feed as a whole
+    must still be a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = "", 0
+
+    def fill() -> bool:
+        """Append the next chunk, dropping what was consumed; False at end of file."""
+        nonlocal buffer, pos
+        chunk = stream.read(CHUNK_SIZE)
+        buffer, pos = buffer[pos:] + chunk, 0
+        return bool(chunk)
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    # Find the opening bracket of the array
+    skip(" \t\r\n")
+    if buffer[pos:pos + 1] == "{":
+        marker = f'"{key}"'
+        while True:
+            found = buffer.find(marker, pos)
+            if found >= 0:
+                pos = found + len(marker)
+                break
+            pos = max(pos, len(buffer) - len(marker))
+            if not fill():
+                raise ValueError(f'No "{key}" array in feed')
+        skip(" \t\r\n:")
+    if buffer[pos:pos + 1] != "[":
+        raise ValueError("Feed is not a JSON array")
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buffer):
+            raise ValueError("Feed ended inside the event array")
+        if buffer[pos] == "]":
+            return
+        record = None
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError as e:
+                end = _value_end(buffer, pos)
+                if end > pos:
+                    # The element is complete but invalid
+                    if on_malformed is not None:
+                        on_malformed(str(e))
+                    break
+                # The element continues in the next chunk
+                if len(buffer) - pos > MAX_RECORD_SIZE or not fill():
+                    raise
+        pos = end
+        if record is not None:
+            yield record
+
+
+def iter_records(stream: IO[str], fmt: str, on_malformed: Optional[MalformedHandler] = None) -> Iterator[dict]:
+    """Yield raw feed records of a text stream in the given format, skipping undecodable ones."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "ndjson":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                if on_malformed is not None:
+                    on_malformed(str(e))
+    elif fmt == "json":
+        yield from iter_json_array(stream, on_malformed=on_malformed)
+    else:
+        raise ValueError(f"Unknown feed format '{fmt}'; use one of: {', '.join(FORMATS)}")
+
+
+def _flatten(record: dict) -> Dict[str, object]:
+    """Feed record keys as lowercase without separators; nested venue objects are merged in."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value))
+        else:
+            flat[key.replace("_", "").lower()] = value
+    return flat
+
+
+def _number(value) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_discovery_event(record: dict) -> dict:
+    """
+    Map a Discovery Feed record to the Discovery API event shape.
+
+    Feed files use flat columns (EVENT_ID, VENUE_CITY, MIN_PRICE... in CSV;
+    eventId, venue.venueCity, minPrice... in JSON); records that already
+    look like API events are returned unchanged.
+    """
+    if "id" in record and "name" in record:
+        return record
+    f = _flatten(record)
+    event = {
+        "id": str(f.get("eventid") or ""),
+        "name": f.get("eventname") or "Unknown Event",
+        "url": f.get("primaryeventurl") or f.get("eventurl") or "",
+        "dates": {
+            "start": {"localDate": f.get("eventstartlocaldate") or ""},
+            "status": {"code": str(f.get("eventstatus") or "").lower()}
+        },
+        "_embedded": {"venues": [{
+            "name": f.get("venuename") or "TBA",
+            "city": {"name": f.get("venuecity") or "Unknown"}
+        }]}
+    }
+    latitude, longitude = _number(f.get("venuelatitude")), _number(f.get("venuelongitude"))
+    if latitude is not None and longitude is not None:
+        event["_embedded"]["venues"][0]["location"] = {"latitude": latitude, "longitude": longitude}
+    min_price, max_price = _number(f.get("minprice")), _number(f.get("maxprice"))
+    if min_price is not None or max_price is not None:
+        event["priceRanges"] = [{"min": min_price, "max": max_price, "currency": f.get("currency")}]
+    if f.get("classificationsegment"):
+        event["classifications"] = [{"segment": {"name": f["classificationsegment"]}}]
+    if f.get("eventimageurl"):
+        event["images"] = [{"url": f["eventimageurl"]}]
+    return event
+
+
+@dataclass
+class IngestStats:
+    """Outcome of one feed ingest."""
+    records: int = 0
+    events: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Events stored per second."""
+        return self.events / self.seconds if self.seconds else 0.0
+
+
+def iter_feed_events(
+    path: str,
+    fmt: Optional[str] = None,
+    limit: Optional[int] = None,
+    stats: Optional[IngestStats] = None
+) -> Iterator[EventMention]:
+    """
+    Parse a feed file lazily into events.
+
+    Records are parsed with the same extraction as Discovery API responses.
+    Malformed records (undecodable, or without an ID or date) are counted in
+    ``stats`` and skipped. Stops after ``limit`` records.
+    """
+    fmt = fmt or detect_format(path)
+    parser = TicketmasterCollector()
+    stats = stats if stats is not None else IngestStats()
+
+    def malformed(reason: str) -> None:
+        stats.records += 1
+        stats.skipped += 1
+        logger.debug(f"Skipping feed record {stats.records}: {reason}")
+
+    with open_feed(path) as stream:
+        for record in iter_records(stream, fmt, on_malformed=malformed):
+            stats.records += 1
+            try:
+                event = parser.parse_event(to_discovery_event(record), default_date="")
+                if not event.id or not event.timestamp:
+                    raise ValueError("missing event ID or date")
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                stats.skipped += 1
+                logger.debug(f"Skipping feed record {stats.records}: {e}")
+                continue
+            yield event
+            if limit is not None and stats.records >= limit:
+                break
+
+
+async def ingest_feed(
+    path: str,
+    sink: EventSink,
+    fmt: Optional[str] = None,
+    batch_size: int = 1000,
+    limit: Optional[int] = None,
+    progress: Optional[Callable[[IngestStats], None]] = None
+) -> IngestStats:
+    """
+    Stream a feed file into ``sink`` in batches of ``batch_size`` events.
+
+    See ``iter_feed_events`` for parsing and skipping. ``progress`` is called
+    after every batch.
+    """
+    stats = IngestStats()
+    started = time.perf_counter()
+
+    async def flush(events: List[EventMention]) -> None:
+        await sink(events)
+        stats.events += len(events)
+        stats.batches += 1
+        stats.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(stats)
+
+    batch: List[EventMention] = []
+    for event in iter_feed_events(path, fmt=fmt, limit=limit, stats=stats):
+        batch.append(event)
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        f"Ingested {stats.events} events from {path} ({stats.skipped} skipped) "
+        f"in {stats.seconds:.1f}s ({stats.rate:.0f} events/s)"
+    )
+    return stats
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Event package responses materialized ahead of the request."""
+import asyncio
+import contextvars
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Set
+
+from api.models.event import EventMention
+from api.services.cache import CacheEntry, TTLCache
+from api.services.store import EventStore
+
+logger = logging.getLogger(__name__)
+
+# Builds the encoded package for an event: value is the body, version its ETag.
+# The flag allows upstream calls; without it a builder returns None when it
+# cannot build from local data alone.
+PackageBuilder = Callable[[EventMention, bool], Awaitable[Optional[CacheEntry]]]
+
+
+class PackageMaterializer:
+    """
+    Encoded package responses by event ID, kept in step with the event store.
+
+    When an event is added or changes, its package is dropped and - with
+    ``prebuild`` - rebuilt by a small pool of background workers, so the
+    package endpoint is usually a dictionary lookup. A package expires with
+    the Ticketmaster resolution it was built from.
+
+    Prebuilds only use local data (no upstream calls) and are skipped for
+    events restored from a snapshot; builds requested through ``schedule``
+    may go upstream. At most ``max_pending`` builds wait in the queue, the
+    oldest being dropped first. An event is queued or built at most once at a
+    time, however often it is scheduled.
+
+    A build only lands if the store still holds the exact event object it was
+    built from, so a change during a slow build cannot leave a stale package.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        build: PackageBuilder,
+        ttl: float,
+        max_entries: int = 4096,
+        concurrency: int = 4,
+        prebuild: bool = True,
+        max_pending: int = 1024
+    ):
+        self._store = store
+        self._build = build
+        self._packages = TTLCache(ttl=ttl, max_entries=max_entries)
+        # Queued event IDs, mapped to whether their build may go upstream
+        self._pending: "OrderedDict[str, bool]" = OrderedDict()
+        # IDs whose build is running
+        self._building: Set[str] = set()
+        self._workers: Set[asyncio.Task] = set()
+        self.concurrency = concurrency
+        self.prebuild = prebuild
+        self.max_pending = max_pending
+        store.add_change_listener(self.invalidate)
+
+    def get(self, event_id: str) -> Optional[CacheEntry]:
+        return self._packages.get(event_id)
+
+    def put(self, event: EventMention, entry: CacheEntry) -> bool:
+        """Store a package built from ``event``; ignored if the event has since changed."""
+        if self._store.get(event.id) is not event:
+            return False
+        self._packages.put(event.id, entry)
+        return True
+
+    def invalidate(self, event_ids: List[str]) -> None:
+        """Drop packages of changed events and queue local rebuilds for those still stored."""
+        prebuild = self.prebuild and not self._store.restoring
+        for event_id in event_ids:
+            self._packages.delete(event_id)
+            if prebuild and event_id in self._store:
+                self._enqueue(event_id, network=False)
+        self._spawn_workers()
+
+    def schedule(self, event_id: str) -> None:
+        """Queue a background build for a stored event, even without ``prebuild``."""
+        if event_id in self._store:
+            self._enqueue(event_id, network=True)
+            self._spawn_workers()
+
+    def _enqueue(self, event_id: str, network: bool) -> None:
+        if event_id in self._building:
+            return
+        # Already queued: only upgrade a local build to one that may go upstream
+        self._pending[event_id] = network or self._pending.get(event_id, False)
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+
+    def clear(self) -> None:
+        self._packages.clear()
+        self._pending.clear()
+
+    def _spawn_workers(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous caller: packages are built on first request instead
+            return
+        self._workers = {t for t in self._workers if not t.done() and t.get_loop() is loop}
+        while self._pending and len(self._workers) < self.concurrency:
+            # A fresh context keeps builds out of the triggering request's trace
+            task = loop.create_task(self._work(), context=contextvars.Context())
+            self._workers.add(task)
+
+    async def _work(self) -> None:
+        while self._pending:
+            event_id, network = self._pending.popitem(last=False)
+            event = self._store.get(event_id)
+            if event is None or self._packages.get(event_id) is not None:
+                continue
+            self._building.add(event_id)
+            try:
+                entry = await self._build(event, network)
+            except Exception as e:
+                logger.error(f"Package build failed for {event_id}: {e}")
+                continue
+            finally:
+                self._building.discard(event_id)
+            if entry is not None:
+                self.put(event, entry)
+            current = self._store.get(event_id)
+            if self.prebuild and current is not None and current is not event:
+                # The event changed mid-build, when its invalidation was skipped
+                self._enqueue(event_id, network=False)
+
+    async def drain(self) -> None:
+        """Wait until queued builds have finished."""
+        loop = asyncio.get_running_loop()
+        while True:
+            workers = [t for t in self._workers if not t.done() and t.get_loop() is loop]
+            if not workers:
+                return
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Opaque cursor pagination over server-side result snapshots."""
+import base64
+import json
+from typing import Optional, Tuple
+
+from api.services.cache import CacheBackend, CacheEntry, TieredCache
+from api.services.search_cache import pack_result, unpack_result
+
+
+def encode_cursor(snapshot_id: str, offset: int, view: Optional[dict] = None) -> str:
+    """
+    Build an opaque, URL-safe cursor pointing into a snapshot.
+
+    ``view`` (filter/sort settings) travels with the cursor so later pages
+    are sliced from the same filtered, sorted list.
+    """
+    data = {"s": snapshot_id, "o": offset}
+    if view:
+        data["v"] = view
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, dict]:
+    """Return (snapshot_id, offset, view) for a cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        snapshot_id, offset, view = data["s"], data["o"], data.get("v", {})
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(snapshot_id, str) or not isinstance(offset, int) or offset < 0 or not isinstance(view, dict):
+        raise ValueError("Malformed cursor")
+    return snapshot_id, offset, view
+
+
+class ResultSnapshots:
+    """
+    Frozen search results that later pages are sliced from.
+
+    Snapshots are keyed by the content version of the result, so identical
+    upstream windows share one snapshot and a cursor keeps pointing at the
+    exact list it was issued for, even after the search cache refreshes.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024, l2: Optional[CacheBackend] = None):
+        self._snapshots = TieredCache(
+            "snapshot",
+            ttl=ttl,
+            encode=pack_result,
+            decode=unpack_result,
+            max_entries=max_entries,
+            l2=l2
+        )
+
+    async def add(self, entry: CacheEntry) -> CacheEntry:
+        """Register a cached search result as a snapshot; an existing one keeps its expiry."""
+        existing = await self._snapshots.get(entry.version)
+        if existing is not None:
+            return existing
+        return await self._snapshots.set(entry.version, entry.value, version=entry.version)
+
+    async def get(self, snapshot_id: str) -> Optional[CacheEntry]:
+        return await self._snapshots.get(snapshot_id)
+
+    def clear(self) -> None:
+        """Drop locally held snapshots."""
+        self._snapshots.clear_local()
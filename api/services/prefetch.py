@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Date-window prefetch: one upstream window fills the search cache for several days."""
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from api.collectors.base import EventCollector, EventSearchQuery
+from api.models.event import EventMention
+from api.services.cache import CacheEntry, TTLCache
+from api.services.collector import MultiCollector
+from api.services.deadline import reset_provider_timeout, set_provider_timeout
+from api.services.search_cache import SearchCache
+from api import config
+
+logger = logging.getLogger(__name__)
+
+
+class DatePrefetcher:
+    """
+    Turns a single-day search miss into one window fetch of ``days`` days.
+
+    The window starts at the requested date (users browse forward) and is
+    fetched from the primary collector's ``search_window``, paging as needed.
+    Each day of it is stored in the search cache as the result of that day's
+    query, first ``limit`` events in date order, which is what a single-day
+    search returns. Days without events are recorded in the negative cache
+    instead, so their searches go straight to the fallback provider. When
+    the window was cut short, only the days before its last event are
+    filled, since the last one may be partial.
+
+    Concurrent misses inside one window share its fetch, and days filled
+    recently are not prefetched again.
+    """
+
+    def __init__(
+        self,
+        collector: MultiCollector,
+        cache: SearchCache,
+        on_events: Callable[[List[EventMention]], Awaitable[None]],
+        days: int,
+        max_events: int = 1000,
+        ttl: float = 300
+    ):
+        self.collector = collector
+        self.cache = cache
+        self.on_events = on_events
+        self.days = days
+        self.max_events = max_events
+        self._covered = TTLCache(ttl=ttl, max_entries=8192)
+        # Windows being fetched, by (query without date, first day): task, days covered
+        self._inflight: Dict[Tuple[str, str], Tuple["asyncio.Task[int]", Set[str]]] = {}
+        self.windows = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 1
+
+    async def get(self, query: EventSearchQuery, wait: float) -> Optional[CacheEntry]:
+        """
+        Prefetch the window starting at ``query``'s date and return its cached day.
+
+        Returns None when the query is not prefetchable, the day was filled
+        recently (so the miss is genuine), the day had no events, or the window
+        takes longer than ``wait`` seconds; the window then keeps loading.
+        """
+        if not self.enabled or query.page != 0 or wait <= 0 or self._covered.get(self.cache.key(query)):
+            return None
+        primary = self.collector.primary(query)
+        if primary is None:
+            return None
+        params = self.cache.key(replace(query, date=""))
+        task = next(
+            (task for (p, _), (task, days) in self._inflight.items() if p == params and query.date in days),
+            None
+        )
+        if task is None:
+            try:
+                days = self._window(query.date)
+            except ValueError:
+                return None
+            task = self._start(primary, query, days, (params, query.date))
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=wait)
+        except asyncio.TimeoutError:
+            logger.info(f"Prefetch window from {query.date} still loading after {wait:.2f}s")
+            return None
+        except Exception:
+            return None
+        return await self.cache.get(query)
+
+    def _start(self, primary: EventCollector, query: EventSearchQuery, days: List[str], window_key) -> "asyncio.Task[int]":
+        task = asyncio.create_task(self._fill(primary, query, days))
+        self._inflight[window_key] = (task, set(days))
+
+        def done(task: "asyncio.Task[int]") -> None:
+            self._inflight.pop(window_key, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Prefetch window from {query.date} failed: {task.exception()}")
+
+        task.add_done_callback(done)
+        return task
+
+    def _window(self, first_day: str) -> List[str]:
+        start = date.fromisoformat(first_day)
+        return [(start + timedelta(days=n)).isoformat() for n in range(self.days)]
+
+    async def _fill(self, primary: EventCollector, query: EventSearchQuery, days: List[str]) -> int:
+        """Fetch the window and fill the cache; returns the number of days filled."""
+        token = set_provider_timeout(config.PROVIDER_TIMEOUT_MAX)
+        try:
+            window = await primary.search_window(query, days[-1], self.max_events)
+        finally:
+            reset_provider_timeout(token)
+        if window is None:
+            return 0
+        events, complete = window
+        self.windows += 1
+        by_day: Dict[str, List[EventMention]] = defaultdict(list)
+        for event in events:
+            by_day[event.timestamp[:10]].append(event)
+        if not complete:
+            last_day = events[-1].timestamp[:10] if events else days[0]
+            days = [day for day in days if day < last_day]
+
+        await self.on_events(events)
+        for day in days:
+            day_query = replace(query, date=day)
+            day_events = by_day.get(day, [])[:query.limit]
+            if day_events:
+                await self.cache.put(day_query, day_events, len(day_events))
+            else:
+                await self.collector.remember_empty(primary, day_query)
+            self._covered.set(self.cache.key(day_query), True)
+        logger.info(f"Prefetched {len(events)} events for {len(days)} days from {query.date}")
+        return len(days)
+
+    def clear(self) -> None:
+        self._covered.clear()
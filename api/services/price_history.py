@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Per-event price history in compact typed arrays."""
+import math
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.models.event import EventMention
+
+_NAN = float("nan")
+_F32 = struct.Struct("f")
+
+# (timestamp, min_price, max_price); prices are None when unknown
+Sample = Tuple[int, Optional[float], Optional[float]]
+
+
+def _f32(value: Optional[float]) -> float:
+    """Round-trip a price through float32 so it compares equal to what is stored."""
+    if value is None:
+        return _NAN
+    return _F32.unpack(_F32.pack(value))[0]
+
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def _price(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(value, 2)
+
+
+def _nanmin(a: float, b: float) -> float:
+    return b if math.isnan(a) else a if math.isnan(b) else min(a, b)
+
+
+def _nanmax(a: float, b: float) -> float:
+    return b if math.isnan(a) else a if math.isnan(b) else max(a, b)
+
+
+class PriceSeries:
+    """
+    (timestamp, min, max) samples of one event, 12 bytes each.
+
+    Timestamps are unsigned 32-bit Unix seconds and prices float32, with NaN
+    for an unknown price. A run of identical prices keeps only its first and
+    last sample, so steady prices cost two samples however often they are
+    refreshed.
+    """
+
+    __slots__ = ("timestamps", "mins", "maxs")
+
+    def __init__(self):
+        self.timestamps = array("I")
+        self.mins = array("f")
+        self.maxs = array("f")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.timestamps, self.mins, self.maxs))
+
+    def append(self, timestamp: int, min_price: Optional[float], max_price: Optional[float]) -> None:
+        lo, hi = _f32(min_price), _f32(max_price)
+        n = len(self.timestamps)
+        if n:
+            # Out-of-order refreshes are recorded at the latest known time
+            timestamp = max(timestamp, self.timestamps[-1])
+        if (
+            n >= 2
+            and _same(self.mins[-1], lo) and _same(self.maxs[-1], hi)
+            and _same(self.mins[-2], lo) and _same(self.maxs[-2], hi)
+        ):
+            self.timestamps[-1] = timestamp
+            return
+        self.timestamps.append(timestamp)
+        self.mins.append(lo)
+        self.maxs.append(hi)
+
+    def drop_before(self, cutoff: int) -> None:
+        """Retention: remove samples older than ``cutoff``."""
+        i = bisect_left(self.timestamps, cutoff)
+        if i:
+            del self.timestamps[:i]
+            del self.mins[:i]
+            del self.maxs[:i]
+
+    def compact(self, max_samples: int) -> None:
+        """
+        Downsample until at most ``max_samples`` remain.
+
+        The older half is merged pairwise (earlier timestamp, lowest min,
+        highest max), so recent history keeps full resolution and price
+        extremes are never lost.
+        """
+        while len(self.timestamps) > max(max_samples, 2):
+            half = (len(self.timestamps) // 2 + 1) & ~1
+            ts, lo, hi = array("I"), array("f"), array("f")
+            for i in range(0, half, 2):
+                ts.append(self.timestamps[i])
+                lo.append(_nanmin(self.mins[i], self.mins[i + 1]))
+                hi.append(_nanmax(self.maxs[i], self.maxs[i + 1]))
+            self.timestamps = ts + self.timestamps[half:]
+            self.mins = lo + self.mins[half:]
+            self.maxs = hi + self.maxs[half:]
+
+    def samples(self, since: int = 0, resolution: int = 0) -> List[Sample]:
+        """Samples from ``since`` on; with ``resolution`` (seconds) one per time bucket."""
+        start = bisect_left(self.timestamps, since)
+        if resolution <= 0:
+            return [
+                (self.timestamps[i], _price(self.mins[i]), _price(self.maxs[i]))
+                for i in range(start, len(self.timestamps))
+            ]
+
+        buckets: List[Sample] = []
+        bucket, lo, hi = None, _NAN, _NAN
+        for i in range(start, len(self.timestamps)):
+            key = self.timestamps[i] - self.timestamps[i] % resolution
+            if key != bucket:
+                if bucket is not None:
+                    buckets.append((bucket, _price(lo), _price(hi)))
+                bucket, lo, hi = key, _NAN, _NAN
+            lo = _nanmin(lo, self.mins[i])
+            hi = _nanmax(hi, self.maxs[i])
+        if bucket is not None:
+            buckets.append((bucket, _price(lo), _price(hi)))
+        return buckets
+
+
+class PriceHistoryStore:
+    """
+    Price series by event ID, fed with every provider refresh.
+
+    Samples older than ``retention`` seconds are dropped and each series is
+    downsampled to at most ``max_samples``. Series with no sample left within
+    retention (events no longer refreshed, e.g. dropped from the store) are
+    swept at most every ``sweep_interval`` seconds while recording.
+    """
+
+    def __init__(self, retention: float = 90 * 86400, max_samples: int = 2048, sweep_interval: float = 3600):
+        self.retention = retention
+        self.max_samples = max_samples
+        self.sweep_interval = sweep_interval
+        self._series: Dict[str, PriceSeries] = {}
+        self._last_sweep = 0
+
+    def record(self, events: Iterable[EventMention], now: Optional[float] = None) -> None:
+        """Append the current prices of refreshed events."""
+        timestamp = int(now if now is not None else time.time())
+        cutoff = timestamp - int(self.retention)
+        for event in events:
+            if event.min_price is None and event.max_price is None:
+                continue
+            series = self._series.get(event.id)
+            if series is None:
+                series = self._series[event.id] = PriceSeries()
+            series.append(timestamp, event.min_price, event.max_price)
+            if series.timestamps[0] < cutoff:
+                series.drop_before(cutoff)
+            if len(series) > self.max_samples:
+                series.compact(self.max_samples)
+        if timestamp - self._last_sweep >= self.sweep_interval:
+            self.sweep(now=timestamp)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove series whose newest sample is past retention; returns how many."""
+        timestamp = int(now if now is not None else time.time())
+        cutoff = timestamp - int(self.retention)
+        stale = [event_id for event_id, series in self._series.items() if series.timestamps[-1] < cutoff]
+        for event_id in stale:
+            del self._series[event_id]
+        self._last_sweep = timestamp
+        return len(stale)
+
+    def get(self, event_id: str) -> Optional[PriceSeries]:
+        return self._series.get(event_id)
+
+    def samples(self, event_id: str, since: int = 0, resolution: int = 0) -> Optional[List[Sample]]:
+        series = self._series.get(event_id)
+        if series is None:
+            return None
+        cutoff = int(time.time() - self.retention)
+        return series.samples(since=max(since, cutoff), resolution=resolution)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(s) for s in self._series.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in sample buffers (excluding per-series object overhead)."""
+        return sum(s.nbytes for s in self._series.values())
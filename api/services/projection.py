@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Sparse field selection (``fields=``) for event list responses."""
+import copy
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from pydantic_core import SchemaSerializer
+
+from api.models.event import EventMention, PaginationMetadata
+
+EVENT_FIELDS: Tuple[str, ...] = tuple(EventMention.model_fields)
+
+# Always serialized so clients can request the package for a projected event
+ALWAYS_INCLUDED = ("id",)
+
+Projection = Optional[Tuple[str, ...]]
+
+
+def parse_fields(fields: Optional[str]) -> Projection:
+    """
+    Parse a comma-separated ``fields`` value into a canonical projection.
+
+    Returns None for "all fields". Field order and duplicates do not matter,
+    so equivalent requests share one serializer and one ETag variant.
+    Raises ValueError listing any unknown field names.
+    """
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested.difference(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.update(ALWAYS_INCLUDED)
+    # Keep model declaration order for a stable, readable output
+    return tuple(f for f in EVENT_FIELDS if f in requested)
+
+
+@lru_cache(maxsize=64)
+def event_list_serializer(projection: Projection) -> SchemaSerializer:
+    """
+    Build (once per projection) a serializer for ``List[EventMention]``.
+
+    Excluded fields are marked in a copy of the model's core schema, so the
+    Rust serializer skips them directly instead of filtering on every call.
+    """
+    schema = EventMention.__pydantic_core_schema__
+    if projection is not None:
+        schema = copy.copy(schema)
+        schema["schema"] = copy.copy(schema["schema"])
+        schema["schema"]["fields"] = {
+            name: field if name in projection else {**field, "serialization_exclude": True}
+            for name, field in schema["schema"]["fields"].items()
+        }
+    return SchemaSerializer({"type": "list", "items_schema": schema})
+
+
+def encode_events(events: List[EventMention], projection: Projection = None) -> bytes:
+    """Encode an event list with the serializer for ``projection``."""
+    return event_list_serializer(projection).to_json(events)
+
+
+def encode_paginated(
+    events: List[EventMention],
+    pagination: PaginationMetadata,
+    projection: Projection = None
+) -> bytes:
+    """Encode a PaginatedEvents body with projected events."""
+    return b"".join((
+        b'{"events":',
+        encode_events(events, projection),
+        b',"pagination":',
+        pagination.model_dump_json().encode(),
+        b"}"
+    ))
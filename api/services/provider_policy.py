@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Adaptive provider ordering for MultiCollector.
+
+For a sequential fallback chain, the expected time to the first non-empty
+result is minimized by trying providers in ascending order of
+``latency / hit_rate``. Observed hit rate and latency are tracked per provider
+and per query segment (country, category), and providers are reordered within
+their business-priority tier only: a provider in tier 0 is always tried before
+any provider in tier 1.
+"""
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from api import config
+from api.collectors.base import ArtistSearchQuery
+from api.services.canonical import KNOWN_CATEGORIES, canonical_category
+
+Segment = Tuple[str, str]
+
+KNOWN_COUNTRIES = frozenset(c.strip().upper() for c in config.PROVIDER_SEGMENT_COUNTRIES if c.strip())
+
+
+def query_segment(query: Any) -> Segment:
+    """
+    (country, category) bucket used to keep separate provider stats.
+
+    Categories are canonicalized, and unknown categories and countries outside
+    KNOWN_COUNTRIES share "*", so user input cannot grow the stats without bound.
+    """
+    country = (getattr(query, "country_code", "") or "").strip().upper()
+    country = country if country in KNOWN_COUNTRIES else "*"
+    if isinstance(query, ArtistSearchQuery):
+        return country, "artist"
+    category = canonical_category(getattr(query, "category", None))
+    return country, category if category in KNOWN_CATEGORIES else "*"
+
+
+@dataclass
+class ProviderStats:
+    """Exponentially decayed hit/latency statistics for one provider+segment."""
+    samples: int = 0
+    weight: float = 0.0
+    hits: float = 0.0
+    latency: Optional[float] = None
+
+    def record(self, hit: bool, latency: float, decay: float) -> None:
+        self.samples += 1
+        self.weight = self.weight * decay + 1
+        self.hits = self.hits * decay + (1 if hit else 0)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (1 - decay) * (latency - self.latency)
+
+    @property
+    def hit_rate(self) -> float:
+        """Laplace-smoothed share of calls that returned events."""
+        return (self.hits + 1) / (self.weight + 2)
+
+    def expected_cost(self, default_latency: float) -> float:
+        """Latency paid per successful answer; lower is better."""
+        latency = self.latency if self.latency is not None else default_latency
+        return latency / max(self.hit_rate, 0.01)
+
+
+class AdaptiveProviderPolicy:
+    """
+    Chooses the order (and skips) of providers for each query segment.
+
+    - ``tiers`` maps provider name to business priority (lower first); providers
+      missing from it share tier 0.
+    - Within a tier, only providers with at least ``min_samples`` calls are
+      reordered (among the positions they hold in the configured order); cold
+      providers keep their configured position.
+    - A provider with at least ``min_samples`` calls and a hit rate below
+      ``skip_below`` is skipped, except with probability ``explore_rate`` (so
+      its stats can recover) and never when it is the only provider left.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[Dict[str, int]] = None,
+        min_samples: int = 20,
+        skip_below: float = 0.05,
+        explore_rate: float = 0.05,
+        decay: float = 0.95,
+        history: int = 100
+    ):
+        self.tiers = tiers or {}
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.explore_rate = explore_rate
+        self.decay = decay
+        self._stats: Dict[Tuple[str, Segment], ProviderStats] = {}
+        self.decisions: Deque[dict] = deque(maxlen=history)
+
+    def stats(self, provider: str, segment: Segment) -> ProviderStats:
+        key = (provider, segment)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ProviderStats()
+        return stats
+
+    def record(self, provider: str, segment: Segment, hit: bool, latency: float) -> None:
+        self.stats(provider, segment).record(hit, latency, self.decay)
+
+    def order(self, providers: List[str], segment: Segment) -> Tuple[List[str], List[str]]:
+        """
+        Return (providers to try in order, providers skipped) for ``segment``.
+
+        ``providers`` is the configured order, used to break ties so that
+        a cold start behaves exactly like the static chain.
+        """
+        known = [s.latency for p in providers if (s := self._stats.get((p, segment))) and s.latency is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+
+        position = {p: i for i, p in enumerate(providers)}
+        ranked = sorted(providers, key=lambda p: (self.tiers.get(p, 0), position[p]))
+        # Trusted providers swap among their own slots; cold ones stay put
+        slots = [i for i, p in enumerate(ranked) if not self._is_cold(p, segment)]
+        trusted = sorted(
+            (ranked[i] for i in slots),
+            key=lambda p: (self.tiers.get(p, 0), self._stats[(p, segment)].expected_cost(default_latency), position[p])
+        )
+        for i, provider in zip(slots, trusted):
+            ranked[i] = provider
+
+        ordered, skipped = [], []
+        for provider in ranked:
+            stats = self._stats.get((provider, segment))
+            if not self._is_cold(provider, segment) and stats.hit_rate < self.skip_below and random.random() >= self.explore_rate:
+                skipped.append(provider)
+            else:
+                ordered.append(provider)
+        if not ordered and skipped:
+            ordered.append(skipped.pop(0))
+
+        self.decisions.append({
+            "at": time.time(),
+            "segment": list(segment),
+            "configured": providers,
+            "order": ordered,
+            "skipped": skipped
+        })
+        return ordered, skipped
+
+    def _is_cold(self, provider: str, segment: Segment) -> bool:
+        """Whether a provider has too few samples in ``segment`` to be reordered or skipped."""
+        stats = self._stats.get((provider, segment))
+        return stats is None or stats.samples < self.min_samples
+
+    def snapshot(self) -> dict:
+        """Stats and recent decisions, for the debug endpoint."""
+        return {
+            "tiers": self.tiers,
+            "stats": [
+                {
+                    "provider": provider,
+                    "segment": list(segment),
+                    "samples": stats.samples,
+                    "hit_rate": round(stats.hit_rate, 4),
+                    "latency_ms": round(stats.latency * 1000, 1) if stats.latency is not None else None
+                }
+                for (provider, segment), stats in sorted(self._stats.items())
+            ],
+            "recent_decisions": list(self.decisions)
+        }
+
+
+def parse_tiers(spec: str) -> Dict[str, int]:
+    """Parse "ticketmaster=0,viagogo=1" into a tier map."""
+    tiers = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, tier = item.split("=", 1)
+            tiers[name.strip()] = int(tier)
+    return tiers
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Local matching of events to stored Ticketmaster events."""
+import logging
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from api.models.event import EventMention
+from api.services.canonical import city_key
+from api.services.store import EventStore
+from api.services.suggest import normalize
+
+logger = logging.getLogger(__name__)
+
+_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Names with fewer distinct trigrams than this are too short to match safely
+MIN_TRIGRAMS = 4
+
+# (day, city key) an event is blocked under
+Block = Tuple[str, str]
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Character trigrams of a normalized name, padded so word edges count."""
+    padded = f"  {normalize(text)} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _block(timestamp: str, city: str) -> Optional[Block]:
+    match = _DAY.match(timestamp or "")
+    if match is None or not city:
+        return None
+    return match.group(0), city_key(city)
+
+
+class TrigramResolver:
+    """
+    Finds the stored Ticketmaster event matching a name, city and date.
+
+    Ticketmaster events in the event store are indexed by character trigrams
+    within blocks of (date, city), so a lookup only scores the handful of
+    events on that day in that city. Similarity is the overlap coefficient
+    |A ∩ B| / min(|A|, |B|), which tolerates one provider listing
+    "Coldplay" and the other "Coldplay - Music of the Spheres World Tour".
+    A match is confident when it reaches ``min_similarity`` and beats the
+    runner-up by ``min_margin``; otherwise the caller falls back to the
+    network.
+    """
+
+    def __init__(self, store: EventStore, min_similarity: float = 0.8, min_margin: float = 0.1):
+        self._store = store
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        # Postings per block: trigram -> IDs of events whose name contains it
+        self._blocks: Dict[Block, Dict[str, Set[str]]] = {}
+        self._indexed: Dict[str, Tuple[Block, FrozenSet[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.on_change(list(store))
+        store.add_change_listener(self.on_change)
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def on_change(self, event_ids: List[str]) -> None:
+        """Re-index events the store added, changed or dropped."""
+        for event_id in event_ids:
+            self._remove(event_id)
+            event = self._store.get(event_id)
+            if event is not None and event.provider == "ticketmaster" and event.url:
+                self._add(event)
+
+    def _add(self, event: EventMention) -> None:
+        block = _block(event.timestamp, event.city)
+        grams = trigrams(event.text)
+        if block is None or not grams:
+            return
+        postings = self._blocks.setdefault(block, {})
+        for gram in grams:
+            postings.setdefault(gram, set()).add(event.id)
+        self._indexed[event.id] = (block, grams)
+
+    def _remove(self, event_id: str) -> None:
+        indexed = self._indexed.pop(event_id, None)
+        if indexed is None:
+            return
+        block, grams = indexed
+        postings = self._blocks[block]
+        for gram in grams:
+            ids = postings[gram]
+            ids.discard(event_id)
+            if not ids:
+                del postings[gram]
+        if not postings:
+            del self._blocks[block]
+
+    def candidates(self, name: str, city: str, date: str) -> List[Tuple[float, str]]:
+        """(similarity, event ID) of events in the block sharing trigrams with ``name``, best first."""
+        block = _block(date, city)
+        postings = self._blocks.get(block) if block else None
+        query = trigrams(name)
+        if not postings or len(query) < MIN_TRIGRAMS:
+            return []
+        shared = Counter()
+        for gram in query:
+            shared.update(postings.get(gram, ()))
+        scored = [
+            (count / min(len(query), len(self._indexed[event_id][1])), event_id)
+            for event_id, count in shared.items()
+        ]
+        scored.sort(reverse=True)
+        return scored
+
+    def resolve(self, name: str, city: str, date: str) -> Optional[EventMention]:
+        """The confidently matching stored Ticketmaster event, or None."""
+        scored = self.candidates(name, city, date)
+        if scored:
+            best, event_id = scored[0]
+            runner_up = scored[1][0] if len(scored) > 1 else 0.0
+            if best >= self.min_similarity and best - runner_up >= self.min_margin:
+                event = self._store.get(event_id)
+                if event is not None:
+                    self.hits += 1
+                    logger.debug(f"Resolved '{name}' locally to {event_id} (similarity {best:.2f})")
+                    return event
+        self.misses += 1
+        return None
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Cache of MultiCollector search results keyed by query."""
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import TypeAdapter
+
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.models.event import EventMention
+from api.services.cache import CacheBackend, CacheEntry, TieredCache, content_version
+from api.services.canonical import canonical_category, city_key, key_fields
+from api.services.codec import pack_events, unpack_events
+
+SearchQuery = Union[EventSearchQuery, ArtistSearchQuery]
+
+_events_adapter = TypeAdapter(List[EventMention])
+_TOTAL = struct.Struct("!q")
+
+
+@dataclass
+class SearchResult:
+    """Events returned for a query plus the provider-reported total."""
+    events: List[EventMention]
+    total: int
+
+
+def pack_result(result: SearchResult) -> bytes:
+    """Compact encoding of a SearchResult for the shared cache tier."""
+    return _TOTAL.pack(result.total) + pack_events(result.events)
+
+
+def unpack_result(data: bytes) -> SearchResult:
+    (total,) = _TOTAL.unpack_from(data)
+    return SearchResult(events=unpack_events(data[_TOTAL.size:]), total=total)
+
+
+def derive_entry(entry: CacheEntry, events: List[EventMention], total: int, variant: str) -> CacheEntry:
+    """
+    An entry computed from a cached one (filtered or sliced): same freshness,
+    and a version that changes with the source entry and the variant.
+    """
+    return CacheEntry(
+        value=SearchResult(events=events, total=total),
+        version=content_version(f"{entry.version}:{variant}".encode()),
+        stored_at=entry.stored_at,
+        expires_at=entry.expires_at
+    )
+
+
+def is_complete(query: SearchQuery, result: SearchResult) -> bool:
+    """True when ``result`` holds every match of a date search (first page, not cut off by ``limit``)."""
+    return isinstance(query, EventSearchQuery) and query.page == 0 and len(result.events) < query.limit
+
+
+class SearchCache:
+    """
+    Holds search results with a content version used for HTTP validators.
+
+    Only non-empty results are stored; an empty result still gets a version
+    (so it can be revalidated) but expires immediately.
+
+    With ``subsume`` on, a date search missing from the cache can be answered
+    from a complete cached result of a broader search (no city, or no
+    category) for the same date and country, by filtering its events. An
+    empty filtered result is not used, since upstream the search would fall
+    back to the next provider.
+    Category filters are only applied locally for ``subsumable_categories``,
+    the categories whose provider classification is reflected in
+    ``EventMention.category``.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 1024,
+        l2: Optional[CacheBackend] = None,
+        subsume: bool = False,
+        subsumable_categories: Iterable[str] = ()
+    ):
+        self._cache = TieredCache(
+            "search",
+            ttl=ttl,
+            encode=pack_result,
+            decode=unpack_result,
+            max_entries=max_entries,
+            l2=l2
+        )
+        self.subsume = subsume
+        self.subsumable_categories = {canonical_category(c) for c in subsumable_categories if c.strip()}
+        self.max_entries = max_entries
+        # Complete broad date searches in this process, by (date, country): cache key -> query
+        self._complete: Dict[Tuple[str, str], Dict[str, EventSearchQuery]] = {}
+        self.subsumed_hits = 0
+
+    @staticmethod
+    def key(query: SearchQuery) -> str:
+        """Cache key of ``query``'s canonical form, so differently spelled queries share an entry."""
+        return json.dumps((type(query).__name__,) + key_fields(query), separators=(",", ":"))
+
+    @staticmethod
+    def _query_of(key: str) -> Optional[SearchQuery]:
+        kind, *fields = json.loads(key)
+        if kind == EventSearchQuery.__name__:
+            return EventSearchQuery(*fields)
+        if kind == ArtistSearchQuery.__name__:
+            return ArtistSearchQuery(*fields)
+        return None
+
+    def cached_locally(self, query: SearchQuery) -> bool:
+        """Whether ``query`` has a fresh entry in this process (no L2 or subsumption lookup)."""
+        return self._cache.get_local(self.key(query)) is not None
+
+    async def get(self, query: SearchQuery) -> Optional[CacheEntry]:
+        entry = await self._cache.get(self.key(query))
+        if entry is None and self.subsume and isinstance(query, EventSearchQuery):
+            entry = await self._get_subsumed(query)
+        return entry
+
+    async def put(self, query: SearchQuery, events: List[EventMention], total: int) -> CacheEntry:
+        """Store a result and return its entry."""
+        result = SearchResult(events=events, total=total)
+        version = content_version(_events_adapter.dump_json(events) + str(total).encode())
+        if not events:
+            now = time.time()
+            return CacheEntry(value=result, version=version, stored_at=now, expires_at=now)
+        key = self.key(query)
+        entry = await self._cache.set(key, result, version=version)
+        self._index(key, query, result)
+        return entry
+
+    def _index(self, key: str, query: SearchQuery, result: SearchResult) -> None:
+        """Remember a complete broad result as a candidate for answering narrower searches."""
+        if not self.subsume or not is_complete(query, result) or (query.city and query.category):
+            return
+        bucket = self._complete.setdefault((query.date, query.country_code.upper()), {})
+        bucket[key] = query
+        if sum(len(b) for b in self._complete.values()) > self.max_entries:
+            # Forget entries evicted from L1 (their L2 copies may outlive them, but stay reachable by key)
+            for date_country in list(self._complete):
+                kept = {k: q for k, q in self._complete[date_country].items() if self._cache.get_local(k) is not None}
+                if kept:
+                    self._complete[date_country] = kept
+                else:
+                    del self._complete[date_country]
+
+    def _covers(self, broad: EventSearchQuery, query: EventSearchQuery) -> bool:
+        if broad.city and (not query.city or city_key(broad.city) != city_key(query.city)):
+            return False
+        if broad.category:
+            return canonical_category(broad.category) == canonical_category(query.category)
+        return not query.category or canonical_category(query.category) in self.subsumable_categories
+
+    @staticmethod
+    def _matches(event: EventMention, broad: EventSearchQuery, query: EventSearchQuery) -> bool:
+        if not broad.city and query.city and city_key(event.city) != city_key(query.city):
+            return False
+        if not broad.category and query.category:
+            # Provider classifications map onto API categories ("arts & theatre" -> "arts")
+            return canonical_category(event.category) == canonical_category(query.category)
+        return True
+
+    async def _get_subsumed(self, query: EventSearchQuery) -> Optional[CacheEntry]:
+        """Answer ``query`` by filtering a cached complete result of a broader search."""
+        bucket = self._complete.get((query.date, query.country_code.upper()))
+        for key, broad in list((bucket or {}).items()):
+            if not self._covers(broad, query):
+                continue
+            entry = await self._cache.get(key)
+            if entry is None:
+                del bucket[key]
+                continue
+            matches = [e for e in entry.value.events if self._matches(e, broad, query)]
+            events = matches[query.page * query.limit:(query.page + 1) * query.limit]
+            if not events:
+                # Upstream, an empty primary result falls back to the next provider
+                return None
+            self.subsumed_hits += 1
+            return derive_entry(entry, events, len(events), self.key(query))
+        return None
+
+    def clear(self) -> None:
+        """Drop locally cached results."""
+        self._cache.clear_local()
+        self._complete.clear()
+
+    def dump(self) -> List[Tuple[str, bytes]]:
+        return self._cache.dump_local()
+
+    def load(self, items: List[Tuple[str, bytes]]) -> int:
+        loaded = self._cache.load_local(items)
+        if self.subsume:
+            for key, _ in items:
+                entry = self._cache.get_local(key)
+                query = self._query_of(key) if entry is not None else None
+                if query is not None:
+                    self._index(key, query, entry.value)
+        return loaded
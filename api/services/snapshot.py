@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Binary snapshots of the event store and caches for warm starts.
+
+Layout::
+
+    magic (8) | header: created_at, index offset, index length
+    event block 0 | event block 1 | ... | cache payloads ...
+    index (zlib JSON): block offsets, event IDs per block, cache entry offsets
+
+Event blocks are ``pack_events`` payloads of up to ``block_size`` events,
+so they carry the codec's schema fingerprint. Cache payloads are the
+``TieredCache`` L2 encoding. Opening a snapshot memory-maps the file and
+reads only the index. A block is decoded the first time one of its events
+is needed.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from api.models.event import EventMention
+from api.services.codec import pack_events, unpack_events
+
+_MAGIC = b"EPSNAP1\n"
+_HEADER = struct.Struct("!dQQ")
+
+# Encoded cache entries by cache name, as produced by TieredCache.dump_local
+CacheDump = Dict[str, List[Tuple[str, bytes]]]
+
+
+def write_snapshot(path: str, events: Iterable[EventMention], caches: CacheDump, block_size: int = 64) -> int:
+    """
+    Write a snapshot atomically (temp file, then rename); returns its size in bytes.
+
+    Safe to run in a worker thread given lists that are not mutated meanwhile.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC + _HEADER.pack(0.0, 0, 0))
+            offset = f.tell()
+            blocks, ids, block = [], [], []
+
+            def flush() -> None:
+                nonlocal offset
+                payload = pack_events(block)
+                f.write(payload)
+                blocks.append((offset, len(payload)))
+                ids.append([e.id for e in block])
+                offset += len(payload)
+                block.clear()
+
+            for event in events:
+                block.append(event)
+                if len(block) >= block_size:
+                    flush()
+            if block:
+                flush()
+
+            cache_index = {}
+            for name, items in caches.items():
+                entries = []
+                for key, payload in items:
+                    f.write(payload)
+                    entries.append((key, offset, len(payload)))
+                    offset += len(payload)
+                cache_index[name] = entries
+
+            index = zlib.compress(
+                json.dumps({"blocks": blocks, "ids": ids, "caches": cache_index}, separators=(",", ":")).encode(), 1
+            )
+            f.write(index)
+            f.seek(len(_MAGIC))
+            f.write(_HEADER.pack(time.time(), offset, len(index)))
+            size = offset + len(index)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return size
+
+
+class EventSnapshot:
+    """
+    Read side of a snapshot: an index in memory, event blocks decoded lazily.
+
+    Decoded blocks are kept in a small LRU, so lookups of neighbouring events
+    (stored together, e.g. from one search) decode their block once.
+    """
+
+    def __init__(self, path: str, cached_blocks: int = 64):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f"{path} is not an event snapshot")
+            self.created_at, index_offset, index_length = _HEADER.unpack_from(self._map, len(_MAGIC))
+            index = json.loads(zlib.decompress(self._map[index_offset:index_offset + index_length]))
+        except (ValueError, struct.error, zlib.error) as e:
+            self.close()
+            raise ValueError(f"Unreadable snapshot {path}: {e}") from e
+        self._blocks: List[Tuple[int, int]] = [tuple(b) for b in index["blocks"]]
+        self._block_of: Dict[str, int] = {
+            event_id: n for n, block_ids in enumerate(index["ids"]) for event_id in block_ids
+        }
+        self._caches: Dict[str, List[Tuple[str, int, int]]] = index["caches"]
+        self._decoded: "OrderedDict[int, Dict[str, EventMention]]" = OrderedDict()
+        self.cached_blocks = cached_blocks
+
+    def __len__(self) -> int:
+        return len(self._block_of)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._block_of
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def _block(self, n: int) -> Dict[str, EventMention]:
+        events = self._decoded.get(n)
+        if events is None:
+            offset, length = self._blocks[n]
+            events = {e.id: e for e in unpack_events(self._map[offset:offset + length])}
+            self._decoded[n] = events
+            while len(self._decoded) > self.cached_blocks:
+                self._decoded.popitem(last=False)
+        self._decoded.move_to_end(n)
+        return events
+
+    def get(self, event_id: str) -> Optional[EventMention]:
+        n = self._block_of.get(event_id)
+        return None if n is None else self._block(n).get(event_id)
+
+    def get_many(self, event_ids: Iterable[str]) -> Dict[str, EventMention]:
+        found = {}
+        for event_id in event_ids:
+            event = self.get(event_id)
+            if event is not None:
+                found[event_id] = event
+        return found
+
+    def blocks(self) -> Iterator[List[EventMention]]:
+        """Every stored event, one decoded block at a time (not kept in the LRU)."""
+        for offset, length in self._blocks:
+            yield unpack_events(self._map[offset:offset + length])
+
+    def cache_items(self, name: str) -> List[Tuple[str, bytes]]:
+        return [(key, self._map[offset:offset + length]) for key, offset, length in self._caches.get(name, [])]
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Server-Sent Events framing."""
+import json
+from typing import Any, Optional
+
+# Disable proxy buffering so frames reach the browser as they are written
+SSE_HEADERS = {
+    "Cache-Control": "no-store",
+    "X-Accel-Buffering": "no"
+}
+
+# Comment frame sent on idle streams so proxies keep the connection open
+KEEPALIVE = b": keepalive\n\n"
+
+
+def sse_frame(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """Encode one SSE frame with a JSON payload."""
+    return sse_frame_bytes(event, json.dumps(data, separators=(",", ":")).encode(), event_id)
+
+
+def sse_frame_bytes(event: str, data: bytes, event_id: Optional[str] = None) -> bytes:
+    """Encode one SSE frame around an already-encoded single-line JSON payload."""
+    head = f"event: {event}\ndata: " if event_id is None else f"id: {event_id}\nevent: {event}\ndata: "
+    return head.encode() + data + b"\n\n"
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Event store used for package lookups."""
+import asyncio
+import logging
+import time
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional
+
+from api.models.event import EventMention
+from api.services.cache import CacheBackend, content_version
+from api.services.codec import pack_events, unpack_events
+from api.services.snapshot import EventSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Called with the IDs of events that were added, changed or dropped locally
+ChangeListener = Callable[[List[str]], None]
+# Called with every event passed to upsert_many (fresh provider data, changed or not)
+RefreshListener = Callable[[List[EventMention]], None]
+
+
+class EventStore(MutableMapping):
+    """
+    Events by ID: an in-process dict (L1) with an optional shared L2.
+
+    Behaves like the plain dict it replaces for synchronous access; the async
+    ``fetch``/``upsert_many`` methods also consult and update the shared tier,
+    so an event found by one worker can be packaged by another.
+
+    Change listeners hear about local additions, content changes and removals
+    (including removals caused by another worker's write), so data derived
+    from an event can be rebuilt or dropped. Unchanged events keep their
+    object identity across upserts.
+
+    After a restart, an attached snapshot serves as a last-resort tier for
+    ``fetch`` until ``hydrate`` has copied it into L1. ``load`` merges other
+    snapshots, such as ingested feeds, and can update events from them.
+    """
+
+    def __init__(self, l2: Optional[CacheBackend] = None, ttl: float = 86400):
+        self._events: Dict[str, EventMention] = {}
+        # When each event was last passed to upsert_many (fresh provider data)
+        self._refreshed_at: Dict[str, float] = {}
+        self._l2 = l2
+        self.ttl = ttl
+        self._change_listeners: List[ChangeListener] = []
+        self._refresh_listeners: List[RefreshListener] = []
+        self._snapshot: Optional[EventSnapshot] = None
+        # True while load() notifies listeners of restored (not fresh) events
+        self.restoring = False
+        if l2 is not None:
+            l2.add_invalidation_listener(self._on_invalidate)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        self._change_listeners.append(listener)
+
+    def add_refresh_listener(self, listener: RefreshListener) -> None:
+        self._refresh_listeners.append(listener)
+
+    def _notify(self, event_ids: List[str]) -> None:
+        if not event_ids:
+            return
+        for listener in self._change_listeners:
+            try:
+                listener(event_ids)
+            except Exception as e:
+                logger.error(f"Event change listener failed: {e}")
+
+    # MutableMapping interface (L1 only)
+    def __getitem__(self, event_id: str) -> EventMention:
+        return self._events[event_id]
+
+    def __setitem__(self, event_id: str, event: EventMention) -> None:
+        if self._events.get(event_id) != event:
+            self._events[event_id] = event
+            self._notify([event_id])
+
+    def __delitem__(self, event_id: str) -> None:
+        del self._events[event_id]
+        self._refreshed_at.pop(event_id, None)
+        self._notify([event_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @staticmethod
+    def _l2_key(event_id: str) -> str:
+        return f"event:{event_id}"
+
+    def _on_invalidate(self, l2_key: str, version: Optional[str] = None) -> None:
+        if l2_key.startswith("event:"):
+            event_id = l2_key[len("event:"):]
+            event = self._events.get(event_id)
+            if event is None:
+                return
+            if version is not None and version == content_version(pack_events([event])):
+                # Another worker stored the same content; the local copy is current
+                return
+            del self._events[event_id]
+            self._refreshed_at.pop(event_id, None)
+            self._notify([event_id])
+
+    async def fetch(self, event_id: str) -> Optional[EventMention]:
+        """Return an event from L1, falling back to the shared tier."""
+        return (await self.fetch_many([event_id])).get(event_id)
+
+    async def fetch_many(self, event_ids: List[str]) -> Dict[str, EventMention]:
+        """Batched lookup: L1 hits first, then one L2 round trip, then the snapshot."""
+        found = {i: self._events[i] for i in event_ids if i in self._events}
+        missing = [i for i in event_ids if i not in found]
+        if missing and self._l2 is not None:
+            await self._fetch_l2(missing, found)
+            missing = [i for i in missing if i not in found]
+        if missing and self._snapshot is not None:
+            for event_id, event in self._snapshot.get_many(missing).items():
+                self._events[event_id] = event
+                found[event_id] = event
+        return found
+
+    async def _fetch_l2(self, event_ids: List[str], found: Dict[str, EventMention]) -> None:
+        try:
+            payloads = await self._l2.get_many([self._l2_key(i) for i in event_ids])
+        except Exception as e:
+            logger.error(f"L2 event read failed: {e}")
+            return
+        for event_id, payload in zip(event_ids, payloads):
+            if payload is None:
+                continue
+            try:
+                event = unpack_events(payload)[0]
+            except (ValueError, IndexError) as e:
+                logger.warning(f"Ignoring undecodable event {event_id}: {e}")
+                continue
+            self._events[event_id] = event
+            found[event_id] = event
+
+    @property
+    def hydrating(self) -> bool:
+        """Whether some events may still exist only in the attached snapshot."""
+        return self._snapshot is not None
+
+    def local_events(self) -> List[EventMention]:
+        return list(self._events.values())
+
+    def attach_snapshot(self, snapshot: EventSnapshot) -> None:
+        """Serve events from ``snapshot`` when neither L1 nor L2 has them."""
+        self._snapshot = snapshot
+
+    async def hydrate(self) -> int:
+        """
+        Copy the attached snapshot into L1 (see ``load``), then detach it.
+        Returns the number of events added.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return 0
+        try:
+            return await self.load(snapshot)
+        finally:
+            if self._snapshot is snapshot:
+                self._snapshot = None
+            snapshot.close()
+
+    async def load(self, snapshot: EventSnapshot, replace: bool = False) -> int:
+        """
+        Copy a snapshot's events into L1 one block at a time, yielding between
+        blocks. Listeners hear about every stored block, with ``restoring`` set
+        so they can skip work meant for fresh data. Returns the number stored.
+
+        Without ``replace`` (warm starts) events already in L1 are newer and
+        kept. With it (feeds) an L1 event whose content differs is replaced,
+        unless a provider refreshed it after the snapshot was written.
+        """
+        stored = 0
+        for events in snapshot.blocks():
+            changed = []
+            for event in events:
+                current = self._events.get(event.id)
+                if current is not None and (
+                    not replace
+                    or current == event
+                    or self._refreshed_at.get(event.id, 0.0) > snapshot.created_at
+                ):
+                    continue
+                self._events[event.id] = event
+                changed.append(event.id)
+            self.restoring = True
+            try:
+                self._notify(changed)
+            finally:
+                self.restoring = False
+            stored += len(changed)
+            await asyncio.sleep(0)
+        return stored
+
+    async def upsert_many(self, events: List[EventMention]) -> None:
+        """Store events locally and write the changed ones through to the shared tier."""
+        changed = []
+        now = time.time()
+        for event in events:
+            self._refreshed_at[event.id] = now
+            if self._events.get(event.id) != event:
+                self._events[event.id] = event
+                changed.append(event)
+        self._notify([event.id for event in changed])
+        for listener in self._refresh_listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                logger.error(f"Event refresh listener failed: {e}")
+        await self.publish_many(changed)
+
+    async def publish_many(self, events: List[EventMention]) -> None:
+        """
+        Write events to the shared tier only.
+
+        For bulk loads that should reach every worker without growing this
+        process; a no-op without a shared tier.
+        """
+        if self._l2 is None or not events:
+            return
+        try:
+            await self._l2.set_many({
+                self._l2_key(event.id): (pack_events([event]), self.ttl)
+                for event in events
+            })
+        except Exception as e:
+            logger.error(f"L2 event write failed: {e}")
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Prefix index of event names, venues and cities for autocomplete."""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from api.models.event import EventMention
+from api.services.store import EventStore
+
+_NON_WORD = re.compile(r"[^\w]+")
+_NO_BOUND = float("-inf")
+
+# Weight of an event without a popularity score
+DEFAULT_POPULARITY = 0.1
+# Word starts indexed per term ("ed sheeran tour" -> "ed ...", "sheeran ...", "tour")
+MAX_WORD_STARTS = 6
+# Prefixes up to this long whose range holds over CACHE_RANGE_OVER keys have
+# their top results cached; longer prefixes match few keys and are scanned
+CACHE_PREFIX_LEN = 4
+CACHE_RANGE_OVER = 64
+# Batches adding/removing more terms than this re-sort the key list once
+BATCH_MERGE_OVER = 256
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and collapse punctuation/whitespace to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", stripped).split())
+
+
+class Term:
+    """A suggestible string, weighted by the popularity of the events naming it."""
+
+    __slots__ = ("text", "key", "kind", "weight", "events", "keyed")
+
+    def __init__(self, text: str, key: str, kind: str):
+        self.text = text
+        self.key = key
+        self.kind = kind
+        self.weight = 0.0
+        self.events = 0
+        self.keyed = False  # Whether its keys are in the sorted key list
+
+
+def _rank(term: Term) -> Tuple[float, str]:
+    return -term.weight, term.text
+
+
+class _TopList:
+    """
+    Cached best terms under one prefix, best first.
+
+    ``bound`` is an upper bound on the weight of any matching term left out
+    of ``terms``, so the leading terms weighing at least ``bound`` are exact.
+    """
+
+    __slots__ = ("terms", "bound")
+
+    def __init__(self, terms: List[Term], bound: float):
+        self.terms = terms
+        self.bound = bound
+
+    def exact(self, limit: int) -> Optional[List[Term]]:
+        """The best ``limit`` terms, or None if terms outside the list might rank among them."""
+        top = self.terms[:limit]
+        if len(top) < limit and self.bound > _NO_BOUND:
+            return None
+        if top and top[-1].weight < self.bound:
+            return None
+        return top
+
+    def update(self, term: Term, size: int) -> None:
+        """Re-rank a term whose weight changed (or that appeared/disappeared)."""
+        if term in self.terms:
+            self.terms.remove(term)
+        if term.events <= 0:
+            return
+        insort(self.terms, term, key=_rank)
+        if len(self.terms) > size:
+            self.bound = max(self.bound, self.terms.pop().weight)
+
+
+class SuggestIndex:
+    """
+    Popularity-weighted top-k prefix lookup over event names, venues and cities.
+
+    Keys (every word start of a normalized term) live in one sorted list, so a
+    prefix is a contiguous range found with two binary searches. A term's
+    weight is the summed popularity of the stored events naming it.
+
+    The index follows event store changes: only added, changed or dropped
+    events are re-indexed, and a large batch is merged into the key list with
+    one sort. The best terms under short prefixes (whose ranges are long) are
+    cached and re-ranked in place as weights change; a cached list is only
+    rebuilt once terms that left it could outrank what it still holds.
+    """
+
+    KINDS = ("event", "venue", "city")
+
+    def __init__(self, store: EventStore, max_results: int = 20):
+        self._store = store
+        self.max_results = max_results
+        self._keys: List[str] = []
+        self._key_terms: List[Term] = []
+        self._terms: Dict[Tuple[str, str], Term] = {}
+        # Per event: the terms it contributed to and its weight
+        self._contributions: Dict[str, Tuple[List[Term], float]] = {}
+        self._top: Dict[Tuple[Optional[str], str], _TopList] = {}
+        self.on_change(list(store))
+        store.add_change_listener(self.on_change)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def on_change(self, event_ids: List[str]) -> None:
+        """Re-index events the store added, changed or dropped."""
+        touched: Dict[int, Term] = {}
+        for event_id in event_ids:
+            for term in self._remove(event_id):
+                touched[id(term)] = term
+            event = self._store.get(event_id)
+            if event is not None:
+                for term in self._add(event_id, event):
+                    touched[id(term)] = term
+
+        added, removed = [], []
+        for term in touched.values():
+            if term.events <= 0:
+                del self._terms[(term.kind, term.key)]
+                if term.keyed:
+                    removed.append(term)
+            elif not term.keyed:
+                added.append(term)
+        self._update_keys(added, removed)
+        if self._top:
+            for term in touched.values():
+                self._update_top(term)
+
+    @staticmethod
+    def _weight(event: EventMention) -> float:
+        value = event.scores.get("popularity") if isinstance(event.scores, dict) else None
+        try:
+            return max(float(value), DEFAULT_POPULARITY) if value is not None else DEFAULT_POPULARITY
+        except (TypeError, ValueError):
+            return DEFAULT_POPULARITY
+
+    def _add(self, event_id: str, event: EventMention) -> List[Term]:
+        weight = self._weight(event)
+        terms = []
+        for kind, text in zip(self.KINDS, (event.text, event.venue_name, event.city)):
+            text = " ".join((text or "").split())
+            normalized = normalize(text)
+            if not normalized:
+                continue
+            term = self._terms.get((kind, normalized))
+            if term is None:
+                term = self._terms[(kind, normalized)] = Term(text, normalized, kind)
+            term.weight += weight
+            term.events += 1
+            terms.append(term)
+        self._contributions[event_id] = (terms, weight)
+        return terms
+
+    def _remove(self, event_id: str) -> List[Term]:
+        terms, weight = self._contributions.pop(event_id, ([], 0.0))
+        for term in terms:
+            term.weight -= weight
+            term.events -= 1
+        return terms
+
+    @staticmethod
+    def _word_starts(normalized: str) -> List[str]:
+        words = normalized.split(" ")
+        return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_STARTS))]
+
+    def _update_keys(self, added: List[Term], removed: List[Term]) -> None:
+        """Insert the keys of new terms and delete those of terms no event names any more."""
+        for term in added:
+            term.keyed = True
+        for term in removed:
+            term.keyed = False
+
+        if len(added) + len(removed) > BATCH_MERGE_OVER:
+            pairs = [(key, term) for key, term in zip(self._keys, self._key_terms) if term.keyed]
+            pairs.extend((key, term) for term in added for key in self._word_starts(term.key))
+            pairs.sort(key=itemgetter(0))
+            self._keys = [key for key, _ in pairs]
+            self._key_terms = [term for _, term in pairs]
+            return
+
+        for term in removed:
+            for key in self._word_starts(term.key):
+                i = bisect_left(self._keys, key)
+                while i < len(self._keys) and self._keys[i] == key:
+                    if self._key_terms[i] is term:
+                        del self._keys[i]
+                        del self._key_terms[i]
+                        break
+                    i += 1
+        for term in added:
+            for key in self._word_starts(term.key):
+                i = bisect_right(self._keys, key)
+                self._keys.insert(i, key)
+                self._key_terms.insert(i, term)
+
+    def _update_top(self, term: Term) -> None:
+        """Re-rank a changed term in the cached lists of every prefix it falls under."""
+        prefixes = {
+            key[:end]
+            for key in self._word_starts(term.key)
+            for end in range(1, min(len(key), CACHE_PREFIX_LEN) + 1)
+        }
+        for prefix in prefixes:
+            for kind in (None, term.kind):
+                top = self._top.get((kind, prefix))
+                if top is not None:
+                    top.update(term, self.max_results)
+
+    def suggest(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Term]:
+        """Highest-weighted terms with a word starting with ``query`` (ties alphabetical)."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        cached = self._top.get((kind, prefix))
+        if cached is not None:
+            top = cached.exact(limit)
+            if top is not None:
+                return top
+
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        matches = {id(t): t for t in self._key_terms[lo:hi] if kind is None or t.kind == kind}
+        ranked = heapq.nsmallest(self.max_results + 1, matches.values(), key=_rank)
+        bound = ranked.pop().weight if len(ranked) > self.max_results else _NO_BOUND
+        if len(prefix) <= CACHE_PREFIX_LEN and hi - lo > CACHE_RANGE_OVER:
+            self._top[(kind, prefix)] = _TopList(ranked, bound)
+        return ranked[:limit]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._key_terms.clear()
+        self._terms.clear()
+        self._contributions.clear()
+        self._top.clear()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Lightweight per-request tracing.
+
+Spans are recorded against a trace stored in a context variable, so any code
+running inside a request (routes, MultiCollector, collectors) can time a stage
+with ``with span("name"):`` without threading a tracer object through every
+call. When the current request is not sampled, ``span()`` is a no-op.
+"""
+import random
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from api import config
+
+
+@dataclass
+class Span:
+    """A single timed stage of a request."""
+    name: str
+    start_ms: float  # Offset from the start of the trace
+    duration_ms: float
+    attrs: dict = field(default_factory=dict)
+
+
+class Trace:
+    """Collects spans for one request."""
+
+    def __init__(self, path: str, debug: bool = False):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.path = path
+        self.debug = debug
+        self.spans: List[Span] = []
+        self.total_ms: Optional[float] = None
+        self._started = time.perf_counter()
+
+    def add(self, name: str, started: float, ended: float, attrs: Optional[dict] = None) -> None:
+        """Record a span from two ``perf_counter()`` readings."""
+        self.spans.append(Span(
+            name=name,
+            start_ms=(started - self._started) * 1000,
+            duration_ms=(ended - started) * 1000,
+            attrs=attrs or {}
+        ))
+
+    def finish(self) -> None:
+        """Freeze the total request duration (idempotent)."""
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self._started) * 1000
+
+    def server_timing(self) -> str:
+        """
+        Render the trace as a Server-Timing header value.
+
+        Spans sharing a name are summed, so e.g. several Ticketmaster calls
+        show up as one ``ticketmaster.http`` entry with a count.
+        """
+        totals: Dict[str, List[float]] = {}
+        for s in self.spans:
+            entry = totals.setdefault(s.name, [0.0, 0])
+            entry[0] += s.duration_ms
+            entry[1] += 1
+
+        parts = []
+        for name, (duration, count) in totals.items():
+            metric = f"{name};dur={duration:.1f}"
+            if count > 1:
+                metric += f';desc="x{count}"'
+            parts.append(metric)
+        self.finish()
+        parts.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly representation for the debug endpoint."""
+        return {
+            "trace_id": self.trace_id,
+            "path": self.path,
+            "total_ms": round(self.total_ms, 3) if self.total_ms is not None else None,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ms": round(s.start_ms, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                    **({"attrs": s.attrs} if s.attrs else {})
+                }
+                for s in sorted(self.spans, key=lambda s: s.start_ms)
+            ]
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("eventpulse_trace", default=None)
+
+# Recently finished debug traces, oldest first
+_recent_traces: "OrderedDict[str, Trace]" = OrderedDict()
+
+
+def start_trace(path: str, force: bool = False) -> Optional[Trace]:
+    """
+    Start a trace for a request if it is sampled.
+
+    ``force`` bypasses sampling (used for explicit debug requests) and marks
+    the trace for retention in the debug buffer.
+    """
+    if not force and random.random() >= config.TRACE_SAMPLE_RATE:
+        return None
+    return Trace(path, debug=force)
+
+
+def activate(trace: Trace) -> Token:
+    """Make ``trace`` the current trace for this context."""
+    return _current_trace.set(trace)
+
+
+def deactivate(token: Token) -> None:
+    """Restore the trace that was current before ``activate``."""
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the current request, if sampled."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the enclosed block as a span of the current trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter(), attrs)
+
+
+def record(trace: Trace) -> None:
+    """Keep a finished trace in the bounded debug buffer."""
+    _recent_traces[trace.trace_id] = trace
+    while len(_recent_traces) > config.TRACE_BUFFER_SIZE:
+        _recent_traces.popitem(last=False)
+
+
+def get_recorded(trace_id: str) -> Optional[Trace]:
+    """Look up a trace kept by ``record``."""
+    return _recent_traces.get(trace_id)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Live price/availability watching for events clients have open."""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from api.collectors.base import EventCollector
+from api.models.event import EventMention
+from api.services.deadline import Deadline, LatencyTracker, reset_provider_timeout, set_provider_timeout
+from api.services.store import EventStore
+
+logger = logging.getLogger(__name__)
+
+# Fields pushed to watchers when they change
+WATCHED_FIELDS = ("min_price", "max_price", "has_tickets")
+# Fields a poll refreshes in the store; the rest of a stored event is kept
+PRICE_FIELDS = ("price_range", "min_price", "max_price", "currency", "has_tickets")
+
+
+def diff_event(old: EventMention, new: EventMention) -> Dict[str, Any]:
+    """Watched fields whose value differs, mapped to the new value."""
+    changes = {}
+    for field in WATCHED_FIELDS:
+        value = getattr(new, field)
+        if getattr(old, field) != value:
+            changes[field] = value
+    return changes
+
+
+def watched_state(event: EventMention) -> Dict[str, Any]:
+    return {field: getattr(event, field) for field in WATCHED_FIELDS}
+
+
+class Subscription:
+    """One client's view of the watcher: its event IDs and a queue of changes."""
+
+    def __init__(self, event_ids: List[str], max_queued: int = 256):
+        self.event_ids = list(dict.fromkeys(event_ids))
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=max_queued)
+
+    def push(self, change: dict) -> None:
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # A stalled client loses its oldest change rather than holding memory
+            self.queue.get_nowait()
+            self.queue.put_nowait(change)
+
+
+class PriceWatcher:
+    """
+    Polls the union of watched events, never each client's set separately.
+
+    Every ``interval`` seconds the watched IDs are grouped by provider and
+    re-fetched in batches of ``batch_size`` through ``fetch_by_ids``. Watched
+    fields are diffed against the event store; refreshed events are written
+    back (rebuilding packages of changed ones) and only the changes are pushed
+    to the subscribers of each event. N clients on one event cost one upstream
+    lookup.
+
+    Each lookup is bounded by the provider's adaptive timeout from ``latency``
+    (shared with the search path, which also gets the watcher's samples), and
+    a whole poll by a deadline of one ``interval``, so a slow provider cannot
+    hold a poll past the next one.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        collectors: List[EventCollector],
+        interval: float = 30.0,
+        batch_size: int = 50,
+        latency: Optional[LatencyTracker] = None
+    ):
+        self._store = store
+        self._collectors = {c.name: c for c in collectors if c.name}
+        self.interval = interval
+        self.batch_size = batch_size
+        self.latency = latency or LatencyTracker()
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self.polls = 0
+        self.upstream_calls = 0
+
+    @property
+    def watched_ids(self) -> List[str]:
+        return list(self._subscribers)
+
+    def subscribe(self, event_ids: List[str]) -> Subscription:
+        subscription = Subscription(event_ids)
+        for event_id in subscription.event_ids:
+            self._subscribers[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for event_id in subscription.event_ids:
+            subscribers = self._subscribers.get(event_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[event_id]
+
+    def _batches(self) -> Dict[str, List[List[str]]]:
+        """Watched IDs of stored events, grouped by provider and chunked."""
+        by_provider: Dict[str, List[str]] = defaultdict(list)
+        for event_id in self._subscribers:
+            event = self._store.get(event_id)
+            if event is not None and event.provider in self._collectors:
+                by_provider[event.provider].append(event_id)
+        return {
+            provider: [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+            for provider, ids in by_provider.items()
+        }
+
+    async def poll_once(self) -> int:
+        """Refresh every watched event once; returns the number of events that changed."""
+        self.polls += 1
+        deadline = Deadline(self.interval)
+        calls = []
+        for provider, batches in self._batches().items():
+            calls.extend(self._fetch(provider, batch, deadline) for batch in batches)
+        self.upstream_calls += len(calls)
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        refreshed: List[EventMention] = []
+        changes: List[dict] = []
+        for result in results:
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning("Price watcher lookup timed out")
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"Price watcher lookup failed: {result}")
+                continue
+            for fresh in result:
+                stored = self._store.get(fresh.id)
+                if stored is None:
+                    continue
+                update = {f: getattr(fresh, f) for f in PRICE_FIELDS if getattr(stored, f) != getattr(fresh, f)}
+                refreshed.append(stored.model_copy(update=update) if update else stored)
+                diff = diff_event(stored, fresh)
+                if diff:
+                    changes.append({"id": fresh.id, "changes": diff})
+
+        # Unchanged events are passed too: they count as refreshes (price history)
+        if refreshed:
+            await self._store.upsert_many(refreshed)
+        for change in changes:
+            for subscription in self._subscribers.get(change["id"], ()):
+                subscription.push(change)
+        return len(changes)
+
+    async def _fetch(self, provider: str, event_ids: List[str], deadline: Deadline) -> List[EventMention]:
+        """One ``fetch_by_ids`` batch under the provider's timeout, recording its latency."""
+        timeout = min(self.latency.timeout_cap(provider), deadline.remaining())
+        token = set_provider_timeout(timeout)
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(self._collectors[provider].fetch_by_ids(event_ids), timeout=timeout)
+        finally:
+            self.latency.record(provider, time.monotonic() - started)
+            reset_provider_timeout(token)
+
+    async def run(self) -> None:
+        """Poll until cancelled; idle while nobody is watching."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._subscribers:
+                continue
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Price watcher poll failed: {e}")
+
+    def snapshot(self, subscription: Subscription) -> List[dict]:
+        """Current watched fields of a subscription's stored events."""
+        return [
+            {"id": event_id, "state": watched_state(event)}
+            for event_id in subscription.event_ids
+            if (event := self._store.get(event_id)) is not None
+        ]
+
+    async def next_change(self, subscription: Subscription, timeout: float) -> Optional[dict]:
+        """Wait up to ``timeout`` seconds for the next change (None on timeout)."""
+        try:
+            return await asyncio.wait_for(subscription.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
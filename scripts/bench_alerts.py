@@ -0,0 +1,66 @@
+"""
+Throughput benchmark for the price-alert engine.
+
+Registers one million alerts spread over 10,000 events, then applies a stream
+of price updates and reports registration time, memory, and updates/second
+(including delivery to an in-memory sink).
+
+    python scripts/bench_alerts.py [--alerts 1000000] [--events 10000] [--updates 100000]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Allow importing from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models.event import EventMention
+from api.services.alerts import AlertEngine, MemorySink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alert registration and evaluation")
+    parser.add_argument("--alerts", type=int, default=1_000_000, help="Registered alerts")
+    parser.add_argument("--events", type=int, default=10_000, help="Distinct events")
+    parser.add_argument("--updates", type=int, default=100_000, help="Price updates to apply")
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    gc.collect()
+    tracemalloc.start()
+    engine = AlertEngine(sink=MemorySink(max_items=args.alerts))
+    started = time.perf_counter()
+    for _ in range(args.alerts):
+        engine.add(f"event-{rng.randrange(args.events)}", round(rng.uniform(20, 200), 2), target="user")
+    register_time = time.perf_counter() - started
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Prices mostly drift above thresholds; occasional drops fire a handful of alerts
+    template = EventMention(id="x", text="x", url="x", timestamp="2025-01-01", venue_name="x", city="x")
+    updates = [
+        template.model_copy(update={
+            "id": f"event-{rng.randrange(args.events)}",
+            "min_price": rng.uniform(150, 400) if rng.random() < 0.95 else rng.uniform(20, 200)
+        })
+        for _ in range(args.updates)
+    ]
+    started = time.perf_counter()
+    for event in updates:
+        engine.on_refresh((event,))
+    update_time = time.perf_counter() - started
+
+    print(f"Alerts registered:   {args.alerts:,} over {args.events:,} events")
+    print(f"Registration:        {args.alerts / register_time:,.0f} alerts/s")
+    print(f"Memory:              {memory / 1e6:.1f} MB ({memory / args.alerts:.0f} B/alert)")
+    print(f"Updates:             {args.updates:,} in {update_time:.2f}s ({args.updates / update_time:,.0f} updates/s)")
+    print(f"Alerts fired:        {len(engine.sink.items):,} ({len(engine):,} still pending)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Memory/throughput benchmark for the price-history store.
+
+Appends one million (timestamp, min, max) samples - by default 1,000 events x
+1,000 refreshes with changing prices - and compares the memory held by
+PriceHistoryStore with the same samples kept as one object per sample.
+
+    python scripts/bench_price_history.py [--events 1000] [--samples 1000]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+# Allow importing from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models.event import EventMention
+from api.services.price_history import PriceHistoryStore
+
+
+@dataclass
+class PriceSampleObject:
+    timestamp: int
+    min_price: float
+    max_price: float
+
+
+def _price_walk(events: int, samples: int):
+    """Yield (step, [(event_id, min, max)]) with prices changing at every refresh."""
+    rng = random.Random(42)
+    prices = [[100.0 + i % 50, 300.0 + i % 80] for i in range(events)]
+    for step in range(samples):
+        batch = []
+        for i, price in enumerate(prices):
+            price[0] = round(max(10.0, price[0] + rng.uniform(-5, 5)), 2)
+            price[1] = round(max(price[0], price[1] + rng.uniform(-5, 5)), 2)
+            batch.append((f"event-{i}", price[0], price[1]))
+        yield step, batch
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price-history memory for N events x M samples")
+    parser.add_argument("--events", type=int, default=1000, help="Number of events")
+    parser.add_argument("--samples", type=int, default=1000, help="Refreshes per event")
+    args = parser.parse_args()
+    total = args.events * args.samples
+
+    # Event objects are created outside the measured region; only history is counted
+    template = EventMention(id="x", text="x", url="x", timestamp="2025-01-01", venue_name="x", city="x")
+    walk = [
+        (step, [template.model_copy(update={"id": i, "min_price": lo, "max_price": hi}) for i, lo, hi in batch])
+        for step, batch in _price_walk(args.events, args.samples)
+    ]
+    now = int(time.time()) - args.samples * 60
+
+    def build_store():
+        store = PriceHistoryStore(max_samples=args.samples)
+        for step, batch in walk:
+            store.record(batch, now=now + step * 60)
+        return store
+
+    def build_objects():
+        history = {}
+        for step, batch in walk:
+            for event in batch:
+                history.setdefault(event.id, []).append(
+                    PriceSampleObject(now + step * 60, event.min_price, event.max_price)
+                )
+        return history
+
+    store, store_bytes, store_time = _measure(build_store)
+    _, object_bytes, object_time = _measure(build_objects)
+
+    print(f"Samples:               {total:,} ({args.events:,} events x {args.samples:,})")
+    print(f"Stored samples:        {store.sample_count:,}")
+    print(f"PriceHistoryStore:     {store_bytes / 1e6:8.1f} MB  ({store_bytes / total:5.1f} B/sample, "
+          f"{total / store_time:,.0f} samples/s)")
+    print(f"  of which buffers:    {store.nbytes / 1e6:8.1f} MB")
+    print(f"Objects per sample:    {object_bytes / 1e6:8.1f} MB  ({object_bytes / total:5.1f} B/sample, "
+          f"{total / object_time:,.0f} samples/s)")
+    print(f"Reduction:             {object_bytes / store_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Warm-start benchmark for event store snapshots.
+
+Writes a snapshot of one million synthetic events, then measures what a
+restarting worker pays: opening the snapshot (index only), lazy lookups of
+random events, and hydrating every event into an EventStore in the
+background.
+
+    python scripts/bench_snapshot.py [--events 1000000] [--path /tmp/eventpulse.snap]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Allow importing from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models.event import EventMention
+from api.services.snapshot import EventSnapshot, write_snapshot
+from api.services.store import EventStore
+
+
+def _events(count: int):
+    rng = random.Random(3)
+    cities = ["New York", "London", "Tel Aviv", "Berlin", "Paris", "Chicago", "Madrid", "Rome"]
+    for i in range(count):
+        price = round(rng.uniform(20, 300), 2)
+        yield EventMention(
+            id=f"Z7r9jZ1A{i:08d}",
+            text=f"Artist {i % 5000} - World Tour",
+            url=f"https://www.ticketmaster.com/event/Z7r9jZ1A{i:08d}",
+            timestamp=f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            venue_name=f"Venue {i % 2000}",
+            city=cities[i % len(cities)],
+            category="music",
+            price_range=f"${price:.0f} - ${price * 3:.0f}",
+            min_price=price, max_price=price * 3, currency="USD",
+            scores={"popularity": rng.random()},
+            has_tickets=True
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot write, warm start and hydration")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Events in the snapshot")
+    parser.add_argument("--path", default="/tmp/eventpulse.snap", help="Snapshot file")
+    args = parser.parse_args()
+
+    events = list(_events(args.events))
+    started = time.perf_counter()
+    size = write_snapshot(args.path, events, {})
+    write_time = time.perf_counter() - started
+    del events
+
+    started = time.perf_counter()
+    snapshot = EventSnapshot(args.path)
+    store = EventStore()
+    store.attach_snapshot(snapshot)
+    open_time = time.perf_counter() - started
+
+    rng = random.Random(5)
+    ids = [f"Z7r9jZ1A{rng.randrange(args.events):08d}" for _ in range(1000)]
+    started = time.perf_counter()
+    for event_id in ids:
+        await store.fetch(event_id)
+    lookup_time = (time.perf_counter() - started) / len(ids)
+
+    started = time.perf_counter()
+    await store.hydrate()
+    hydrate_time = time.perf_counter() - started
+
+    print(f"Events:           {args.events:,}")
+    print(f"Snapshot:         {size / 1e6:.1f} MB ({size / args.events:.0f} B/event), written in {write_time:.1f}s")
+    print(f"Warm start:       {open_time:.2f}s (index loaded, events served lazily)")
+    print(f"Cold lookup:      {lookup_time * 1e3:.2f} ms/event (decodes its block)")
+    print(f"Full hydration:   {hydrate_time:.1f}s in the background ({len(store):,} events in L1)")
+    os.unlink(args.path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
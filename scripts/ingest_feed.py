@@ -0,0 +1,108 @@
+"""
+Load a Ticketmaster Discovery Feed file into the event store of every worker.
+
+Streams a JSON, NDJSON or CSV feed (optionally gzipped) from local disk,
+parses records with the same extraction as Discovery API responses, and
+writes them as a feed snapshot (--snapshot, default FEED_SNAPSHOT_PATH).
+API workers with the same FEED_SNAPSHOT_PATH merge a new snapshot into
+their event store within FEED_SNAPSHOT_INTERVAL seconds, so ingested
+events reach search-by-ID, the calendar, autocomplete and the resolver.
+With REDIS_URL set, the events are also written to the shared cache tier.
+Memory stays flat regardless of file size. Prints throughput as it goes.
+
+    python scripts/ingest_feed.py feed.json.gz [--snapshot PATH] [--format json] [--batch-size 1000] [--limit N] [--dry-run]
+
+--dry-run parses the whole file without writing anything (useful to
+validate a feed or measure parse throughput). Malformed records are
+skipped and counted.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+
+# Allow importing from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import config
+from api.services.cache import get_shared_backend
+from api.services.ingest import FORMATS, IngestStats, iter_feed_events
+from api.services.snapshot import EventSnapshot, write_snapshot
+from api.services.store import EventStore
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stream a Ticketmaster Discovery Feed file into the event store")
+    parser.add_argument("path", help="Feed file (.json, .ndjson/.jsonl or .csv, optionally .gz)")
+    parser.add_argument("--snapshot", default=config.FEED_SNAPSHOT_PATH,
+                        help="Feed snapshot the workers load (default: FEED_SNAPSHOT_PATH)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Override format detection")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Events per shared-tier write")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many records")
+    parser.add_argument("--dry-run", action="store_true", help="Parse only; do not write events")
+    args = parser.parse_args()
+
+    if not args.snapshot and not args.dry_run:
+        sys.exit("Pass --snapshot or set FEED_SNAPSHOT_PATH (or pass --dry-run)")
+
+    stats = IngestStats()
+    started = time.perf_counter()
+
+    def counted(events):
+        for event in events:
+            stats.events += 1
+            if stats.events % 50_000 == 0:
+                stats.seconds = time.perf_counter() - started
+                print(f"  {stats.events:,} events, {stats.rate:,.0f}/s, peak RSS {_peak_rss_mb():.0f} MB", flush=True)
+            yield event
+
+    events = counted(iter_feed_events(args.path, fmt=args.format, limit=args.limit, stats=stats))
+    if args.dry_run:
+        for _ in events:
+            pass
+        size = 0
+    else:
+        size = await asyncio.to_thread(write_snapshot, args.snapshot, events, {})
+    stats.seconds = time.perf_counter() - started
+
+    backend = get_shared_backend()
+    if backend is not None and not args.dry_run:
+        # Re-read the snapshot block by block, so memory stays flat here too
+        store = EventStore(l2=backend, ttl=config.EVENT_STORE_TTL)
+        snapshot = EventSnapshot(args.snapshot)
+        try:
+            batch = []
+            for block in snapshot.blocks():
+                batch.extend(block)
+                if len(batch) >= args.batch_size:
+                    await store.publish_many(batch)
+                    stats.batches += 1
+                    batch = []
+            if batch:
+                await store.publish_many(batch)
+                stats.batches += 1
+        finally:
+            snapshot.close()
+
+    print(f"Records read:   {stats.records:,} ({stats.skipped:,} skipped)")
+    if args.dry_run:
+        print(f"Events parsed:  {stats.events:,} (dry run)")
+    else:
+        print(f"Events stored:  {stats.events:,} in {args.snapshot} ({size / 1e6:,.1f} MB)")
+        if backend is not None:
+            print(f"Shared tier:    {stats.batches:,} batches")
+    print(f"File:           {os.path.getsize(args.path) / 1e6:,.1f} MB on disk")
+    print(f"Time:           {stats.seconds:.1f}s ({stats.rate:,.0f} events/s)")
+    print(f"Peak RSS:       {_peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Replay access logs against the search cache keying, raw versus canonical.
+
+Reads request lines (any log format containing the request path, e.g.
+nginx/uvicorn access logs) for /api/events and /api/events/by-artist, maps
+each to the query the API would look up, and simulates an LRU search cache
+with raw keys (the query as sent) and with canonical keys (city aliases,
+case/Unicode folding, category mapping, bucketed page windows). Prints the
+hit rate of both and the uplift. With timestamps in the log ([10/Oct/2026:
+13:55:36 +0000] or ISO 8601), entries also expire after --ttl seconds.
+
+    python scripts/replay_cache_keys.py access.log [--max-entries 1024] [--ttl 300]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import astuple
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Allow importing from parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import config
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.services.canonical import canonicalize
+from api.services.search_cache import SearchCache, SearchQuery
+
+_PATH = re.compile(r"(/api/events(?:/by-artist)?\?[^\s\"]+)")
+_CLF_TIME = re.compile(r"\[(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4})\]")
+_ISO_TIME = re.compile(r"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)")
+
+
+def _timestamp(line: str) -> Optional[float]:
+    match = _CLF_TIME.search(line)
+    if match:
+        return datetime.strptime(match.group(1), "%d/%b/%Y:%H:%M:%S %z").timestamp()
+    match = _ISO_TIME.search(line)
+    if match:
+        try:
+            return datetime.fromisoformat(match.group(1).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _query(path: str) -> Optional[SearchQuery]:
+    """The search-cache query a request looks up, or None for unparseable requests."""
+    url = urlsplit(path)
+    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+    try:
+        limit = int(params.get("limit", 20))
+        page = int(params.get("page", 0))
+        if url.path == "/api/events":
+            return EventSearchQuery(
+                date=params["date"],
+                city=params.get("city"),
+                category=params.get("category"),
+                limit=limit,
+                country_code=params.get("country_code", config.DEFAULT_COUNTRY_CODE),
+                page=page
+            )
+        if "cursor" in params:
+            return None
+        if (page + 1) * limit <= config.ARTIST_SNAPSHOT_WINDOW:
+            # Served from the artist snapshot window
+            limit, page = config.ARTIST_SNAPSHOT_WINDOW, 0
+        return ArtistSearchQuery(
+            artist=params["artist"],
+            date_from=params.get("date_from"),
+            date_to=params.get("date_to"),
+            country_code=params.get("country_code", "US"),
+            limit=limit,
+            page=page
+        )
+    except (KeyError, ValueError):
+        return None
+
+
+def _requests(path: str) -> Iterator[Tuple[Optional[float], SearchQuery]]:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = _PATH.search(line)
+            query = _query(match.group(1)) if match else None
+            if query is not None:
+                yield _timestamp(line), query
+
+
+class _LRU:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Optional[float]]" = OrderedDict()
+        self.hits = 0
+        self.keys = set()
+
+    def access(self, key: str, now: Optional[float]) -> None:
+        self.keys.add(key)
+        stored_at = self.entries.get(key, -1)
+        if stored_at != -1 and (now is None or stored_at is None or now - stored_at < self.ttl):
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return
+        self.entries[key] = now
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare search cache hit rates with raw and canonical keys")
+    parser.add_argument("log", help="Access log file")
+    parser.add_argument("--max-entries", type=int, default=config.SEARCH_CACHE_MAX_ENTRIES, help="Cache size")
+    parser.add_argument("--ttl", type=float, default=config.SEARCH_CACHE_TTL, help="Entry lifetime, seconds")
+    args = parser.parse_args()
+
+    raw = _LRU(args.max_entries, args.ttl)
+    canonical = _LRU(args.max_entries, args.ttl)
+    requests = 0
+    for now, query in _requests(args.log):
+        requests += 1
+        raw.access(json.dumps((type(query).__name__,) + astuple(query)), now)
+        canonical.access(SearchCache.key(canonicalize(query).query), now)
+
+    if not requests:
+        sys.exit("No /api/events or /api/events/by-artist requests found")
+    raw_rate, canonical_rate = raw.hits / requests, canonical.hits / requests
+    print(f"Requests:        {requests:,}")
+    print(f"Distinct keys:   {len(raw.keys):,} raw, {len(canonical.keys):,} canonical")
+    print(f"Hit rate raw:    {raw_rate:.1%}")
+    print(f"Hit rate canon.: {canonical_rate:.1%}")
+    uplift = f" ({canonical_rate / raw_rate - 1:+.0%} relative)" if raw_rate else ""
+    print(f"Uplift:          {(canonical_rate - raw_rate) * 100:+.1f} points{uplift}")
+
+
+if __name__ == "__main__":
+    main()
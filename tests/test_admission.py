@@ -0,0 +1,86 @@
+"""Tests for admission control."""
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.main import app
+from api.middleware.admission import AdmissionMiddleware, route_class
+from api.services.admission import AdmissionController, RouteLimit
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_and_prioritized():
+    controller = AdmissionController({"search": RouteLimit(max_concurrent=1, max_queue=2, max_wait=1.0)})
+    assert await controller.acquire("search")
+
+    low = asyncio.create_task(controller.acquire("search", priority=1))
+    high = asyncio.create_task(controller.acquire("search", priority=0))
+    await asyncio.sleep(0)
+    assert await controller.acquire("search") is False  # queue full
+    assert controller.snapshot()["search"]["queued"] == 2
+
+    controller.release("search")
+    assert await high and not low.done()
+    controller.release("search")
+    assert await low
+    controller.release("search")
+    stats = controller.snapshot()["search"]
+    assert (stats["active"], stats["queued"], stats["admitted"], stats["rejected"]) == (0, 0, 3, 1)
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_and_cancelled_waiters_leave():
+    controller = AdmissionController({"search": RouteLimit(max_concurrent=1, max_queue=5, max_wait=0.02)})
+    assert await controller.acquire("search")
+    assert await controller.acquire("search") is False
+    waiter = asyncio.create_task(controller.acquire("search"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    controller.release("search")
+    stats = controller.snapshot()["search"]
+    assert (stats["active"], stats["queued"], stats["timed_out"]) == (0, 0, 1)
+
+
+def test_route_classes():
+    assert route_class("/api/events") == "search"
+    assert route_class("/api/events/tm_1/package") == "search"
+    assert route_class("/api/events/stream") == "stream"
+    assert route_class("/api/events/calendar") is None
+    assert route_class("/api/suggest") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_retry_after():
+    release = asyncio.Event()
+    inner = FastAPI()
+
+    @inner.get("/api/events")
+    async def slow(date: str):
+        await release.wait()
+        return []
+
+    @inner.get("/api/suggest")
+    async def cheap():
+        return {"ok": True}
+
+    controller = AdmissionController({"search": RouteLimit(max_concurrent=1)})
+    shedding = AdmissionMiddleware(inner, controller, is_cached=lambda path, qs: "cached" in qs)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=shedding), base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/api/events?date=2026-05-01"))
+        await asyncio.sleep(0.05)
+        shed = await client.get("/api/events?date=2026-05-02")
+        assert shed.status_code == 503 and shed.headers["retry-after"] == "1"
+        assert (await client.get("/api/suggest")).status_code == 200
+        release.set()
+        assert (await client.get("/api/events?date=2026-05-01&cached=1")).status_code == 200
+        assert (await first).status_code == 200
+    assert controller.snapshot()["search"]["active"] == 0
+
+
+def test_admission_metrics_endpoint():
+    data = TestClient(app).get("/api/health/admission").json()
+    assert set(data["routes"]) == {"search", "stream"}
+    assert data["routes"]["search"]["active"] == 0
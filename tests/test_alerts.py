@@ -0,0 +1,125 @@
+"""Tests for the price-alert engine and routes."""
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.alerts import AlertEngine, AlertLimitError, MemorySink, alert_expiry
+
+client = TestClient(app)
+
+
+def _event(event_id: str, min_price) -> EventMention:
+    return EventMention(
+        id=event_id, text="Coldplay", url="https://www.ticketmaster.com/event/x", timestamp="2030-12-15",
+        venue_name="Venue", city="Tel Aviv", min_price=min_price, max_price=400.0
+    )
+
+
+def test_update_fires_matching_suffix_once():
+    sink = MemorySink()
+    engine = AlertEngine(sink=sink)
+    low = engine.add("e1", 100.0)
+    mid = engine.add("e1", 120.0, target="user-1")
+    high = engine.add("e1", 150.0)
+    other = engine.add("e2", 500.0)
+
+    engine.on_refresh([_event("e1", 130.0)])
+    assert [f.alert.id for f in sink.items] == [high.id]
+
+    engine.on_refresh([_event("e1", 120.0), _event("e3", 1.0)])
+    assert [f.alert.id for f in sink.items] == [high.id, mid.id]
+    assert sink.items[-1].price == 120.0 and sink.items[-1].alert.target == "user-1"
+
+    # Fired alerts are gone; the rest still wait
+    engine.on_refresh([_event("e1", 120.0)])
+    assert len(sink.items) == 2
+    assert engine.get(low.id) is not None and engine.get(other.id) is not None
+    assert len(engine) == 2
+
+
+def test_remove_with_duplicate_thresholds():
+    engine = AlertEngine(sink=MemorySink())
+    first = engine.add("e1", 100.0)
+    second = engine.add("e1", 100.0)
+    assert engine.remove(second.id)
+    assert not engine.remove(second.id)
+
+    engine.on_refresh([_event("e1", 99.0)])
+    assert [f.alert.id for f in engine.sink.items] == [first.id]
+    assert len(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_alert_routes_fire_from_store_refresh():
+    sink = MemorySink()
+    engine = events_routes._alert_engine
+    original_sink, engine.sink = engine.sink, sink
+    try:
+        await events_routes._events_cache.upsert_many([_event("alert-e1", 150.0)])
+        response = client.post("/api/alerts", json={"event_id": "alert-e1", "below": 120, "target": "u1"})
+        assert response.status_code == 201
+        alert_id = response.json()["id"]
+        assert client.get(f"/api/alerts/{alert_id}").json()["below"] == 120.0
+
+        await events_routes._events_cache.upsert_many([_event("alert-e1", 119.0)])
+        await events_routes._packages.drain()
+        assert [f.alert.id for f in sink.items] == [alert_id]
+        assert client.get(f"/api/alerts/{alert_id}").status_code == 404
+    finally:
+        engine.sink = original_sink
+
+
+@pytest.mark.asyncio
+async def test_delete_alert_and_validation():
+    await events_routes._events_cache.upsert_many([_event("alert-e2", 150.0)])
+    alert_id = client.post("/api/alerts", json={"event_id": "alert-e2", "below": 50}).json()["id"]
+    assert client.delete(f"/api/alerts/{alert_id}").status_code == 204
+    assert client.delete(f"/api/alerts/{alert_id}").status_code == 404
+    assert client.post("/api/alerts", json={"event_id": "alert-e2", "below": -1}).status_code == 422
+    assert client.post("/api/alerts", json={"event_id": "alert-unknown", "below": 50}).status_code == 404
+
+
+def test_caps_per_event_target_and_total():
+    engine = AlertEngine(sink=MemorySink(), max_alerts=4, max_per_event=2, max_per_target=2)
+    engine.add("e1", 100.0, target="u1")
+    engine.add("e1", 90.0)
+    with pytest.raises(AlertLimitError):
+        engine.add("e1", 80.0)
+    engine.add("e2", 100.0, target="u1")
+    with pytest.raises(AlertLimitError):
+        engine.add("e3", 100.0, target="u1")
+    engine.add("e3", 100.0, target="u2")
+    with pytest.raises(AlertLimitError):
+        engine.add("e4", 100.0)
+
+    # Firing releases the slots it held
+    engine.on_refresh([_event("e2", 50.0)])
+    engine.add("e4", 100.0, target="u1")
+
+
+@pytest.mark.asyncio
+async def test_route_returns_429_at_cap():
+    engine = events_routes._alert_engine
+    await events_routes._events_cache.upsert_many([_event("alert-e3", 150.0)])
+    original, engine.max_per_target = engine.max_per_target, 1
+    try:
+        first = client.post("/api/alerts", json={"event_id": "alert-e3", "below": 50, "target": "capped"})
+        assert first.status_code == 201
+        response = client.post("/api/alerts", json={"event_id": "alert-e3", "below": 60, "target": "capped"})
+        assert response.status_code == 429
+        engine.remove(first.json()["id"])
+    finally:
+        engine.max_per_target = original
+
+
+def test_alerts_expire_unfired():
+    engine = AlertEngine(sink=MemorySink())
+    expiring = engine.add("e1", 100.0, expires_at=3e9)
+    kept = engine.add("e1", 90.0, expires_at=5e9)
+    assert engine.expire(now=4e9) == 1
+    assert engine.get(expiring.id) is None and engine.get(kept.id) is not None
+
+    # Expiry is the end of the event's day, or the fallback age when undated
+    assert alert_expiry(_event("e1", 1.0), 60.0) == 1923609600.0
+    assert alert_expiry(_event("e1", 1.0).model_copy(update={"timestamp": "TBA"}), 60.0, now=10.0) == 70.0
@@ -0,0 +1,61 @@
+"""Tests for batch search."""
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.collectors.base import ArtistSearchQuery, EventSearchQuery
+from api.main import app
+from api.routes import events as events_routes
+from api.services.batch import plan_batch
+
+client = TestClient(app)
+
+
+def test_plan_dedupes_and_subsumes():
+    queries = [
+        EventSearchQuery(date="2026-05-01", city="Tel Aviv", limit=10),
+        EventSearchQuery(date="2026-05-01", city=" tel  AVIV", limit=10),
+        EventSearchQuery(date="2026-05-01", city="Tel Aviv", limit=10, page=1),
+        ArtistSearchQuery(artist="Coldplay"),
+        ArtistSearchQuery(artist="coldplay", limit=60, page=1),
+        ArtistSearchQuery(artist="Coldplay", limit=60, page=1),
+        EventSearchQuery(date="2026-05-02", city="Tel Aviv", limit=10),
+    ]
+    plan = plan_batch(queries)
+
+    # Tel Aviv pages 0 and 1 share one 20-event fetch
+    assert plan.fetches[0] == EventSearchQuery(date="2026-05-01", city="Tel Aviv", limit=20)
+    assert plan.slices[:3] == [(0, 0, 10), (0, 0, 10), (0, 10, 20)]
+    # 120 events would exceed the fetch cap, so each distinct artist page is fetched once
+    assert plan.fetches[1:3] == [queries[3], queries[4]]
+    assert plan.slices[3:6] == [(1, 0, 20), (2, 0, 60), (2, 0, 60)]
+    assert plan.slices[6] == (3, 0, 10) and len(plan.fetches) == 4
+
+
+def test_batch_endpoint_returns_results_in_order():
+    body = {"queries": [
+        {"date": "2031-08-01", "city": "Batch City"},
+        {"date": "2031-08-01", "city": "batch city", "limit": 1},
+        {"date": "2031-08-01", "city": "Batch City", "limit": 1, "page": 1},
+        {"artist": "Coldplay", "limit": 5},
+    ]}
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        with patch.object(events_routes._multi_collector, "search", wraps=events_routes._multi_collector.search) as search:
+            response = client.post("/api/events/search-batch", json=body)
+            assert search.call_count == 1
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["fetches"] == 2
+    first, second, third, artist = data["results"]
+    assert [e["id"] for e in first["events"]] == ["mock-1", "mock-2"] and first["status"] == "ok"
+    assert [e["id"] for e in second["events"]] == ["mock-1"] and second["shared_with"] == 0
+    assert [e["id"] for e in third["events"]] == ["mock-2"] and third["total"] == 1
+    assert artist["status"] == "ok" and artist["shared_with"] is None
+
+
+def test_batch_validation():
+    assert client.post("/api/events/search-batch", json={"queries": []}).status_code == 422
+    both = {"queries": [{"date": "2031-08-01", "artist": "Coldplay"}]}
+    assert client.post("/api/events/search-batch", json=both).status_code == 422
+    many = {"queries": [{"date": "2031-08-01", "city": f"C{i}"} for i in range(50)]}
+    assert client.post("/api/events/search-batch", json=many).status_code == 422
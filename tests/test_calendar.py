@@ -0,0 +1,75 @@
+"""Tests for the per-day event calendar."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.calendar import EventCalendar
+from api.services.store import EventStore
+
+client = TestClient(app)
+
+
+def _event(event_id: str, date: str, city: str = "Tel Aviv", category="music") -> EventMention:
+    return EventMention(
+        id=event_id, text=event_id, url="https://x", timestamp=date, venue_name="V", city=city, category=category
+    )
+
+
+@pytest.mark.asyncio
+async def test_counts_follow_store_changes():
+    store = EventStore()
+    store["seed"] = _event("seed", "2025-12-01")
+    calendar = EventCalendar(store)
+
+    await store.upsert_many([
+        _event("a", "2025-12-15"),
+        _event("b", "2025-12-15", category="Sports"),
+        _event("c", "2025-12-20", city=" tel  aviv "),
+        _event("d", "2026-01-02"),
+        _event("e", "TBA")
+    ])
+    assert calendar.month("Tel Aviv", "2025-12") == {
+        "2025-12-01": {"music": 1},
+        "2025-12-15": {"music": 1, "sports": 1},
+        "2025-12-20": {"music": 1}
+    }
+    assert calendar.month("tel aviv", "2025-12", category="sports") == {"2025-12-15": {"sports": 1}}
+    # City aliases match the same events as the canonical name
+    assert calendar.month("TLV", "2025-12") == calendar.month("Tel Aviv", "2025-12")
+    # Categories are canonical on both sides
+    await store.upsert_many([_event("f", "2025-12-21", category="Arts & Theatre")])
+    assert calendar.month("Tel Aviv", "2025-12", category="arts") == {"2025-12-21": {"arts": 1}}
+    assert calendar.month("Tel Aviv", "2025-12", category="concerts")["2025-12-20"] == {"music": 1}
+    del store["f"]
+
+    # A rescheduled event moves; a dropped one is uncounted
+    await store.upsert_many([_event("a", "2026-01-02")])
+    del store["seed"]
+    assert calendar.month("Tel Aviv", "2025-12") == {
+        "2025-12-15": {"sports": 1},
+        "2025-12-20": {"music": 1}
+    }
+    assert calendar.month("Tel Aviv", "2026-01") == {"2026-01-02": {"music": 2}}
+    assert len(calendar) == 4
+
+
+class TestCalendarEndpoint:
+    @pytest.fixture(autouse=True)
+    def mock_mode(self):
+        events_routes._search_cache.clear()
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_month_view_from_searched_events(self):
+        client.get("/api/events?date=2031-03-07&city=Calendar City&category=arts")
+        response = client.get("/api/events/calendar?city=calendar city&month=2031-03")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 2
+        assert body["days"] == [{"date": "2031-03-07", "count": 2, "categories": {"arts": 2}}]
+
+        empty = client.get("/api/events/calendar?city=Calendar City&month=2031-03&category=music").json()
+        assert empty["total"] == 0 and empty["days"] == []
+        assert client.get("/api/events/calendar?city=X&month=2031-13").status_code == 422
@@ -0,0 +1,65 @@
+"""Tests for query canonicalization."""
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.collectors.base import ArtistSearchQuery, EventCollector, EventSearchQuery
+from api.main import app
+from api.routes import events as events_routes
+from api.services.canonical import canonical_category, canonical_city, canonicalize, page_window
+from api.services.collector import MultiCollector
+from api.services.search_cache import SearchCache
+
+client = TestClient(app)
+
+
+class EmptyCollector(EventCollector):
+    name = "empty"
+
+    async def search(self, query):
+        return []
+
+    async def search_by_artist(self, query):
+        return [], 0
+
+
+def test_city_and_category_spellings():
+    for spelling in ("tel aviv", "Tel-Aviv", "TLV", "Tel Aviv-Yafo", " tel  AVIV "):
+        assert canonical_city(spelling) == "Tel Aviv"
+    assert canonical_city("  Kfar   Saba ") == "Kfar Saba"
+    assert canonical_city("  ") is None
+    assert canonical_category("Music") == canonical_category("concerts") == "music"
+    assert canonical_category("Arts & Theatre") == "arts"
+    assert canonical_category(" Comedy") == "comedy"
+
+
+def test_page_window_buckets():
+    assert page_window(20, 0) == (20, 0, 0)
+    assert page_window(15, 0) == (20, 0, 0)
+    assert page_window(15, 3) == (20, 2, 5)
+    assert page_window(15, 1) == (50, 0, 15)
+    assert page_window(100, 3) == (100, 3, 0)
+    canonical = canonicalize(EventSearchQuery(date="2026-05-01", city="tlv", category="Sports", limit=15, country_code="il"))
+    assert canonical.query == EventSearchQuery(date="2026-05-01", city="Tel Aviv", category="sports", limit=20, country_code="IL")
+    assert (canonical.start, canonical.stop, canonical.sliced) == (0, 15, True)
+
+
+def test_keys_are_shared_across_spellings():
+    a = EventSearchQuery(date="2026-05-01", city="TLV", category="Music")
+    b = EventSearchQuery(date="2026-05-01", city="tel-aviv", category="music", country_code="il")
+    assert SearchCache.key(a) == SearchCache.key(b)
+    assert SearchCache.key(ArtistSearchQuery(artist=" Ed  Sheeran")) == SearchCache.key(ArtistSearchQuery(artist="ed sheeran"))
+
+    collector = EmptyCollector()
+    service = MultiCollector(collectors=[collector])
+    assert service._negative_key(collector, a) == service._negative_key(collector, b)
+
+
+def test_alias_request_hits_canonical_entry():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        first = client.get("/api/events?date=2031-10-01&city=Tel Aviv")
+        with patch.object(events_routes._multi_collector, "search") as search:
+            second = client.get("/api/events?date=2031-10-01&city=TLV&limit=1")
+            assert not search.called
+    assert [e["id"] for e in first.json()] == ["mock-1", "mock-2"]
+    assert [e["id"] for e in second.json()] == ["mock-1"]
+    assert first.headers["etag"] != second.headers["etag"]
@@ -214,3 +214,61 @@ async def test_multicollector_error_fallback():
     assert len(events) == 1
     assert events[0].provider == "ticketmaster"
 
+
+
+# =========================================
+# Tests for negative-result caching
+# =========================================
+
+@pytest.mark.asyncio
+async def test_empty_provider_result_is_skipped_next_time():
+    """A provider that returned nothing should be skipped for the same query."""
+    ticketmaster_event = EventMention(
+        id="tm-1", text="Ticketmaster Event", url="http://ticketmaster.com/e1",
+        timestamp="2025-01-01", venue_name="V2", city="Haifa", provider="ticketmaster"
+    )
+    empty_collector = MockCollector("viagogo", events=[])
+    ticketmaster_collector = MockCollector("ticketmaster", events=[ticketmaster_event])
+    service = MultiCollector(collectors=[empty_collector, ticketmaster_collector])
+
+    await service.search(EventSearchQuery(date="2025-01-01", city="Haifa"))
+    empty_collector.search_called = False
+    # Same query modulo case/whitespace should hit the negative cache
+    events = await service.search(EventSearchQuery(date="2025-01-01", city=" haifa "))
+
+    assert events[0].id == "tm-1"
+    assert empty_collector.search_called is False
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_is_per_query():
+    """A known-empty query should not affect different queries."""
+    empty_collector = MockCollector("viagogo", events=[])
+    service = MultiCollector(collectors=[empty_collector])
+
+    await service.search(EventSearchQuery(date="2025-01-01", city="Haifa"))
+    empty_collector.search_called = False
+    await service.search(EventSearchQuery(date="2025-01-02", city="Haifa"))
+
+    assert empty_collector.search_called is True
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_are_not_negatively_cached():
+    """Empty results caused by handled provider errors should be retried."""
+    from api.collectors.base import report_provider_error
+
+    class FlakyCollector(MockCollector):
+        async def search(self, query):
+            self.search_called = True
+            report_provider_error(Exception("HTTP 503"))
+            return []
+
+    flaky = FlakyCollector("ticketmaster")
+    service = MultiCollector(collectors=[flaky])
+
+    await service.search(EventSearchQuery(date="2025-01-01"))
+    flaky.search_called = False
+    await service.search(EventSearchQuery(date="2025-01-01"))
+
+    assert flaky.search_called is True
@@ -0,0 +1,104 @@
+"""Tests for request deadlines and adaptive provider timeouts."""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch, AsyncMock, Mock
+from api.collectors.base import EventCollector, EventSearchQuery, ArtistSearchQuery
+from api.collectors.ticketmaster import TicketmasterCollector
+from api.models.event import EventMention
+from api.services.collector import MultiCollector
+from api.services.deadline import Deadline, LatencyTracker, set_provider_timeout, reset_provider_timeout
+
+
+def _event(provider: str) -> EventMention:
+    return EventMention(id=provider, text="E", url="http://e", timestamp="2025-01-01",
+                        venue_name="V", city="C", provider=provider)
+
+
+class SlowCollector(EventCollector):
+    """Collector that answers after a fixed delay."""
+    def __init__(self, delay: float, events: list):
+        self.delay = delay
+        self.events = events
+
+    async def search(self, query: EventSearchQuery):
+        await asyncio.sleep(self.delay)
+        return self.events
+
+    async def search_by_artist(self, query: ArtistSearchQuery):
+        await asyncio.sleep(self.delay)
+        return self.events, len(self.events)
+
+
+class TestLatencyTracker:
+    """Tests for the adaptive timeout estimate."""
+
+    def test_cap_defaults_to_max_without_samples(self):
+        with patch("api.config.PROVIDER_TIMEOUT_MAX", 5.0):
+            assert LatencyTracker().timeout_cap("tm") == 5.0
+
+    def test_cap_follows_percentile(self):
+        tracker = LatencyTracker(min_samples=10)
+        for i in range(1, 101):
+            tracker.record("tm", i / 100)
+        with patch("api.config.PROVIDER_TIMEOUT_PERCENTILE", 95.0), \
+                patch("api.config.PROVIDER_TIMEOUT_MULTIPLIER", 2.0), \
+                patch("api.config.PROVIDER_TIMEOUT_MIN", 0.1), \
+                patch("api.config.PROVIDER_TIMEOUT_MAX", 10.0):
+            assert tracker.timeout_cap("tm") == pytest.approx(1.9)
+
+    def test_cap_is_clamped_to_min(self):
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("tm", 0.001)
+        with patch("api.config.PROVIDER_TIMEOUT_MIN", 0.2):
+            assert tracker.timeout_cap("tm") == 0.2
+
+
+class TestDeadlinePropagation:
+    """Tests for deadline handling in MultiCollector."""
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_leaves_time_for_fallback(self):
+        """A hung primary should be cut off so the fallback answers within budget."""
+        slow = SlowCollector(5.0, [_event("slow")])
+        fast = SlowCollector(0.0, [_event("fast")])
+        service = MultiCollector(collectors=[slow, fast])
+
+        started = time.monotonic()
+        with patch("api.config.PROVIDER_TIMEOUT_MIN", 0.1):
+            events = await service.search(EventSearchQuery(date="2025-01-01"), deadline=Deadline(0.3))
+
+        assert [e.provider for e in events] == ["fast"]
+        assert time.monotonic() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_timeouts_are_recorded_as_latency(self):
+        service = MultiCollector(collectors=[SlowCollector(1.0, []), SlowCollector(0.0, [])])
+        with patch("api.config.PROVIDER_TIMEOUT_MIN", 0.05):
+            await service.search_by_artist(ArtistSearchQuery(artist="X"), deadline=Deadline(0.15))
+        assert service.latency.snapshot()["slow"]["samples"] == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_providers(self):
+        collector = SlowCollector(0.0, [_event("fast")])
+        service = MultiCollector(collectors=[collector])
+        deadline = Deadline(0.0)
+        assert await service.search(EventSearchQuery(date="2025-01-01"), deadline=deadline) == []
+
+    @pytest.mark.asyncio
+    async def test_ticketmaster_uses_granted_timeout(self):
+        """The HTTP client timeout should come from the granted budget, not 30s."""
+        with patch("api.collectors.ticketmaster.config.TICKETMASTER_API_KEY", "test-key"):
+            with patch("httpx.AsyncClient") as mock_client_cls:
+                mock_response = Mock(json=Mock(return_value={}), raise_for_status=Mock())
+                mock_client = mock_client_cls.return_value
+                mock_client.__aenter__.return_value = mock_client
+                mock_client.get = AsyncMock(return_value=mock_response)
+
+                token = set_provider_timeout(0.7)
+                try:
+                    await TicketmasterCollector().search(EventSearchQuery(date="2025-12-15"))
+                finally:
+                    reset_provider_timeout(token)
+
+                mock_client_cls.assert_called_with(timeout=0.7)
@@ -0,0 +1,92 @@
+"""Tests for server-side filtering and sorting of result sets."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.columnar import ColumnarView, ResultFilter
+
+client = TestClient(app)
+
+
+def _event(event_id: str, min_price=None, popularity=0.0, date="2025-12-15", has_tickets=True) -> EventMention:
+    return EventMention(
+        id=event_id, text=event_id, url="https://x", timestamp=date, venue_name="V", city="C",
+        min_price=min_price, scores={"popularity": popularity}, has_tickets=has_tickets
+    )
+
+
+EVENTS = [
+    _event("a", min_price=90.0, popularity=0.5, date="2025-12-20"),
+    _event("b", min_price=None, popularity=0.9, date="2025-12-10"),
+    _event("c", min_price=40.0, popularity=0.1, date="2025-12-12", has_tickets=False),
+    _event("d", min_price=40.0, popularity=0.7, date="not-a-date"),
+]
+
+
+def _ids(events):
+    return [e.id for e in events]
+
+
+def test_columnar_sorts_and_filters():
+    view = ColumnarView(EVENTS)
+    assert _ids(view.apply(ResultFilter(sort="price"))) == ["c", "d", "a", "b"]
+    assert _ids(view.apply(ResultFilter(sort="popularity"))) == ["b", "d", "a", "c"]
+    assert _ids(view.apply(ResultFilter(sort="date"))) == ["b", "c", "a", "d"]
+    assert _ids(view.apply(ResultFilter(min_price=50))) == ["a"]
+    assert _ids(view.apply(ResultFilter(max_price=50, has_tickets=True))) == ["d"]
+    assert view.apply(ResultFilter()) is EVENTS
+
+
+def test_result_filter_validation_and_round_trip():
+    with pytest.raises(ValueError):
+        ResultFilter(min_price=10, max_price=5)
+    with pytest.raises(ValueError):
+        ResultFilter.from_dict({"sort": "name"})
+    view = ResultFilter(max_price=150.0, sort="price")
+    assert ResultFilter.from_dict(view.to_dict()) == view
+
+
+class TestFilterEndpoints:
+    @pytest.fixture(autouse=True)
+    def mock_mode(self):
+        events_routes._search_cache.clear()
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_events_sort_and_filter(self):
+        sorted_ids = _ids_json(client.get("/api/events?date=2025-12-15&sort=price").json())
+        assert sorted_ids == ["mock-2", "mock-1"]
+        assert _ids_json(client.get("/api/events?date=2025-12-15&min_price=130").json()) == ["mock-1"]
+        assert client.get("/api/events?date=2025-12-15&sort=name").status_code == 422
+        assert client.get("/api/events?date=2025-12-15&min_price=10&max_price=5").status_code == 422
+
+    def test_events_filter_applies_before_paging(self):
+        """Pages of a filtered search are slices of the filtered result, not filtered pages."""
+        pages = [
+            _ids_json(client.get(f"/api/events?date=2025-12-16&sort=price&limit=1&page={page}").json())
+            for page in range(3)
+        ]
+        assert pages == [["mock-2"], ["mock-1"], []]
+        assert client.get("/api/events?date=2025-12-16&sort=price&limit=20&page=5").status_code == 422
+
+    def test_by_artist_filter_beyond_window_is_rejected(self):
+        response = client.get("/api/events/by-artist?artist=Coldplay&max_price=150&limit=50&page=2")
+        assert response.status_code == 422
+
+    def test_by_artist_filter_carries_through_cursor(self):
+        first = client.get("/api/events/by-artist?artist=Coldplay&max_price=150&sort=price&limit=5").json()
+        # Mock prices are 75, 85, ... so eight events are at most 150
+        assert first["pagination"]["total"] == 8
+        assert [e["min_price"] for e in first["events"]] == [75.0, 85.0, 95.0, 105.0, 115.0]
+
+        second = client.get(
+            f"/api/events/by-artist?artist=Coldplay&limit=5&cursor={first['pagination']['next_cursor']}"
+        ).json()
+        assert [e["min_price"] for e in second["events"]] == [125.0, 135.0, 145.0]
+        assert second["pagination"]["next_cursor"] is None
+
+
+def _ids_json(events):
+    return [e["id"] for e in events]
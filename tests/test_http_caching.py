@@ -0,0 +1,81 @@
+"""Tests for ETag / If-None-Match handling and Cache-Control headers."""
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from api.main import app
+from api.routes import events as events_routes
+
+
+client = TestClient(app)
+
+
+class TestConditionalEvents:
+    """Conditional requests for the event list endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def mock_api_key(self):
+        """Force mock mode and start from an empty cache."""
+        events_routes._search_cache.clear()
+        events_routes._resolution_cache.clear_local()
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_events_sets_etag_and_max_age(self):
+        """Cached results should carry an ETag and a positive max-age."""
+        response = client.get("/api/events?date=2025-12-15")
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "max-age=" in response.headers["cache-control"]
+        assert "max-age=0" not in response.headers["cache-control"]
+
+    def test_events_if_none_match_returns_304_without_upstream(self):
+        """A matching If-None-Match should return 304 from the cache."""
+        first = client.get("/api/events?date=2025-12-15")
+        etag = first.headers["etag"]
+
+        with patch.object(events_routes._multi_collector, "search", new_callable=AsyncMock) as mock_search:
+            response = client.get("/api/events?date=2025-12-15", headers={"If-None-Match": etag})
+            assert mock_search.await_count == 0
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_is_stable_across_cache_refills(self):
+        """Identical results should produce the same ETag after re-fetching."""
+        first = client.get("/api/events?date=2025-12-15").headers["etag"]
+        events_routes._search_cache.clear()
+        second = client.get("/api/events?date=2025-12-15").headers["etag"]
+        assert first == second
+
+    def test_stale_etag_returns_full_body(self):
+        """A non-matching ETag should return the full payload."""
+        response = client.get("/api/events?date=2025-12-15", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+
+    def test_by_artist_etag_varies_by_page(self):
+        """Different pages of the same search should not share an ETag."""
+        page0 = client.get("/api/events/by-artist?artist=Coldplay&page=0").headers["etag"]
+        page1 = client.get("/api/events/by-artist?artist=Coldplay&page=1").headers["etag"]
+        assert page0 != page1
+
+    def test_package_revalidation_skips_resolution(self):
+        """Package 304s should not hit Ticketmaster once resolution is cached."""
+        event_id = client.get("/api/events?date=2025-12-15").json()[0]["id"]
+        first = client.get(f"/api/events/{event_id}/package")
+        assert "max-age=" in first.headers["cache-control"]
+
+        with patch("api.collectors.ticketmaster.TicketmasterCollector.resolve_event", new_callable=AsyncMock) as mock_resolve:
+            response = client.get(
+                f"/api/events/{event_id}/package",
+                headers={"If-None-Match": first.headers["etag"]}
+            )
+            assert mock_resolve.await_count == 0
+
+        assert response.status_code == 304
+
+    def test_unknown_package_is_not_cacheable(self):
+        """Demo packages for unknown IDs should not be cached by clients."""
+        response = client.get("/api/events/unknown-event-id/package")
+        assert response.headers["cache-control"] == "no-cache"
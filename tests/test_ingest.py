@@ -0,0 +1,102 @@
+"""Tests for streaming Discovery Feed ingest."""
+import csv
+import gzip
+import io
+import json
+import pytest
+from api.services import ingest
+from api.services.ingest import detect_format, ingest_feed, iter_json_array
+from api.services.store import EventStore
+
+FEED_RECORD = {
+    "eventId": "feed-1",
+    "eventName": "Coldplay - Music of the Spheres",
+    "primaryEventUrl": "https://www.ticketmaster.com/event/feed-1",
+    "eventStartLocalDate": "2026-07-01",
+    "eventStatus": "onsale",
+    "minPrice": 99.5,
+    "maxPrice": 450,
+    "currency": "USD",
+    "classificationSegment": "Music",
+    "venue": {"venueName": "Wembley Stadium", "venueCity": "London", "venueLatitude": "51.556", "venueLongitude": "-0.279"}
+}
+
+API_RECORD = {
+    "id": "feed-2",
+    "name": "Ed Sheeran",
+    "dates": {"start": {"localDate": "2026-07-02"}, "status": {"code": "cancelled"}},
+    "_embedded": {"venues": [{"name": "O2", "city": {"name": "London"}}]}
+}
+
+
+def test_json_array_streams_across_chunks(monkeypatch):
+    monkeypatch.setattr(ingest, "CHUNK_SIZE", 7)
+    records = [{"n": i, "s": "x,]}" * i} for i in range(20)]
+    document = json.dumps({"meta": {"count": 20}, "events": records}, indent=1)
+    assert list(iter_json_array(io.StringIO(document))) == records
+    assert list(iter_json_array(io.StringIO(json.dumps(records)))) == records
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"other": []}')))
+
+
+def test_malformed_records_are_skipped(monkeypatch):
+    monkeypatch.setattr(ingest, "CHUNK_SIZE", 5)
+    document = '{"events": [{"n": 1}, {"n": tru, "s": "x}]"}, {"n": 3}, nul, {"n": 5}]}'
+    reasons = []
+    assert list(iter_json_array(io.StringIO(document), on_malformed=reasons.append)) == [{"n": 1}, {"n": 3}, {"n": 5}]
+    assert len(reasons) == 2
+
+    lines = io.StringIO('{"n": 1}\n{"n": \n{"n": 3}\n')
+    assert list(ingest.iter_records(lines, "ndjson", on_malformed=reasons.append)) == [{"n": 1}, {"n": 3}]
+    assert len(reasons) == 3
+
+
+def test_detect_format():
+    assert detect_format("feed.JSON.gz") == "json"
+    assert detect_format("feed.jsonl") == "ndjson"
+    assert detect_format("US.csv.gz") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("feed.xml")
+
+
+@pytest.mark.asyncio
+async def test_ingest_gzipped_json_in_batches(tmp_path):
+    path = tmp_path / "feed.json.gz"
+    records = [dict(FEED_RECORD, eventId=f"feed-{i}") for i in range(5)] + [API_RECORD, {"eventName": "no id"}]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"events": records})[:-2] + ', {"eventId": oops}]}')
+
+    store = EventStore()
+    batches = []
+
+    async def sink(events):
+        batches.append(len(events))
+        await store.upsert_many(events)
+
+    stats = await ingest_feed(str(path), sink, batch_size=4)
+    assert (stats.records, stats.events, stats.skipped) == (8, 6, 2)
+    assert batches == [4, 2]
+
+    event = store["feed-0"]
+    assert (event.text, event.city, event.venue_name, event.timestamp) == (
+        "Coldplay - Music of the Spheres", "London", "Wembley Stadium", "2026-07-01"
+    )
+    assert (event.min_price, event.max_price, event.price_range, event.category) == (99.5, 450.0, "$100 - $450", "music")
+    assert event.venue_lat == 51.556 and event.has_tickets
+    assert store["feed-2"].has_tickets is False
+
+
+@pytest.mark.asyncio
+async def test_ingest_csv_columns(tmp_path):
+    path = tmp_path / "feed.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["EVENT_ID", "EVENT_NAME", "EVENT_START_LOCAL_DATE", "VENUE_NAME", "VENUE_CITY", "MIN_PRICE", "MAX_PRICE"])
+        writer.writerow(["csv-1", "Hamilton", "2026-08-01", "Victoria Palace", "London", "", ""])
+        writer.writerow(["csv-2", "Wicked", "2026-08-02", "Apollo", "London", "30", "120"])
+
+    store = EventStore()
+    stats = await ingest_feed(str(path), store.upsert_many, limit=1)
+    assert stats.events == 1 and list(store) == ["csv-1"]
+    assert store["csv-1"].min_price is None
+    assert store["csv-1"].url == "https://www.ticketmaster.com/event/csv-1"
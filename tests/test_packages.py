@@ -0,0 +1,184 @@
+"""Tests for package materialization at ingest time."""
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.cache import CacheEntry
+from api.services.packages import PackageMaterializer
+from api.services.snapshot import EventSnapshot, write_snapshot
+from api.services.store import EventStore
+
+client = TestClient(app)
+
+
+def _event(event_id: str, **overrides) -> EventMention:
+    data = dict(
+        id=event_id,
+        text="Coldplay Live",
+        url="https://www.ticketmaster.com/event/1",
+        timestamp="2030-06-01",
+        venue_name="Park Hayarkon",
+        city="Tel Aviv",
+        provider="ticketmaster"
+    )
+    data.update(overrides)
+    return EventMention(**data)
+
+
+@pytest.fixture(autouse=True)
+def mock_mode():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_package_is_prebuilt_when_event_is_stored():
+    """Once an event is stored, its package is served without upstream calls."""
+    event = _event("pkg-prebuilt")
+    await events_routes._events_cache.upsert_many([event])
+    await events_routes._packages.drain()
+    assert events_routes._packages.get(event.id) is not None
+
+    with patch("api.collectors.ticketmaster.TicketmasterCollector.resolve_event", new_callable=AsyncMock) as mock_resolve:
+        response = client.get(f"/api/events/{event.id}/package")
+        assert mock_resolve.await_count == 0
+    assert response.status_code == 200
+    assert response.json()["event"]["text"] == "Coldplay Live"
+    assert response.headers["etag"] == events_routes._packages.get(event.id).version
+
+
+@pytest.mark.asyncio
+async def test_prebuild_never_resolves_upstream():
+    """Events without a cached or local resolution are left for the request path."""
+    event = _event("pkg-viagogo", url="https://www.viagogo.com/e/2", provider="viagogo", text="Unmatched Gig")
+    with patch("api.collectors.ticketmaster.TicketmasterCollector.resolve_event", new_callable=AsyncMock) as mock_resolve:
+        await events_routes._events_cache.upsert_many([event])
+        await events_routes._packages.drain()
+        assert mock_resolve.await_count == 0
+    assert events_routes._packages.get(event.id) is None
+
+
+class RecordingBuilder:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, event, network):
+        self.calls.append((event.id, network))
+        return CacheEntry(value=b"{}", version=event.id, stored_at=0, expires_at=float("inf"))
+
+
+@pytest.mark.asyncio
+async def test_hydrate_does_not_queue_prebuilds(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, [_event(f"h{i}") for i in range(5)], {})
+    store, build = EventStore(), RecordingBuilder()
+    packages = PackageMaterializer(store, build, ttl=60)
+    store.attach_snapshot(EventSnapshot(path))
+
+    assert await store.hydrate() == 5
+    await packages.drain()
+    assert build.calls == []
+
+
+def test_pending_builds_are_bounded():
+    store = EventStore()
+    packages = PackageMaterializer(store, RecordingBuilder(), ttl=60, max_pending=3)
+    for i in range(10):
+        store[f"q{i}"] = _event(f"q{i}")
+    assert list(packages._pending) == ["q7", "q8", "q9"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_schedules_build_once():
+    """Polls arriving while a build is queued or running do not start another."""
+    import asyncio
+    store, build = EventStore(), RecordingBuilder()
+    release = asyncio.Event()
+
+    async def slow_build(event, network):
+        await release.wait()
+        return await build(event, network)
+
+    packages = PackageMaterializer(store, slow_build, ttl=60, prebuild=False)
+    store["poll"] = _event("poll")
+    for _ in range(4):
+        packages.schedule("poll")
+        await asyncio.sleep(0)
+    release.set()
+    await packages.drain()
+    assert build.calls == [("poll", True)]
+
+    packages.schedule("poll")
+    await packages.drain()
+    assert len(build.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_event_rebuilds_package():
+    """A content change drops the old package and rebuilds it from the new event."""
+    await events_routes._events_cache.upsert_many([_event("pkg-changed")])
+    await events_routes._packages.drain()
+    old_etag = events_routes._packages.get("pkg-changed").version
+
+    await events_routes._events_cache.upsert_many([_event("pkg-changed", venue_name="Bloomfield")])
+    await events_routes._packages.drain()
+
+    response = client.get("/api/events/pkg-changed/package")
+    assert response.json()["event"]["venue_name"] == "Bloomfield"
+    assert response.headers["etag"] != old_etag
+
+
+@pytest.mark.asyncio
+async def test_unchanged_upsert_keeps_package():
+    """Re-storing identical content neither invalidates nor rebuilds."""
+    await events_routes._events_cache.upsert_many([_event("pkg-same")])
+    await events_routes._packages.drain()
+    package = events_routes._packages.get("pkg-same")
+
+    await events_routes._events_cache.upsert_many([_event("pkg-same")])
+    assert events_routes._packages.get("pkg-same") is package
+
+
+@pytest.mark.asyncio
+async def test_stale_build_is_discarded():
+    """A package built from an event that has since changed is not stored."""
+    old = _event("pkg-race")
+    await events_routes._events_cache.upsert_many([old])
+    await events_routes._packages.drain()
+    entry = events_routes._packages.get("pkg-race")
+
+    await events_routes._events_cache.upsert_many([_event("pkg-race", city="Haifa")])
+    assert events_routes._packages.put(old, entry) is False
+    await events_routes._packages.drain()
+
+
+def test_deferred_enrichment_returns_before_resolution():
+    """Deferred mode answers with the known link, then the poll endpoint upgrades it."""
+    import time
+    event = _event("pkg-deferred", url="https://www.viagogo.com/e/1", provider="viagogo", text="Deferred Gig")
+    resolved = _event("tm-deferred", url="https://www.ticketmaster.com/event/deferred")
+
+    with patch.dict("api.routes.events._events_cache", {event.id: event}):
+        with patch("api.collectors.ticketmaster.TicketmasterCollector.resolve_event", new_callable=AsyncMock) as mock_resolve:
+            mock_resolve.return_value = resolved
+            with TestClient(app) as session:
+                response = session.get(f"/api/events/{event.id}/package?enrichment=deferred")
+                assert response.status_code == 200
+                assert response.headers["x-enrichment"] == "pending"
+                assert response.headers["cache-control"] == "no-cache"
+                assert response.json()["tickets"]["ticket_provider"] == "viagogo"
+
+                for _ in range(50):
+                    status = session.get(f"/api/events/{event.id}/tickets").json()
+                    if status["status"] == "complete":
+                        break
+                    time.sleep(0.02)
+
+    assert status["status"] == "complete"
+    assert status["tickets"] == {"url": "https://www.ticketmaster.com/event/deferred", "ticket_provider": "ticketmaster"}
+
+
+def test_tickets_poll_unknown_event_is_404():
+    assert client.get("/api/events/pkg-missing/tickets").status_code == 404
@@ -0,0 +1,90 @@
+"""Tests for cursor pagination over by-artist result snapshots."""
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from api.main import app
+from api.routes import events as events_routes
+from api.services.pagination import decode_cursor, encode_cursor
+
+
+client = TestClient(app)
+
+
+class TestCursorEncoding:
+    """Tests for opaque cursor encoding."""
+
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor("abc123", 40)) == ("abc123", 40, {})
+        assert decode_cursor(encode_cursor("abc123", 40, {"sort": "price"})) == ("abc123", 40, {"sort": "price"})
+
+    def test_malformed_cursor_raises(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestByArtistCursorPagination:
+    """Tests for snapshot-backed paging on /api/events/by-artist."""
+
+    @pytest.fixture(autouse=True)
+    def mock_api_key(self):
+        """Force mock mode and start from empty caches."""
+        events_routes._search_cache.clear()
+        events_routes._result_snapshots.clear()
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_cursor_walks_snapshot_with_one_upstream_call(self):
+        """Following next_cursor should page locally without new upstream calls."""
+        original = events_routes._multi_collector.search_by_artist
+        with patch.object(events_routes._multi_collector, "search_by_artist", wraps=original) as spy:
+            first = client.get("/api/events/by-artist?artist=Coldplay&limit=10").json()
+            second = client.get(
+                f"/api/events/by-artist?artist=Coldplay&limit=10&cursor={first['pagination']['next_cursor']}"
+            ).json()
+            third = client.get(
+                f"/api/events/by-artist?artist=Coldplay&limit=10&cursor={second['pagination']['next_cursor']}"
+            ).json()
+            assert spy.await_count == 1
+
+        ids = [e["id"] for page in (first, second, third) for e in page["events"]]
+        assert len(ids) == 25 and len(set(ids)) == 25
+        assert second["pagination"]["page"] == 1
+        assert third["pagination"]["has_more"] is False
+        assert third["pagination"]["next_cursor"] is None
+
+    def test_page_param_slices_snapshot(self):
+        """Legacy page= inside the window should be served from the snapshot."""
+        client.get("/api/events/by-artist?artist=Coldplay&limit=10")
+        with patch.object(events_routes._multi_collector, "search_by_artist", new_callable=AsyncMock) as mock_search:
+            response = client.get("/api/events/by-artist?artist=Coldplay&limit=10&page=1")
+            assert mock_search.await_count == 0
+        assert response.json()["events"][0]["id"] == "artist-mock-11"
+
+    def test_page_beyond_window_goes_upstream(self):
+        """Pages past ARTIST_SNAPSHOT_WINDOW should still reach the provider."""
+        with patch("api.config.ARTIST_SNAPSHOT_WINDOW", 10):
+            response = client.get("/api/events/by-artist?artist=Coldplay&limit=10&page=2")
+        data = response.json()
+        assert response.status_code == 200
+        assert data["pagination"]["page"] == 2
+        assert data["pagination"]["next_cursor"] is None
+
+    def test_window_end_hands_over_to_page_numbers(self):
+        """A provider total beyond the window keeps has_more, without a cursor."""
+        from api.collectors.ticketmaster import TicketmasterCollector
+        events, _ = TicketmasterCollector()._get_mock_artist_events("Coldplay")
+        with patch.object(events_routes._multi_collector, "search_by_artist", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = (events[:10], 50)
+            with patch("api.config.ARTIST_SNAPSHOT_WINDOW", 10):
+                last = client.get("/api/events/by-artist?artist=Window Edge&limit=10").json()
+        assert last["pagination"]["total"] == 50
+        assert last["pagination"]["has_more"] is True
+        assert last["pagination"]["next_cursor"] is None
+
+    def test_expired_cursor_returns_410(self):
+        response = client.get(f"/api/events/by-artist?artist=Coldplay&cursor={encode_cursor('gone', 10)}")
+        assert response.status_code == 410
+
+    def test_invalid_cursor_returns_422(self):
+        response = client.get("/api/events/by-artist?artist=Coldplay&cursor=%%%")
+        assert response.status_code == 422
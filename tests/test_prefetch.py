@@ -0,0 +1,113 @@
+"""Tests for date-window prefetch."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from api.collectors.base import EventCollector, EventSearchQuery
+from api.collectors.ticketmaster import TicketmasterCollector
+from api.models.event import EventMention
+from api.services.collector import MultiCollector
+from api.services.prefetch import DatePrefetcher
+from api.services.search_cache import SearchCache
+
+
+def _event(event_id: str, day: str) -> EventMention:
+    return EventMention(id=event_id, text=event_id, url="https://x", timestamp=day, venue_name="V", city="Haifa")
+
+
+class WindowCollector(EventCollector):
+    name = "window"
+
+    def __init__(self, events, complete=True, delay=0.0):
+        self.events = events
+        self.complete = complete
+        self.delay = delay
+        self.windows = []
+
+    async def search(self, query):
+        return []
+
+    async def search_by_artist(self, query):
+        return [], 0
+
+    async def search_window(self, query, date_to, max_events):
+        self.windows.append((query.date, date_to))
+        await asyncio.sleep(self.delay)
+        return self.events, self.complete
+
+
+def _prefetcher(collector: WindowCollector, days: int = 7):
+    stored = []
+
+    async def on_events(events):
+        stored.extend(events)
+
+    multi = MultiCollector(collectors=[collector])
+    return DatePrefetcher(multi, SearchCache(ttl=60), on_events, days=days), multi, stored
+
+
+WEEK = [_event("a", "2026-05-01"), _event("b", "2026-05-01"), _event("c", "2026-05-03"), _event("d", "2026-05-07")]
+
+
+@pytest.mark.asyncio
+async def test_one_window_fills_every_day():
+    collector = WindowCollector(WEEK)
+    prefetcher, multi, stored = _prefetcher(collector)
+    query = EventSearchQuery(date="2026-05-01", city="Haifa", limit=1)
+
+    entry = await prefetcher.get(query, wait=1)
+    assert [e.id for e in entry.value.events] == ["a"]
+    assert collector.windows == [("2026-05-01", "2026-05-07")] and len(stored) == 4
+
+    entry = await prefetcher.cache.get(EventSearchQuery(date="2026-05-07", city="Haifa", limit=1))
+    assert [e.id for e in entry.value.events] == ["d"]
+    # An empty day goes to the negative cache instead, and is not prefetched again
+    empty_day = EventSearchQuery(date="2026-05-02", city="Haifa", limit=1)
+    assert await multi._known_empty(multi._negative_key(collector, empty_day))
+    assert await prefetcher.get(empty_day, wait=1) is None
+    assert len(collector.windows) == 1
+
+
+@pytest.mark.asyncio
+async def test_truncated_window_skips_its_last_day():
+    collector = WindowCollector(WEEK[:3], complete=False)
+    prefetcher, _, _ = _prefetcher(collector)
+    await prefetcher.get(EventSearchQuery(date="2026-05-01"), wait=1)
+    assert await prefetcher.cache.get(EventSearchQuery(date="2026-05-01")) is not None
+    assert await prefetcher.cache.get(EventSearchQuery(date="2026-05-03")) is None
+    assert prefetcher._covered.get(prefetcher.cache.key(EventSearchQuery(date="2026-05-04"))) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_window_keeps_loading_and_is_shared():
+    collector = WindowCollector(WEEK, delay=0.05)
+    prefetcher, _, _ = _prefetcher(collector)
+    first, second = await asyncio.gather(
+        prefetcher.get(EventSearchQuery(date="2026-05-01"), wait=0.01),
+        prefetcher.get(EventSearchQuery(date="2026-05-03"), wait=1)
+    )
+    assert first is None and [e.id for e in second.value.events] == ["c"]
+    assert len(collector.windows) == 1
+    assert await prefetcher.cache.get(EventSearchQuery(date="2026-05-01")) is not None
+
+    disabled, _, _ = _prefetcher(WindowCollector(WEEK), days=1)
+    assert await disabled.get(EventSearchQuery(date="2026-05-01"), wait=1) is None
+
+
+@pytest.mark.asyncio
+async def test_ticketmaster_window_pages_until_done():
+    pages = [([_event(f"p{n}", "2026-05-01")] * 2, 5) for n in range(3)]
+    with patch("api.collectors.ticketmaster.config.TICKETMASTER_API_KEY", "live-key"), \
+            patch("api.collectors.ticketmaster.config.PREFETCH_PAGE_SIZE", 2):
+        collector = TicketmasterCollector()
+        collector._fetch_events = AsyncMock(side_effect=pages)
+        events, complete = await collector.search_window(EventSearchQuery(date="2026-05-01"), "2026-05-07", 100)
+        assert len(events) == 6 and complete
+        assert [call.args[0]["page"] for call in collector._fetch_events.call_args_list] == [0, 1, 2]
+        assert collector._fetch_events.call_args.args[0]["localStartDateTime"] == "2026-05-01T00:00:00,2026-05-07T23:59:59"
+
+        collector._fetch_events = AsyncMock(side_effect=pages)
+        events, complete = await collector.search_window(EventSearchQuery(date="2026-05-01"), "2026-05-07", 3)
+        assert len(events) == 4 and not complete
+
+    with patch("api.collectors.ticketmaster.config.TICKETMASTER_API_KEY", "test"):
+        assert await TicketmasterCollector().search_window(EventSearchQuery(date="2026-05-01"), "2026-05-07", 10) is None
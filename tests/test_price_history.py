@@ -0,0 +1,88 @@
+"""Tests for the price-history store and endpoint."""
+import time
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.price_history import PriceHistoryStore, PriceSeries
+
+client = TestClient(app)
+
+
+def _event(event_id: str, min_price, max_price) -> EventMention:
+    return EventMention(
+        id=event_id, text="Show", url="https://www.ticketmaster.com/event/x", timestamp="2025-12-15",
+        venue_name="Venue", city="Tel Aviv", min_price=min_price, max_price=max_price, currency="USD"
+    )
+
+
+def test_flat_runs_keep_first_and_last_sample():
+    series = PriceSeries()
+    for ts in range(100, 110):
+        series.append(ts, 120.5, 300.0)
+    series.append(110, 99.99, 300.0)
+    assert series.samples() == [(100, 120.5, 300.0), (109, 120.5, 300.0), (110, 99.99, 300.0)]
+    assert series.nbytes == 3 * 12
+
+
+def test_compaction_keeps_extremes_and_recent_resolution():
+    series = PriceSeries()
+    for ts in range(16):
+        series.append(ts, 100.0 + (ts % 2) * 10 - ts, 200.0 + ts)
+    series.compact(10)
+    samples = series.samples()
+    assert len(samples) <= 10
+    assert min(s[1] for s in samples) == 86.0
+    assert max(s[2] for s in samples) == 215.0
+    assert samples[-1] == (15, 95.0, 215.0)
+
+
+def test_retention_and_buckets():
+    store = PriceHistoryStore(retention=100, max_samples=64)
+    now = int(time.time())
+    store.record([_event("e1", 100.0, 200.0)], now=now - 500)
+    store.record([_event("e1", 90.0, 210.0)], now=now - 20)
+    store.record([_event("e1", 80.0, None)], now=now - 10)
+    store.record([_event("no-price", None, None)], now=now)
+
+    # The sample older than retention is dropped on the next append
+    assert [s[1] for s in store.samples("e1")] == [90.0, 80.0]
+    assert store.samples("no-price") is None
+
+    bucketed = store.samples("e1", resolution=3600)
+    assert len(bucketed) in (1, 2)
+    assert min(b[1] for b in bucketed) == 80.0
+    assert max(b[2] for b in bucketed) == 210.0
+
+
+def test_stale_series_are_swept():
+    store = PriceHistoryStore(retention=100, max_samples=64, sweep_interval=50)
+    now = int(time.time())
+    store.record([_event("gone", 100.0, 200.0), _event("kept", 100.0, 200.0)], now=now - 300)
+    store.record([_event("kept", 90.0, 200.0)], now=now - 240)
+    assert len(store) == 2
+
+    # "gone" is never refreshed again and disappears once its last sample expires
+    store.record([_event("kept", 90.0, 200.0)], now=now - 150)
+    store.record([_event("kept", 80.0, 200.0)], now=now)
+    assert len(store) == 1 and store.get("gone") is None
+    assert store.sweep(now=now + 1000) == 1 and len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_endpoint_records_store_refreshes():
+    event = _event("hist-1", 150.0, 450.0)
+    await events_routes._events_cache.upsert_many([event])
+    await events_routes._events_cache.upsert_many([event.model_copy(update={"min_price": 135.0})])
+    await events_routes._packages.drain()
+
+    response = client.get("/api/events/hist-1/price-history")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["currency"] == "USD"
+    assert [s["min_price"] for s in data["samples"]] == [150.0, 135.0]
+
+    assert client.get("/api/events/hist-unknown/price-history").status_code == 404
+    assert client.get("/api/events/hist-1/price-history?resolution=-1").status_code == 422
+    assert client.get("/api/events/hist-1/price-history?since=2025-13-45").status_code == 422
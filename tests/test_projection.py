@@ -0,0 +1,75 @@
+"""Tests for sparse field selection on event list endpoints."""
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.collectors.ticketmaster import TicketmasterCollector
+from api.services.projection import encode_events, event_list_serializer, parse_fields
+
+
+client = TestClient(app)
+
+
+class TestParseFields:
+    """Tests for fields= parsing."""
+
+    def test_none_means_all_fields(self):
+        assert parse_fields(None) is None
+        assert parse_fields("") is None
+
+    def test_projection_is_canonical(self):
+        """Order, whitespace and duplicates should not change the projection."""
+        assert parse_fields("url, text,text") == parse_fields("text,url")
+        assert "id" in parse_fields("text")
+
+    def test_unknown_field_raises(self):
+        with pytest.raises(ValueError, match="bogus"):
+            parse_fields("text,bogus")
+
+
+class TestProjectionSerializer:
+    """Tests for the precompiled projection serializers."""
+
+    def test_serializer_is_reused(self):
+        assert event_list_serializer(("id", "text")) is event_list_serializer(("id", "text"))
+
+    def test_only_requested_fields_are_encoded(self):
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+        data = json.loads(encode_events(events, parse_fields("text,min_price")))
+        assert set(data[0]) == {"id", "text", "min_price"}
+
+    def test_full_projection_matches_model_dump(self):
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+        assert json.loads(encode_events(events)) == [e.model_dump(mode="json") for e in events]
+
+
+class TestFieldsParameter:
+    """Tests for fields= on the list endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def mock_api_key(self):
+        """Force mock mode for these tests."""
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_events_fields(self):
+        response = client.get("/api/events?date=2025-12-15&fields=text,url,min_price")
+        assert response.status_code == 200
+        assert set(response.json()[0]) == {"id", "text", "url", "min_price"}
+
+    def test_by_artist_fields_keeps_pagination(self):
+        response = client.get("/api/events/by-artist?artist=Coldplay&fields=text")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["events"][0]) == {"id", "text"}
+        assert data["pagination"]["limit"] == 20
+
+    def test_unknown_field_is_rejected(self):
+        response = client.get("/api/events?date=2025-12-15&fields=nope")
+        assert response.status_code == 422
+
+    def test_projection_changes_etag(self):
+        full = client.get("/api/events?date=2025-12-15").headers["etag"]
+        sparse = client.get("/api/events?date=2025-12-15&fields=text").headers["etag"]
+        assert full != sparse
@@ -0,0 +1,99 @@
+
+import pytest
+from api.services.collector import MultiCollector
+from api.services.provider_policy import AdaptiveProviderPolicy, parse_tiers, query_segment
+from api.collectors.base import EventSearchQuery, ArtistSearchQuery
+from api.models.event import EventMention
+from tests.test_collector_service import MockCollector
+
+SEGMENT = ("IL", "*")
+
+
+def _train(policy, provider, hits, misses, latency):
+    for _ in range(hits):
+        policy.record(provider, SEGMENT, True, latency)
+    for _ in range(misses):
+        policy.record(provider, SEGMENT, False, latency)
+
+
+def test_cold_start_keeps_configured_order():
+    policy = AdaptiveProviderPolicy(min_samples=5)
+    ordered, skipped = policy.order(["ticketmaster", "viagogo"], SEGMENT)
+    assert ordered == ["ticketmaster", "viagogo"]
+    assert skipped == []
+
+
+def test_orders_by_expected_latency_to_result():
+    policy = AdaptiveProviderPolicy(min_samples=5, skip_below=0.0)
+    _train(policy, "ticketmaster", hits=2, misses=18, latency=0.8)
+    _train(policy, "viagogo", hits=18, misses=2, latency=0.3)
+
+    ordered, _ = policy.order(["ticketmaster", "viagogo"], SEGMENT)
+    assert ordered == ["viagogo", "ticketmaster"]
+
+    # Stats are per segment: another country is still cold
+    ordered, _ = policy.order(["ticketmaster", "viagogo"], ("US", "*"))
+    assert ordered == ["ticketmaster", "viagogo"]
+    assert policy.decisions[-1]["segment"] == ["US", "*"]
+
+
+def test_priority_tiers_are_never_reordered():
+    policy = AdaptiveProviderPolicy(tiers={"ticketmaster": 0, "viagogo": 1}, min_samples=5, skip_below=0.0)
+    _train(policy, "ticketmaster", hits=1, misses=19, latency=0.9)
+    _train(policy, "viagogo", hits=20, misses=0, latency=0.1)
+
+    ordered, _ = policy.order(["ticketmaster", "viagogo"], SEGMENT)
+    assert ordered == ["ticketmaster", "viagogo"]
+
+
+def test_cold_provider_keeps_its_position():
+    """A trusted provider is not moved behind one that has no samples yet."""
+    policy = AdaptiveProviderPolicy(min_samples=5, skip_below=0.0, explore_rate=0.0)
+    _train(policy, "ticketmaster", hits=2, misses=18, latency=0.8)
+
+    ordered, _ = policy.order(["ticketmaster", "viagogo"], SEGMENT)
+    assert ordered == ["ticketmaster", "viagogo"]
+
+    # Trusted providers still swap among their own slots around a cold one
+    _train(policy, "stubhub", hits=20, misses=0, latency=0.1)
+    ordered, _ = policy.order(["ticketmaster", "viagogo", "stubhub"], SEGMENT)
+    assert ordered == ["stubhub", "viagogo", "ticketmaster"]
+
+
+def test_skips_empty_provider_but_keeps_one():
+    policy = AdaptiveProviderPolicy(min_samples=5, skip_below=0.2, explore_rate=0.0)
+    _train(policy, "ticketmaster", hits=0, misses=30, latency=0.5)
+    _train(policy, "viagogo", hits=0, misses=30, latency=0.5)
+
+    ordered, skipped = policy.order(["ticketmaster", "viagogo"], SEGMENT)
+    assert ordered == ["ticketmaster"]
+    assert skipped == ["viagogo"]
+
+
+def test_query_segment_and_tier_parsing():
+    assert query_segment(EventSearchQuery(date="2025-01-01", category=" Music ", country_code="il")) == ("IL", "music")
+    assert query_segment(EventSearchQuery(date="2025-01-01", category="Concerts", country_code="il")) == ("IL", "music")
+    assert query_segment(EventSearchQuery(date="2025-01-01", category="x7f3", country_code="il")) == ("IL", "*")
+    assert query_segment(ArtistSearchQuery(artist="Coldplay")) == ("US", "artist")
+    assert query_segment(EventSearchQuery(date="2025-01-01", category="music", country_code="zz-q7")) == ("*", "music")
+    assert parse_tiers("ticketmaster=0, viagogo=1") == {"ticketmaster": 0, "viagogo": 1}
+    assert parse_tiers("") == {}
+
+
+@pytest.mark.asyncio
+async def test_multicollector_follows_learned_order():
+    event = EventMention(id="v1", text="E", url="http://v", timestamp="2025-01-01", venue_name="V", city="C", provider="viagogo")
+    empty = MockCollector("ticketmaster")
+    full = MockCollector("viagogo", events=[event])
+    policy = AdaptiveProviderPolicy(min_samples=3, skip_below=0.0)
+    service = MultiCollector(collectors=[empty, full], policy=policy)
+
+    # Distinct pages keep the negative cache out of the way while stats build up
+    for page in range(3):
+        await service.search(EventSearchQuery(date="2025-01-01", page=page))
+
+    empty.search_called = False
+    events = await service.search(EventSearchQuery(date="2025-01-01", page=99))
+    assert events == [event]
+    assert not empty.search_called
+    assert policy.decisions[-1]["order"] == ["viagogo", "ticketmaster"]
@@ -0,0 +1,63 @@
+"""Tests for local Ticketmaster resolution."""
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.resolver import TrigramResolver
+from api.services.store import EventStore
+
+client = TestClient(app)
+
+
+def _event(event_id: str, text: str, date="2025-12-15", city="Tel Aviv", provider="ticketmaster") -> EventMention:
+    return EventMention(
+        id=event_id, text=text, url=f"https://www.ticketmaster.com/event/{event_id}", timestamp=date,
+        venue_name="V", city=city, provider=provider
+    )
+
+
+@pytest.mark.asyncio
+async def test_matches_within_date_and_city_block():
+    store = EventStore()
+    resolver = TrigramResolver(store)
+    await store.upsert_many([
+        _event("tm-1", "Coldplay - Music of the Spheres World Tour"),
+        _event("tm-2", "Ed Sheeran: Mathematics Tour"),
+        _event("tm-3", "Coldplay - Music of the Spheres World Tour", date="2025-12-16"),
+        _event("vg-1", "Coldplay", provider="viagogo")
+    ])
+    assert len(resolver) == 3
+
+    assert resolver.resolve("COLDPLAY", "tel aviv", "2025-12-15").id == "tm-1"
+    assert resolver.resolve("Coldplay", "TLV", "2025-12-15").id == "tm-1"
+    assert resolver.resolve("Ed Sheeran - Mathematics", "Tel Aviv", "2025-12-15").id == "tm-2"
+    # Other cities, other days and unrelated names stay unresolved
+    assert resolver.resolve("Coldplay", "Haifa", "2025-12-15") is None
+    assert resolver.resolve("Coldplay", "Tel Aviv", "2025-12-17") is None
+    assert resolver.resolve("Imagine Dragons", "Tel Aviv", "2025-12-15") is None
+    assert (resolver.hits, resolver.misses) == (3, 3)
+
+    # Two equally good candidates are ambiguous; dropping one settles it
+    await store.upsert_many([_event("tm-4", "Coldplay - Music of the Spheres (Late Show)")])
+    assert resolver.resolve("Coldplay Music of the Spheres", "Tel Aviv", "2025-12-15") is None
+    del store["tm-4"]
+    assert resolver.resolve("Coldplay Music of the Spheres", "Tel Aviv", "2025-12-15").id == "tm-1"
+
+
+def test_package_resolves_locally_without_network():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        client.get("/api/events?date=2031-05-01&city=Resolver City")
+    event = _event("vg-resolve", "Ed Sheeran", date="2031-05-01", city="Resolver City", provider="viagogo")
+    event = event.model_copy(update={"url": "https://www.viagogo.com/e/1"})
+
+    with patch.dict("api.routes.events._events_cache", {event.id: event}):
+        with patch("api.collectors.ticketmaster.TicketmasterCollector.resolve_event", new_callable=AsyncMock) as mock_resolve:
+            tickets = client.get(f"/api/events/{event.id}/package").json()["tickets"]
+            assert mock_resolve.await_count == 0
+    assert tickets == {
+        "url": "https://www.ticketmaster.com/ed-sheeran-tickets/artist/1616239",
+        "ticket_provider": "ticketmaster"
+    }
@@ -0,0 +1,155 @@
+"""Tests for the two-tier (L1 + Redis-protocol L2) cache."""
+import asyncio
+import pytest
+from api.collectors.ticketmaster import TicketmasterCollector
+from api.services.cache import CacheEntry, RedisBackend, TieredCache
+from api.services.codec import pack_events, unpack_events
+from api.services.search_cache import SearchCache
+from api.collectors.base import EventSearchQuery
+from api.services.store import EventStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _backend(server) -> RedisBackend:
+    return RedisBackend(fakeredis.FakeAsyncRedis(server=server), namespace="test")
+
+
+def _text_cache(backend: RedisBackend) -> TieredCache:
+    return TieredCache("text", ttl=60, encode=str.encode, decode=bytes.decode, l2=backend)
+
+
+class TestEventCodec:
+    """Tests for the compact EventMention encoding."""
+
+    def test_round_trip(self):
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+        assert unpack_events(pack_events(events)) == events
+
+    def test_smaller_than_json(self):
+        events = TicketmasterCollector()._get_mock_artist_events("Coldplay")[0]
+        json_size = sum(len(e.model_dump_json()) for e in events)
+        assert len(pack_events(events)) < json_size / 2
+
+    def test_rejects_foreign_payload(self):
+        with pytest.raises(ValueError):
+            unpack_events(b"\x09\x00\x00\x00\x00garbage")
+
+
+class TestTieredCache:
+    """Tests for L1/L2 interaction across simulated workers."""
+
+    @pytest.mark.asyncio
+    async def test_l2_shares_entries_between_workers(self):
+        server = fakeredis.FakeServer()
+        worker_a, worker_b = _text_cache(_backend(server)), _text_cache(_backend(server))
+
+        written = await worker_a.set("k", "value", version="v1")
+        entry = await worker_b.get("k")
+
+        assert entry.value == "value"
+        assert entry.version == "v1"
+        assert entry.expires_at == pytest.approx(written.expires_at)
+
+    @pytest.mark.asyncio
+    async def test_batched_get_mixes_l1_and_l2(self):
+        server = fakeredis.FakeServer()
+        worker_a, worker_b = _text_cache(_backend(server)), _text_cache(_backend(server))
+        await worker_a.set_many({"a": ("1", "v"), "b": ("2", "v")})
+        await worker_b.set("c", "3")
+
+        found = await worker_b.get_many(["a", "b", "c", "missing"])
+
+        assert {k: e.value for k, e in found.items()} == {"a": "1", "b": "2", "c": "3"}
+
+    @pytest.mark.asyncio
+    async def test_remote_write_invalidates_l1(self):
+        server = fakeredis.FakeServer()
+        backend_a, backend_b = _backend(server), _backend(server)
+        worker_a, worker_b = _text_cache(backend_a), _text_cache(backend_b)
+        await worker_b.set("k", "old")
+
+        listener = asyncio.create_task(backend_b.listen_for_invalidations())
+        await asyncio.sleep(0.05)
+        await worker_a.set("k", "new")
+        for _ in range(50):
+            if worker_b.get_local("k") is None:
+                break
+            await asyncio.sleep(0.01)
+        listener.cancel()
+
+        assert worker_b.get_local("k") is None
+        assert (await worker_b.get("k")).value == "new"
+
+    @pytest.mark.asyncio
+    async def test_search_results_survive_l2_round_trip(self):
+        server = fakeredis.FakeServer()
+        cache_a = SearchCache(ttl=60, l2=_backend(server))
+        cache_b = SearchCache(ttl=60, l2=_backend(server))
+        query = EventSearchQuery(date="2025-12-15")
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+
+        written = await cache_a.put(query, events, len(events))
+        entry = await cache_b.get(query)
+
+        assert entry.value.events == events
+        assert entry.version == written.version
+
+    @pytest.mark.asyncio
+    async def test_event_store_reads_through_to_l2(self):
+        server = fakeredis.FakeServer()
+        store_a, store_b = EventStore(l2=_backend(server)), EventStore(l2=_backend(server))
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+
+        await store_a.upsert_many(events)
+
+        assert "mock-1" not in store_b
+        assert (await store_b.fetch("mock-1")) == events[0]
+        assert "mock-1" in store_b
+
+    @pytest.mark.asyncio
+    async def test_event_store_publishes_and_drops_only_changed_events(self):
+        server = fakeredis.FakeServer()
+        backend_a, backend_b = _backend(server), _backend(server)
+        store_a, store_b = EventStore(l2=backend_a), EventStore(l2=backend_b)
+        events = TicketmasterCollector()._get_mock_events("2025-12-15")
+        await store_a.upsert_many(events)
+        await store_b.upsert_many(events)
+
+        published = []
+        original = backend_a._publish
+
+        async def record(keys, versions=None):
+            published.extend(keys)
+            await original(keys, versions)
+
+        backend_a._publish = record
+        changes = []
+        store_b.add_change_listener(changes.extend)
+        listener = asyncio.create_task(backend_b.listen_for_invalidations())
+        await asyncio.sleep(0.05)
+
+        # An identical re-store is not published at all
+        await store_a.upsert_many(events)
+        assert published == []
+
+        # Identical content announced by another worker keeps the local copy
+        await backend_a.set_many({"event:mock-1": (pack_events([events[0]]), 60)})
+        changed = events[1].model_copy(update={"venue_name": "Elsewhere"})
+        await store_a.upsert_many([events[0], changed])
+        for _ in range(50):
+            if "mock-2" not in store_b:
+                break
+            await asyncio.sleep(0.01)
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+
+        assert published == ["event:mock-1", "event:mock-2"]
+        assert "mock-1" in store_b and "mock-2" not in store_b
+        assert changes == ["mock-2"]
+
+    def test_corrupt_compressed_entry_is_a_miss(self):
+        cache = TieredCache("events", ttl=60, encode=pack_events, decode=unpack_events)
+        packed = cache._pack(CacheEntry(value=[], version="v", stored_at=0, expires_at=60))
+        assert cache._unpack(packed[:-4] + b"\x00\x00\x00\x00") is None
+
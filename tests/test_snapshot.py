@@ -0,0 +1,126 @@
+"""Tests for warm-start snapshots."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.collectors.base import EventSearchQuery
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.snapshot import EventSnapshot, write_snapshot
+from api.services.store import EventStore
+
+client = TestClient(app)
+
+
+def _event(event_id: str, city: str = "Tel Aviv") -> EventMention:
+    return EventMention(id=event_id, text=event_id, url="https://x", timestamp="2025-12-15", venue_name="V", city=city)
+
+
+def test_round_trip_with_lazy_blocks(tmp_path):
+    path = str(tmp_path / "events.snap")
+    events = [_event(f"e{i}") for i in range(10)]
+    size = write_snapshot(path, events, {"search": [("q1", b"payload")]}, block_size=4)
+    assert size == (tmp_path / "events.snap").stat().st_size
+
+    snapshot = EventSnapshot(path, cached_blocks=1)
+    try:
+        assert len(snapshot) == 10 and "e9" in snapshot and "zz" not in snapshot
+        assert snapshot.get("e5") == events[5]
+        assert snapshot.get_many(["e0", "e9", "zz"]) == {"e0": events[0], "e9": events[9]}
+        assert [len(block) for block in snapshot.blocks()] == [4, 4, 2]
+        assert snapshot.cache_items("search") == [("q1", b"payload")]
+        assert snapshot.cache_items("resolution") == []
+    finally:
+        snapshot.close()
+
+    (tmp_path / "bad.snap").write_bytes(b"not a snapshot at all, no sir")
+    with pytest.raises(ValueError):
+        EventSnapshot(str(tmp_path / "bad.snap"))
+
+
+@pytest.mark.asyncio
+async def test_store_serves_then_hydrates_snapshot(tmp_path):
+    path = str(tmp_path / "events.snap")
+    write_snapshot(path, [_event("a"), _event("b"), _event("c")], {}, block_size=2)
+
+    store = EventStore()
+    changes = []
+    store.add_change_listener(changes.extend)
+    store["b"] = _event("b", city="Haifa")
+    store.attach_snapshot(EventSnapshot(path))
+    assert store.hydrating and "a" not in store
+
+    assert (await store.fetch("a")).city == "Tel Aviv"
+    assert await store.hydrate() == 1
+    assert not store.hydrating
+    # L1 copies are newer than the snapshot's
+    assert store["b"].city == "Haifa" and store["c"].city == "Tel Aviv"
+    assert changes == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_save_and_restore_caches(tmp_path):
+    path = str(tmp_path / "api.snap")
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        client.get("/api/events?date=2031-06-01&city=Snapshot City")
+    await events_routes.save_snapshot(path)
+
+    events_routes._search_cache.clear()
+    query = EventSearchQuery(date="2031-06-01", city="Snapshot City")
+    assert await events_routes._search_cache.get(query) is None
+
+    snapshot = events_routes.restore_snapshot(path)
+    assert snapshot is not None and "mock-1" in snapshot
+    entry = await events_routes._search_cache.get(query)
+    assert [e.id for e in entry.value.events] == ["mock-1", "mock-2"]
+    # Skipped while hydrating, so the older but fuller snapshot is kept
+    written = (tmp_path / "api.snap").stat().st_mtime_ns
+    await events_routes.save_snapshot(path)
+    assert (tmp_path / "api.snap").stat().st_mtime_ns == written
+    assert await events_routes._events_cache.hydrate() >= 0
+    assert not events_routes._events_cache.hydrating
+
+    assert events_routes.restore_snapshot(str(tmp_path / "missing.snap")) is None
+    with patch("api.config.SNAPSHOT_MAX_AGE", -1):
+        assert events_routes.restore_snapshot(path) is None
+
+
+@pytest.mark.asyncio
+async def test_feed_snapshot_reaches_store_and_indexes(tmp_path):
+    path = str(tmp_path / "feed.snap")
+    feed = [_event("feed-snap-1", city="Feedville"), _event("feed-snap-2", city="Feedville")]
+    write_snapshot(path, feed, {})
+
+    loaded_at = await events_routes.load_feed_snapshot(path)
+    assert loaded_at > 0 and "feed-snap-1" in events_routes._events_cache
+    assert sum(events_routes._calendar.month("Feedville", "2025-12").get("2025-12-15", {}).values()) == 2
+
+    # An unchanged file is not loaded again
+    assert await events_routes.load_feed_snapshot(path, loaded_at) == loaded_at
+    assert await events_routes.load_feed_snapshot(str(tmp_path / "missing.snap")) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_newer_feed_snapshot_updates_loaded_events(tmp_path):
+    first, second = str(tmp_path / "feed-1.snap"), str(tmp_path / "feed-2.snap")
+    write_snapshot(first, [_event("f1").model_copy(update={"min_price": 100.0})], {})
+    store = EventStore()
+    changes = []
+    store.add_change_listener(changes.extend)
+
+    snapshot = EventSnapshot(first)
+    assert await store.load(snapshot, replace=True) == 1
+    snapshot.close()
+
+    write_snapshot(second, [_event("f1").model_copy(update={"min_price": 80.0})], {})
+    snapshot = EventSnapshot(second)
+    assert await store.load(snapshot, replace=True) == 1
+    assert store["f1"].min_price == 80.0 and changes == ["f1", "f1"]
+
+    # A provider refresh newer than the feed wins; so does L1 on warm starts
+    await store.upsert_many([_event("f1").model_copy(update={"min_price": 60.0})])
+    assert await store.load(snapshot, replace=True) == 0
+    assert await store.load(snapshot) == 0
+    assert store["f1"].min_price == 60.0
+    snapshot.close()
@@ -0,0 +1,99 @@
+"""Tests for the streaming search endpoint."""
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.collectors.base import EventCollector, EventSearchQuery
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.collector import MultiCollector
+
+client = TestClient(app)
+
+
+class DelayedCollector(EventCollector):
+    def __init__(self, name: str, delay: float, events=None, error: Exception = None):
+        self.name = name
+        self.delay = delay
+        self.events = events or []
+        self.error = error
+
+    async def search(self, query: EventSearchQuery):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [e.model_copy(update={"city": query.city}) for e in self.events]
+
+    async def search_by_artist(self, query):
+        return [], 0
+
+
+def _event(event_id: str) -> EventMention:
+    return EventMention(id=event_id, text=event_id, url="https://x", timestamp="2026-05-01", venue_name="V", city="C")
+
+
+@pytest.mark.asyncio
+async def test_search_each_yields_in_completion_order():
+    slow = DelayedCollector("slow", 0.05, [_event("s1")])
+    fast = DelayedCollector("fast", 0.0, [_event("f1")])
+    broken = DelayedCollector("broken", 0.01, error=RuntimeError("boom"))
+    empty = DelayedCollector("empty", 0.0)
+    service = MultiCollector(collectors=[slow, fast, broken, empty])
+
+    queries = [EventSearchQuery(date="2026-05-01", city="A"), EventSearchQuery(date="2026-05-01", city="B")]
+    results = [r async for r in service.search_each(queries)]
+
+    assert len(results) == 8
+    assert [r.provider for r in results[-2:]] == ["slow", "slow"]
+    by_status = {(r.provider, r.query.city): r.status for r in results}
+    assert by_status[("fast", "B")] == "ok" and by_status[("empty", "A")] == "empty"
+    assert by_status[("broken", "A")] == "error"
+    assert all(r.error == "boom" for r in results if r.provider == "broken")
+    # Empty answers are remembered like in the fallback search
+    assert await service._known_empty(service._negative_key(empty, queries[0]))
+
+
+def _frames(body: str):
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+def test_stream_ndjson_ends_with_summary():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        events_routes._multi_collector.negative_cache.clear_local()
+        response = client.get("/api/events/stream?date=2031-07-01&city=Stream City&fields=id,city")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    frames = _frames(response.text)
+    batches, summary = frames[:-1], frames[-1]
+    assert {f["provider"] for f in batches} == {"ticketmaster", "viagogo"}
+    ids = [e["id"] for f in batches for e in f["events"]]
+    assert len(ids) == len(set(ids)) and "mock-1" in ids
+    assert batches[0]["events"][0].keys() == {"id", "city"}
+    assert summary["type"] == "summary" and summary["total"] == len(ids)
+    assert sum(summary["providers"].values()) == len(ids) and summary["failures"] == []
+    # Streamed events are available for packages
+    assert events_routes._events_cache["mock-1"].city == "Stream City"
+
+
+def test_stream_sse_serves_cached_search_first():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        client.get("/api/events?date=2031-07-02&city=Cached City")
+        response = client.get("/api/events/stream?date=2031-07-02&city=Cached City&format=sse")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [f for f in response.text.split("\n\n") if f]
+    assert frames[0].startswith("event: events\ndata: ")
+    first = json.loads(frames[0].split("data: ", 1)[1])
+    assert first["provider"] == "cache" and [e["id"] for e in first["events"]] == ["mock-1", "mock-2"]
+    assert frames[-1].startswith("event: summary\n")
+
+
+def test_stream_validates_parameters():
+    assert client.get("/api/events/stream?date=2031-07-01&format=xml").status_code == 422
+    cities = ",".join(f"C{i}" for i in range(20))
+    assert client.get(f"/api/events/stream?date=2031-07-01&city={cities}").status_code == 422
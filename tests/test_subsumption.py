@@ -0,0 +1,83 @@
+"""Tests for answering narrow searches from cached broader results."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.collectors.base import EventSearchQuery
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.search_cache import SearchCache
+
+client = TestClient(app)
+
+
+def _event(event_id: str, city: str, category: str) -> EventMention:
+    return EventMention(
+        id=event_id, text=event_id, url="https://x", timestamp="2026-05-01",
+        venue_name="V", city=city, category=category
+    )
+
+
+BROAD_EVENTS = [
+    _event("e1", "Haifa", "music"),
+    _event("e2", "Tel Aviv", "sports"),
+    _event("e3", "haifa ", "arts & theatre"),
+    _event("e4", "Haifa", "sports"),
+]
+
+
+@pytest.mark.asyncio
+async def test_complete_broad_result_answers_narrow_queries():
+    cache = SearchCache(ttl=60, subsume=True, subsumable_categories=["music", "sports", "arts"])
+    broad = EventSearchQuery(date="2026-05-01", limit=20)
+    stored = await cache.put(broad, BROAD_EVENTS, len(BROAD_EVENTS))
+
+    entry = await cache.get(EventSearchQuery(date="2026-05-01", city="HAIFA"))
+    assert [e.id for e in entry.value.events] == ["e1", "e3", "e4"]
+    assert entry.version != stored.version and entry.expires_at == stored.expires_at
+
+    entry = await cache.get(EventSearchQuery(date="2026-05-01", city="Haifa", category="arts"))
+    assert [e.id for e in entry.value.events] == ["e3"]
+    entry = await cache.get(EventSearchQuery(date="2026-05-01", city="Haifa", limit=2, page=1))
+    assert [e.id for e in entry.value.events] == ["e4"]
+    assert cache.subsumed_hits == 3
+
+    # Not covered: other date or country, unlisted category, nothing left after filtering
+    assert await cache.get(EventSearchQuery(date="2026-05-02", city="Haifa")) is None
+    assert await cache.get(EventSearchQuery(date="2026-05-01", city="Haifa", country_code="US")) is None
+    assert await cache.get(EventSearchQuery(date="2026-05-01", category="family")) is None
+    assert await cache.get(EventSearchQuery(date="2026-05-01", city="Eilat")) is None
+
+
+@pytest.mark.asyncio
+async def test_truncated_results_are_not_used():
+    cache = SearchCache(ttl=60, subsume=True, subsumable_categories=["sports"])
+    await cache.put(EventSearchQuery(date="2026-05-01", limit=4), BROAD_EVENTS, 4)
+    await cache.put(EventSearchQuery(date="2026-05-01", limit=20, page=1), BROAD_EVENTS, 4)
+    assert await cache.get(EventSearchQuery(date="2026-05-01", city="Haifa")) is None
+
+    cache = SearchCache(ttl=60)
+    await cache.put(EventSearchQuery(date="2026-05-01"), BROAD_EVENTS, 4)
+    assert await cache.get(EventSearchQuery(date="2026-05-01", city="Haifa")) is None
+
+
+@pytest.mark.asyncio
+async def test_index_survives_dump_and_load():
+    cache = SearchCache(ttl=60, subsume=True, subsumable_categories=["sports"])
+    await cache.put(EventSearchQuery(date="2026-05-01", city="Haifa"), BROAD_EVENTS[:1], 1)
+    restored = SearchCache(ttl=60, subsume=True, subsumable_categories=["sports"])
+    assert restored.load(cache.dump()) == 1
+    entry = await restored.get(EventSearchQuery(date="2026-05-01", city="haifa", category="music"))
+    assert entry is None  # "music" is not subsumable here
+    entry = await restored.get(EventSearchQuery(date="2026-05-01", city=" haifa"))
+    assert [e.id for e in entry.value.events] == ["e1"]
+
+
+def test_narrow_search_skips_upstream():
+    with patch("api.config.TICKETMASTER_API_KEY", "test"):
+        events_routes._search_cache.clear()
+        client.get("/api/events?date=2031-09-01&city=Subsume City")
+        with patch.object(events_routes._multi_collector, "search") as search:
+            response = client.get("/api/events?date=2031-09-01&city=subsume city&category=music")
+            assert not search.called
+    assert [e["id"] for e in response.json()] == ["mock-1", "mock-2"]
@@ -0,0 +1,84 @@
+"""Tests for the autocomplete index and route."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.models.event import EventMention
+from api.routes import events as events_routes
+from api.services.store import EventStore
+from api.services.suggest import CACHE_RANGE_OVER, SuggestIndex, normalize
+
+client = TestClient(app)
+
+
+def _event(event_id: str, text: str, venue: str = "Yarkon Park", city: str = "Tel Aviv", popularity=None) -> EventMention:
+    return EventMention(
+        id=event_id, text=text, url="https://x", timestamp="2025-12-15", venue_name=venue, city=city,
+        scores={} if popularity is None else {"popularity": popularity}
+    )
+
+
+def _texts(terms):
+    return [t.text for t in terms]
+
+
+def test_normalize():
+    assert normalize("  Beyoncé -  RENAISSANCE!") == "beyonce renaissance"
+
+
+@pytest.mark.asyncio
+async def test_ranks_by_popularity_and_follows_store():
+    store = EventStore()
+    index = SuggestIndex(store)
+    await store.upsert_many([
+        _event("1", "Coldplay - Music of the Spheres", venue="Bloomfield Stadium", popularity=0.9),
+        _event("2", "Coldplay - Music of the Spheres", venue="Bloomfield Stadium", popularity=0.8),
+        _event("3", "Cold War Kids", venue="Barby", popularity=0.95),
+        _event("4", "Ed Sheeran - Mathematics Tour", city="Haifa", popularity=0.92)
+    ])
+    assert _texts(index.suggest("cold")) == ["Coldplay - Music of the Spheres", "Cold War Kids"]
+    # Any word of a name matches, and kinds can be filtered
+    assert _texts(index.suggest("SHEER")) == ["Ed Sheeran - Mathematics Tour"]
+    assert _texts(index.suggest("b", kind="venue")) == ["Bloomfield Stadium", "Barby"]
+    assert index.suggest("zz") == [] and index.suggest("  ") == []
+
+    # Dropping events lowers or removes their terms
+    del store["1"]
+    del store["2"]
+    assert _texts(index.suggest("cold")) == ["Cold War Kids"]
+    assert _texts(index.suggest("haifa")) == ["Haifa"]
+    await store.upsert_many([_event("4", "Ed Sheeran - Mathematics Tour", city="Tel Aviv", popularity=0.92)])
+    assert index.suggest("haifa") == []
+
+
+@pytest.mark.asyncio
+async def test_cached_prefix_is_invalidated():
+    store = EventStore()
+    index = SuggestIndex(store)
+    await store.upsert_many([
+        _event(str(i), f"Artist {i}", popularity=0.5) for i in range(CACHE_RANGE_OVER + 1)
+    ])
+    assert len(index.suggest("a", limit=20, kind="event")) == 20
+    await store.upsert_many([_event("top", "Aardvark", popularity=5.0)])
+    assert index.suggest("a", kind="event")[0].text == "Aardvark"
+    # Dropping a listed term makes the cached list too short, so it is rebuilt
+    del store["top"]
+    del store["0"]
+    assert len(index.suggest("a", limit=20, kind="event")) == 20
+    assert "Aardvark" not in [t.text for t in index.suggest("a", limit=20)]
+
+
+class TestSuggestEndpoint:
+    @pytest.fixture(autouse=True)
+    def mock_mode(self):
+        events_routes._search_cache.clear()
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    def test_suggests_searched_events(self):
+        client.get("/api/events?date=2025-12-15&city=Tel Aviv")
+        body = client.get("/api/suggest?q=ed she").json()
+        assert body["suggestions"][0]["text"] == "Ed Sheeran - Mathematics Tour"
+        assert body["suggestions"][0]["kind"] == "event"
+        assert client.get("/api/suggest?q=").status_code == 422
+        assert client.get("/api/suggest?q=x&kind=artist").status_code == 422
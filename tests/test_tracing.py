@@ -0,0 +1,83 @@
+"""Tests for request tracing and the Server-Timing header."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from api.main import app
+from api.services import tracing
+from api.routes import events as events_routes
+
+
+client = TestClient(app)
+
+
+class TestTraceRendering:
+    """Tests for Trace aggregation and formatting."""
+
+    def test_server_timing_sums_spans_by_name(self):
+        """Spans with the same name should be merged into one metric."""
+        trace = tracing.Trace("/api/events")
+        trace.add("ticketmaster.http", 0.0, 0.010)
+        trace.add("ticketmaster.http", 0.0, 0.005)
+        trace.add("serialize", 0.0, 0.001)
+
+        header = trace.server_timing()
+
+        assert 'ticketmaster.http;dur=15.0;desc="x2"' in header
+        assert "serialize;dur=1.0" in header
+        assert "total;dur=" in header
+
+    def test_span_is_noop_without_trace(self):
+        """span() should do nothing when the request is not sampled."""
+        with tracing.span("anything"):
+            pass
+        assert tracing.current_trace() is None
+
+
+class TestServerTimingHeader:
+    """Tests for the tracing middleware."""
+
+    @pytest.fixture(autouse=True)
+    def mock_api_key(self):
+        """Force mock mode for these tests."""
+        with patch("api.config.TICKETMASTER_API_KEY", "test"):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def cold_cache(self):
+        """Make every request reach the collectors."""
+        events_routes._search_cache.clear()
+
+    def test_sampled_request_has_stage_breakdown(self):
+        """Sampled event searches should report collector and serialize spans."""
+        with patch("api.config.TRACE_SAMPLE_RATE", 1.0):
+            response = client.get("/api/events?date=2025-12-15")
+
+        assert response.status_code == 200
+        header = response.headers["server-timing"]
+        assert "search;dur=" in header
+        assert "ticketmaster;dur=" in header
+        assert "serialize;dur=" in header
+
+    def test_unsampled_request_has_no_header(self):
+        """Requests outside the sample should not carry Server-Timing."""
+        with patch("api.config.TRACE_SAMPLE_RATE", 0.0):
+            response = client.get("/api/events?date=2025-12-15")
+
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+
+    def test_debug_trace_is_retrievable(self):
+        """X-Debug-Trace should force a trace and expose it as JSON."""
+        with patch("api.config.TRACE_SAMPLE_RATE", 0.0), patch("api.config.TRACE_DEBUG", True):
+            response = client.get("/api/events?date=2025-12-15", headers={"X-Debug-Trace": "1"})
+            trace_id = response.headers["x-trace-id"]
+            trace = client.get(f"/api/debug/traces/{trace_id}").json()
+
+        assert trace["path"] == "/api/events"
+        assert any(s["name"] == "ticketmaster" for s in trace["spans"])
+
+    def test_debug_endpoint_disabled_by_default(self):
+        """The debug trace endpoint should 404 unless TRACE_DEBUG is on."""
+        with patch("api.config.TRACE_DEBUG", False):
+            response = client.get("/api/debug/traces/abc")
+        assert response.status_code == 404
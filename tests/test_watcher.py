@@ -0,0 +1,148 @@
+"""Tests for the price-change watcher."""
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from api.collectors.base import EventCollector
+from api.models.event import EventMention
+from api.services.deadline import LatencyTracker, current_provider_timeout
+from api.services.sse import sse_frame
+from api.services.store import EventStore
+from api.services.watcher import PriceWatcher, diff_event
+
+client = TestClient(app)
+
+
+def _event(event_id: str, min_price: float = 100.0, **overrides) -> EventMention:
+    data = dict(
+        id=event_id, text="Show", url="https://www.ticketmaster.com/event/x", timestamp="2025-12-15",
+        venue_name="Venue", city="Tel Aviv", provider="ticketmaster",
+        min_price=min_price, max_price=300.0, has_tickets=True
+    )
+    data.update(overrides)
+    return EventMention(**data)
+
+
+class LookupCollector(EventCollector):
+    """Returns preset fresh events and records each batch it is asked for."""
+    name = "ticketmaster"
+
+    def __init__(self, fresh):
+        self.fresh = {e.id: e for e in fresh}
+        self.batches = []
+
+    async def search(self, query):
+        return []
+
+    async def search_by_artist(self, query):
+        return [], 0
+
+    async def fetch_by_ids(self, event_ids):
+        self.batches.append(list(event_ids))
+        return [self.fresh[i] for i in event_ids if i in self.fresh]
+
+
+class SlowCollector(LookupCollector):
+    """Never answers in time; records the provider timeout it was given."""
+
+    async def fetch_by_ids(self, event_ids):
+        self.batches.append(current_provider_timeout(-1.0))
+        await asyncio.sleep(10)
+        return []
+
+
+def test_diff_only_reports_watched_fields():
+    old = _event("e1")
+    new = _event("e1", min_price=90.0, venue_name="Elsewhere")
+    assert diff_event(old, new) == {"min_price": 90.0}
+    assert diff_event(old, old) == {}
+
+
+@pytest.mark.asyncio
+async def test_shared_poll_pushes_only_changes():
+    store = EventStore()
+    await store.upsert_many([_event("e1"), _event("e2")])
+    collector = LookupCollector([_event("e1", min_price=80.0), _event("e2")])
+    watcher = PriceWatcher(store, [collector], batch_size=50)
+
+    first = watcher.subscribe(["e1", "e2"])
+    second = watcher.subscribe(["e1"])
+    assert await watcher.poll_once() == 1
+
+    # Two clients on e1, one upstream lookup covering both events
+    assert collector.batches == [["e1", "e2"]]
+    assert first.queue.get_nowait() == {"id": "e1", "changes": {"min_price": 80.0}}
+    assert second.queue.get_nowait() == {"id": "e1", "changes": {"min_price": 80.0}}
+    assert first.queue.empty()
+    assert store["e1"].min_price == 80.0
+
+    # No further change, nothing pushed
+    assert await watcher.poll_once() == 0
+    assert first.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_poll_refreshes_all_price_fields():
+    """The stored event takes the fresh price range and currency, not just the watched fields."""
+    store = EventStore()
+    await store.upsert_many([_event("e1", price_range="100-300 ILS", currency="ILS")])
+    fresh = _event("e1", min_price=25.0, max_price=80.0, price_range="25-80 USD", currency="USD", venue_name="Elsewhere")
+    watcher = PriceWatcher(store, [LookupCollector([fresh])])
+    watcher.subscribe(["e1"])
+
+    await watcher.poll_once()
+    stored = store["e1"]
+    assert (stored.min_price, stored.max_price, stored.price_range, stored.currency) == (25.0, 80.0, "25-80 USD", "USD")
+    assert stored.venue_name == "Venue"
+
+
+@pytest.mark.asyncio
+async def test_unstarted_watch_stream_holds_no_subscription():
+    """A watch response that is never streamed does not leave its events watched."""
+    from starlette.requests import Request
+    from api.routes import events as events_routes
+
+    response = await events_routes.watch_events(Request({"type": "http"}), ids="never-streamed")
+    await response.body_iterator.aclose()
+    assert "never-streamed" not in events_routes._price_watcher.watched_ids
+
+
+@pytest.mark.asyncio
+async def test_batches_and_unsubscribe():
+    store = EventStore()
+    await store.upsert_many([_event(f"e{i}") for i in range(5)] + [_event("vg", provider="viagogo")])
+    collector = LookupCollector([])
+    watcher = PriceWatcher(store, [collector], batch_size=2)
+
+    subscription = watcher.subscribe([f"e{i}" for i in range(5)] + ["vg", "unknown"])
+    await watcher.poll_once()
+    assert sorted(len(b) for b in collector.batches) == [1, 2, 2]
+
+    watcher.unsubscribe(subscription)
+    assert watcher.watched_ids == []
+
+
+def test_sse_frame_format():
+    assert sse_frame("change", {"id": "e1"}) == b'event: change\ndata: {"id":"e1"}\n\n'
+
+
+def test_watch_requires_ids():
+    assert client.get("/api/events/watch?ids=").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_poll_is_bounded_by_timeout_and_records_latency():
+    store = EventStore()
+    await store.upsert_many([_event("e1")])
+    collector = SlowCollector([])
+    latency = LatencyTracker()
+    watcher = PriceWatcher(store, [collector], interval=0.05, latency=latency)
+    watcher.subscribe(["e1"])
+
+    started = time.monotonic()
+    assert await watcher.poll_once() == 0
+    assert time.monotonic() - started < 1
+    # The collector saw the poll deadline as its timeout, and the slow call was sampled
+    assert 0 < collector.batches[0] <= 0.05
+    assert latency.snapshot()["ticketmaster"]["samples"] == 1